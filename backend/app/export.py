@@ -0,0 +1,77 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Optional
+from sqlalchemy.orm import Session
+from backend.db import models
+
+# --- Configuration ---
+EXPORT_BATCH_SIZE = 500         # rows fetched per round trip and written per chunk
+EXPORT_FIELDS = (
+    "id", "name", "webpage_url", "research_interests", "profile_url", "department", "webpage_keywords", "created_at"
+)
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+# --- End Configuration ---
+
+def _json_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def export_batches(bind, since: Optional[datetime] = None, batch_size: int = EXPORT_BATCH_SIZE):
+    """
+    Yields lists of up to `batch_size` faculty rows (as tuples in EXPORT_FIELDS
+    order), in id order. Rows are read through a server-side cursor with
+    yield_per, on a session of its own that lives as long as the stream.
+    """
+
+    db = Session(bind=bind)
+    try:
+        query = db.query(*[getattr(models.Faculty, f) for f in EXPORT_FIELDS])
+        if since is not None:
+            query = query.filter(models.Faculty.created_at >= since)
+        batch = []
+        for row in query.order_by(models.Faculty.id).yield_per(batch_size):
+            batch.append(tuple(row))
+            if len(batch) == batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+    finally:
+        db.close()
+
+def ndjson_chunks(batches):
+    for batch in batches:
+        yield "".join(
+            json.dumps({f: _json_value(v) for f, v in zip(EXPORT_FIELDS, row)}, ensure_ascii=False) + "\n"
+            for row in batch
+        ).encode("utf-8")
+
+def csv_chunks(batches):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for batch in batches:
+        writer.writerows([_json_value(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # header only - nothing matched
+        yield buffer.getvalue().encode("utf-8")
+
+def gzip_chunks(chunks):
+    """Compresses a stream of byte chunks into one gzip member, chunk by chunk."""
+
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+def export_stream(bind, fmt: str, since: Optional[datetime] = None, gzip: bool = False):
+    batches = export_batches(bind, since)
+    chunks = ndjson_chunks(batches) if fmt == "ndjson" else csv_chunks(batches)
+    return gzip_chunks(chunks) if gzip else chunks
@@ -0,0 +1,148 @@
+import threading
+import time
+import traceback
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy.orm import Session
+from backend.data_ingestion import refresh_faculty_data
+from backend.search_engine import rebuild_search_engine_async
+
+# --- Configuration ---
+MAX_JOB_HISTORY = 20            # finished jobs kept for status lookups
+MAX_JOB_ERRORS = 100            # per-profile errors kept on a job
+# --- End Configuration ---
+
+class RefreshJob:
+    """
+    State of one background scrape + sync run. The worker thread updates it
+    through set_phase / profile_done; status reads take a snapshot under the lock.
+    """
+
+    def __init__(self, incremental, webpages=False):
+        self.id = uuid.uuid4().hex
+        self.incremental = incremental
+        self.webpages = webpages
+        self.status = "queued"          # queued -> running -> succeeded | failed
+        self.phase = None               # directory -> profiles -> [webpages ->] sync -> index
+        self.profiles_fetched = 0
+        self.profiles_total = None
+        self.errors = []
+        self.error_count = 0
+        self.result = None
+        self.created_at = datetime.now()
+        self.thread = None
+        self._started = None
+        self._finished = None
+        self._lock = threading.Lock()
+
+    def set_phase(self, phase):
+        with self._lock:
+            self.phase = phase
+
+    def profile_done(self, done, total, error=None):
+        with self._lock:
+            self.profiles_fetched = done
+            self.profiles_total = total
+            if error:
+                self._add_error(error)
+
+    def _add_error(self, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_JOB_ERRORS:
+            self.errors.append(message)
+
+    def start(self):
+        with self._lock:
+            self.status = "running"
+            self._started = time.monotonic()
+
+    def finish(self, result=None, error=None):
+        with self._lock:
+            self.result = result
+            self.status = "failed" if error else "succeeded"
+            if error:
+                self._add_error(error)
+            self._finished = time.monotonic()
+
+    @property
+    def done(self):
+        return self.status in ("succeeded", "failed")
+
+    def to_dict(self) -> dict:
+        with self._lock:
+            if self._started is None:
+                elapsed = 0.0
+            else:
+                elapsed = (self._finished or time.monotonic()) - self._started
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "phase": self.phase,
+                "incremental": self.incremental,
+                "webpages": self.webpages,
+                "profiles_fetched": self.profiles_fetched,
+                "profiles_total": self.profiles_total,
+                "elapsed_seconds": round(elapsed, 2),
+                "created_at": self.created_at.isoformat(timespec="seconds"),
+                "error_count": self.error_count,
+                "errors": list(self.errors),
+                "result": self.result,
+            }
+
+class RefreshJobManager:
+    """
+    Runs at most one refresh at a time on a background thread. Starting a
+    refresh while one is queued or running returns the running job instead.
+    """
+
+    def __init__(self, max_history=MAX_JOB_HISTORY):
+        self.max_history = max_history
+        self._jobs = OrderedDict()
+        self._current = None
+        self._lock = threading.Lock()
+
+    def start(self, bind, incremental=True, webpages=False):
+        """Returns (job, created); created is False when attaching to a running job."""
+
+        with self._lock:
+            if self._current is not None and not self._current.done:
+                return self._current, False
+
+            job = RefreshJob(incremental, webpages)
+            self._current = job
+            self._jobs[job.id] = job
+            while len(self._jobs) > self.max_history:
+                self._jobs.popitem(last=False)
+
+        thread = threading.Thread(target=self._run, args=(job, bind), name=f"refresh-{job.id[:8]}", daemon=True)
+        job.thread = thread
+        thread.start()
+        return job, True
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, bind):
+        job.start()
+        db = Session(bind=bind)
+        try:
+            delta = refresh_faculty_data(db, incremental=job.incremental, progress=job, webpages=job.webpages)
+            if delta is None:
+                job.finish(error="Scrape failed: could not fetch the faculty directory")
+                return
+            job.set_phase("index")
+            # the job only succeeds once searches see the new data
+            rebuild_search_engine_async(bind).join()
+            job.finish(result=delta)
+        except Exception as e:
+            traceback.print_exc()
+            job.finish(error=str(e))
+        finally:
+            db.close()
+
+_manager = RefreshJobManager()
+
+def get_job_manager() -> RefreshJobManager:
+    return _manager
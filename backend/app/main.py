@@ -1,14 +1,32 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response
 from backend.app.router import router
+from backend.app.response_cache import ResponseCacheMiddleware
+from backend.app.request_metrics import RequestMetricsMiddleware
+from backend.metrics import get_registry, instrument_sqlalchemy, CONTENT_TYPE as METRICS_CONTENT_TYPE
 from backend.db.database import engine, SessionLocal
-from backend.db.models import Base
-from backend.data_ingestion import load_data_from_json, ingest_faculty_data
+from backend.db.init_db import upgrade_schema
+from backend.data_ingestion import ingest_seed_file
+from backend.search_engine import build_search_engine
 import os
 from contextlib import asynccontextmanager
 
-# ensure tables exist
-Base.metadata.create_all(bind=engine)
+# FAST_START=0 re-ingests the seed JSON on every boot even if it has not changed
+FAST_START = os.getenv("FAST_START", "1") != "0"
+
+_imports_done = time.perf_counter()
+
+# count and time SQL statements per request for /metrics
+instrument_sqlalchemy()
+
+# ensure tables (and any newly added columns) exist
+upgrade_schema(engine)
+
+_schema_done = time.perf_counter()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -16,12 +34,27 @@ async def lifespan(app: FastAPI):
     from backend.data_ingestion import BASE_DIR
     json_path = os.path.join(BASE_DIR, "faculty_data_complete.json")
 
-    data = load_data_from_json(json_path)
-    if data:
-        db = SessionLocal()
-        ingest_faculty_data(db, data)
+    timings = {
+        "imports": _imports_done - _import_started,
+        "schema": _schema_done - _imports_done,
+    }
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        # skipped when the file's hash matches the last ingested one
+        seed = ingest_seed_file(db, json_path, force=not FAST_START)
+        timings["ingest" if not seed["skipped"] else "ingest (skipped)"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        # load the in-memory search index that serves /search/name and /search/research
+        build_search_engine(db)
+        timings["search index"] = time.perf_counter() - started
+    finally:
         db.close()
 
+    print("Startup: " + ", ".join(f"{step} {seconds * 1000:.0f}ms" for step, seconds in timings.items())
+          + f" (total {sum(timings.values()) * 1000:.0f}ms)")
+
     yield  # This is where FastAPI runs the app
 
     # Optional: add shutdown logic here if needed
@@ -33,7 +66,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
-# 2. CORS Middleware (Essential for connecting Frontend/Next.js)
+# 2. Response cache for the read endpoints (added before CORS so CORS wraps cached replies too)
+app.add_middleware(ResponseCacheMiddleware)
+
+# CORS Middleware (Essential for connecting Frontend/Next.js)
 origins = [
     "http://localhost:3000", 
     "https://purdue-faculty-finder.vercel.app"
@@ -47,9 +83,17 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics, outermost so cached replies and CORS preflights are counted too
+app.add_middleware(RequestMetricsMiddleware)
+
 # 3. Include the Router
 app.include_router(router)
 
 @app.get("/")
 def read_root():
-    return {"message": "Welcome to the Faculty Finder API. Go to /docs for endpoints."}
\ No newline at end of file
+    return {"message": "Welcome to the Faculty Finder API. Go to /docs for endpoints."}
+
+# Prometheus scrape target: request, database, scraper and ingestion metrics
+@app.get("/metrics", include_in_schema=False)
+def read_metrics():
+    return Response(content=get_registry().render(), media_type=METRICS_CONTENT_TYPE)
@@ -0,0 +1,106 @@
+import base64
+import binascii
+import json
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+from backend.db import models
+
+# --- Configuration ---
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+MAX_BATCH_IDS = 500             # ids resolved per /faculty/batch request
+MAX_TAGS = 1000                 # tags returned per /tags request
+PROJECTABLE_FIELDS = (
+    "id", "name", "webpage_url", "research_interests", "profile_url", "department", "webpage_keywords"
+)
+DEFAULT_FIELDS = ("id", "name")
+# --- End Configuration ---
+
+# Keyset pagination helpers shared by the list endpoints.
+# A cursor is an opaque URL-safe token holding the sort key of the last item
+# on the previous page: {"id": ...} for id-ordered listings and
+# {"score": ..., "id": ...} for relevance-ranked searches (score descending, then id).
+
+def encode_cursor(key: dict) -> str:
+    raw = json.dumps(key, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str], ranked: bool = False) -> Optional[dict]:
+    """
+    Decodes a cursor from a previous page. `ranked` requires the score part.
+    Raises a 400 if the cursor is malformed.
+    """
+
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        key = json.loads(raw)
+        key["id"] = int(key["id"])
+        if ranked or "score" in key:
+            key["score"] = float(key["score"])
+    except (binascii.Error, ValueError, TypeError, KeyError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+    return key
+
+def parse_fields(fields: Optional[str]) -> List[str]:
+    """
+    Parses a comma separated `fields=` projection. `id` is always included
+    since it is the pagination key. Raises a 400 on unknown field names.
+    """
+
+    if not fields:
+        return list(DEFAULT_FIELDS)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in PROJECTABLE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Choose from: {', '.join(PROJECTABLE_FIELDS)}"
+        )
+    return ["id"] + [f for f in dict.fromkeys(requested) if f != "id"]
+
+def projected_columns(fields: List[str]):
+    return [getattr(models.Faculty, f) for f in fields]
+
+def keyset_page(query, fields: List[str], limit: int, after: Optional[dict]) -> dict:
+    """
+    Runs an id-ordered query one page at a time. `query` must select the
+    projected columns; one extra row is fetched to know whether a next page exists.
+    """
+
+    if after is not None:
+        query = query.filter(models.Faculty.id > after["id"])
+    rows = query.order_by(models.Faculty.id).limit(limit + 1).all()
+
+    items = [dict(zip(fields, row)) for row in rows[:limit]]
+    next_cursor = encode_cursor({"id": items[-1]["id"]}) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
+
+def ranked_page(db: Session, hits, fields: List[str], limit: int) -> dict:
+    """
+    Builds a page from ranked (id, name, score) hits, already restricted to
+    those after the cursor and holding at most limit + 1 entries. Columns
+    other than id and name are fetched for the page's ids in one query.
+    """
+
+    page = hits[:limit]
+    extra = [f for f in fields if f not in ("id", "name")]
+    stored = {}
+    if extra and page:
+        rows = db.query(models.Faculty.id, *projected_columns(extra)).filter(
+            models.Faculty.id.in_([faculty_id for faculty_id, _, _ in page])
+        ).all()
+        stored = {row[0]: dict(zip(extra, row[1:])) for row in rows}
+
+    items = []
+    for faculty_id, name, _ in page:
+        known = {"id": faculty_id, "name": name, **stored.get(faculty_id, {})}
+        items.append({f: known.get(f) for f in fields})
+
+    next_cursor = None
+    if len(hits) > limit:
+        last_id, _, last_score = page[-1]
+        next_cursor = encode_cursor({"score": last_score, "id": last_id})
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,48 @@
+import time
+from backend.metrics import (
+    HTTP_REQUESTS, HTTP_LATENCY, DB_QUERIES, DB_QUERY_TIME, track_queries, stop_tracking_queries
+)
+
+UNMATCHED_ROUTE = "unmatched"   # label for paths that hit no route, to keep label cardinality bounded
+
+class RequestMetricsMiddleware:
+    """
+    Records per-route request counts by status, latency and SQL statements
+    executed. Latency runs until the last body chunk is sent, so streamed
+    responses are timed in full. Routes are labelled by their path template
+    (/api/v1/faculty/{faculty_id}), not the raw path; the response cache
+    restores the route of the replies it serves, so hits are labelled too.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, so it does not
+    buffer or re-wrap streaming responses.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        status = 500
+        stats, token = track_queries()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stop_tracking_queries(token)
+            route = scope.get("route")
+            route = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            HTTP_REQUESTS.inc(route=route, method=method, status=status)
+            HTTP_LATENCY.observe(time.perf_counter() - started, route=route, method=method)
+            DB_QUERIES.observe(stats.count, route=route)
+            DB_QUERY_TIME.observe(stats.seconds, route=route)
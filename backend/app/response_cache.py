@@ -0,0 +1,164 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from urllib.parse import urlencode
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import Response
+from backend.db.generation import current_generation
+
+# --- Configuration ---
+RESPONSE_CACHE_ENTRIES = 2048                                # LRU capacity
+RESPONSE_CACHE_MAX_BODY = 1024 * 1024                        # larger bodies are served but not cached
+CACHED_ROUTES = (                                            # GET read routes; {param} matches one segment
+    "/api/v1/faculty/{faculty_id}",
+    "/api/v1/faculty/{faculty_id}/similar",
+    "/api/v1/search",
+    "/api/v1/search/name",
+    "/api/v1/search/research",
+    "/api/v1/search/semantic",
+    "/api/v1/search/all",
+    "/api/v1/autocomplete",
+    "/api/v1/tags",
+)
+CACHE_CONTROL = "no-cache"                                   # clients may store, but must revalidate
+# --- End Configuration ---
+
+class CachedResponse:
+    __slots__ = ("body", "media_type", "etag", "route")
+
+    def __init__(self, body, media_type, route=None):
+        self.body = body
+        self.media_type = media_type
+        # the route that produced the body, restored on hits for per-route metrics
+        self.route = route
+        self.etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+class ApiResponseCache:
+    """
+    Thread-safe in-process LRU of serialized GET responses.
+    Keys include the data generation, so bumping it (see
+    backend.db.generation) invalidates every entry without a sweep.
+    """
+
+    def __init__(self, max_entries=RESPONSE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def record_not_modified(self):
+        with self._lock:
+            self.not_modified += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.not_modified = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "not_modified": self.not_modified,
+                "entries": len(self._entries),
+                "generation": current_generation(),
+            }
+
+_cache = ApiResponseCache()
+
+def get_response_cache() -> ApiResponseCache:
+    return _cache
+
+def cache_key(request, generation):
+    """
+    (path, normalized query string, generation). Parameters are sorted and
+    `q` is case and whitespace folded, since every search mode ignores both.
+    """
+
+    params = []
+    for name, value in request.query_params.multi_items():
+        if name == "q":
+            value = " ".join(value.lower().split())
+        params.append((name, value))
+    return request.url.path, urlencode(sorted(params)), generation
+
+def compile_routes(routes):
+    """A pattern whose fullmatch is any of the route templates, each {param} standing for one path segment."""
+
+    templates = (re.sub(r"\\{\w+\\}", "[^/]+", re.escape(route)) for route in routes)
+    return re.compile("(?:" + "|".join(templates) + ")")
+
+def etag_matches(if_none_match, etag):
+    """Weak comparison of an If-None-Match header against `etag`, as required for GET."""
+
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Serves cached GET responses for the read routes in CACHED_ROUTES
+    (matched whole, so exports, stats and update jobs pass through), tags
+    every 200 with a strong ETag and answers a matching If-None-Match with 304.
+    Adds X-Cache: HIT or MISS for observability. Hits never reach the
+    router, so the route that served the cached response is put back in the
+    scope for RequestMetricsMiddleware to label them by.
+    """
+
+    def __init__(self, app, cache=None, routes=CACHED_ROUTES):
+        super().__init__(app)
+        self.cache = cache or _cache
+        self.routes = compile_routes(routes)
+
+    async def dispatch(self, request, call_next):
+        if request.method != "GET" or not self.routes.fullmatch(request.url.path):
+            return await call_next(request)
+
+        key = cache_key(request, current_generation())
+        entry = self.cache.get(key)
+        status = "HIT"
+        if entry is None:
+            status = "MISS"
+            response = await call_next(request)
+            if response.status_code != 200:
+                return response
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            entry = CachedResponse(
+                body, response.media_type or response.headers.get("content-type"), request.scope.get("route")
+            )
+            if len(body) <= RESPONSE_CACHE_MAX_BODY:
+                self.cache.put(key, entry)
+
+        if status == "HIT" and entry.route is not None:
+            request.scope["route"] = entry.route
+        headers = {"ETag": entry.etag, "Cache-Control": CACHE_CONTROL, "X-Cache": status}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            self.cache.record_not_modified()
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, status_code=200, media_type=entry.media_type, headers=headers)
@@ -1,14 +1,33 @@
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from typing import List
-from .schemas import FacultyOut, FacultyNameOut
-from backend.db.database import get_db
+from typing import List, Optional
+from datetime import datetime
+from .schemas import FacultyOut, FacultyPage, FacultyBatchRequest, FacultyBatchOut, AutocompleteOut, TagsOut, SearchOut
+from .export import export_stream, EXPORT_MEDIA_TYPES
+from .pagination import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, MAX_BATCH_IDS, MAX_TAGS, PROJECTABLE_FIELDS, parse_fields, decode_cursor,
+    projected_columns, keyset_page, ranked_page, encode_cursor
+)
+from backend.db.database import get_db, get_read_db
 from backend.db import models
-from backend.data_ingestion import ingest_faculty_data
-from backend.scraper import scrape_faculty_directory, enrich_faculty_data
+from backend.db.departments import department_clause
+from backend.db.fts import search_faculty
+from backend.topics import normalize_tag
+from backend.search_engine import (
+    SearchEngine, get_search_engine, FUZZY_THRESHOLD, SIMILAR_TOP_K, AUTOCOMPLETE_LIMIT, AUTOCOMPLETE_MAX_LIMIT, mark,
+    research_snippet
+)
+from backend.app.jobs import get_job_manager
 from backend.app.auth import verify_admin
+from backend.app.response_cache import get_response_cache
 
 
+SEARCH_MODES = "^(memory|fts|substring)$"
+SEARCH_MODE_HELP = "memory: in-process index, fts: SQLite full-text index, substring: ILIKE '%q%'"
+DEPARTMENT_HELP = "Only faculty listed in this department (code such as ECE or ME)"
+FIELDS_HELP = f"Comma separated fields to return ({', '.join(PROJECTABLE_FIELDS)}); defaults to id,name"
+
 router = APIRouter(
     prefix="/api/v1", # base path
     tags=["faculty"]
@@ -20,7 +39,7 @@ router = APIRouter(
 @router.get("/faculty/{faculty_id}", response_model=FacultyOut)
 def get_faculty_by_id(
     faculty_id: int,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     try:
         faculty = db.query(models.Faculty).filter(models.Faculty.id == faculty_id).first()
@@ -31,74 +50,327 @@ def get_faculty_by_id(
             id=faculty.id,
             name=faculty.name,
             webpage_url=faculty.webpage_url,
-            research_interests=faculty.research_interests
+            research_interests=faculty.research_interests,
+            department=faculty.department,
+            webpage_keywords=faculty.webpage_keywords
         )
     
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
     
-# Search faculty by name and return a list
-@router.get("/search/name", response_model=List[FacultyNameOut])
+# look up many faculty at once - one IN query instead of a request per id
+@router.post("/faculty/batch", response_model=FacultyBatchOut)
+def get_faculty_batch(
+    request: FacultyBatchRequest,
+    db: Session = Depends(get_read_db)
+):
+    ids = list(dict.fromkeys(request.ids))
+    if len(ids) > MAX_BATCH_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_IDS} ids per request")
+    try:
+        rows = db.query(
+            models.Faculty.id, models.Faculty.name, models.Faculty.webpage_url, models.Faculty.research_interests,
+            models.Faculty.department, models.Faculty.webpage_keywords
+        ).filter(models.Faculty.id.in_(ids)).all() if ids else []
+        found = {row.id: row for row in rows}
+
+        return FacultyBatchOut(
+            items=[
+                FacultyOut(id=row.id, name=row.name, webpage_url=row.webpage_url,
+                           research_interests=row.research_interests, department=row.department,
+                           webpage_keywords=row.webpage_keywords)
+                for row in (found[faculty_id] for faculty_id in ids if faculty_id in found)
+            ],
+            missing=[faculty_id for faculty_id in ids if faculty_id not in found]
+        )
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+# faculty whose research interests are most similar to this one's (precomputed neighbours)
+@router.get("/faculty/{faculty_id}/similar", response_model=FacultyPage)
+def get_similar_faculty(
+    faculty_id: int,
+    limit: int = Query(SIMILAR_TOP_K, ge=1, le=SIMILAR_TOP_K, description="Number of similar faculty"),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: Session = Depends(get_read_db)
+):
+    columns = parse_fields(fields)
+    try:
+        engine = get_search_engine() or SearchEngine.from_db(db)
+        if faculty_id not in engine.names:
+            raise HTTPException(status_code=404, detail="Faculty not found")
+        return ranked_page(db, engine.similar(faculty_id, limit), columns, limit)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+# Search faculty by name and return a page of results
+@router.get("/search/name", response_model=FacultyPage)
 def search_faculty_by_name(
     q: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)
+    mode: str = Query("memory", pattern=SEARCH_MODES, description=SEARCH_MODE_HELP),
+    op: str = Query("and", pattern="^(and|or)$", description="Require all query words (and) or any of them (or)"),
+    fuzzy: bool = Query(False, description="Typo-tolerant match ranked by trigram similarity"),
+    threshold: float = Query(FUZZY_THRESHOLD, ge=0.0, le=1.0, description="Minimum similarity for fuzzy matches"),
+    department: Optional[str] = Query(None, pattern=r"^\w+$", description=DEPARTMENT_HELP),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: Session = Depends(get_read_db)
 ):
+    columns = parse_fields(fields)
     try:
-        # Case-insensitive substring match
-        faculty_list = db.query(models.Faculty).filter(models.Faculty.name.ilike(f"%{q}%")).all()
-
-        # Convert to response format
-        results = [FacultyNameOut(id=f.id, name=f.name) for f in faculty_list]
+        if fuzzy:
+            after = decode_cursor(cursor, ranked=True)
+            # builds a throwaway engine if the startup index is not loaded yet
+            engine = get_search_engine() or SearchEngine.from_db(db)
+            hits = engine.fuzzy_search(q, threshold, limit + 1, after, department=department)
+            return ranked_page(db, hits, columns, limit)
 
-        return results
+        return search_column(db, models.Faculty.name, q, mode, op, columns, limit, cursor, department)
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-# search faculty by research interest and return a list
-@router.get("/search/research", response_model=List[FacultyNameOut])
+# search faculty by research interest and return a page of results
+@router.get("/search/research", response_model=FacultyPage)
 def search_faculty_by_research_interest(
+    q: Optional[str] = Query(None, min_length=1),
+    tag: Optional[str] = Query(None, min_length=1, description="Faculty with this topic tag (see /tags), instead of q"),
+    mode: str = Query("memory", pattern=SEARCH_MODES, description=SEARCH_MODE_HELP),
+    op: str = Query("and", pattern="^(and|or)$", description="Require all query words (and) or any of them (or)"),
+    department: Optional[str] = Query(None, pattern=r"^\w+$", description=DEPARTMENT_HELP),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: Session = Depends(get_read_db)
+):
+    columns = parse_fields(fields)
+    if (q is None) == (tag is None):
+        raise HTTPException(status_code=400, detail="Pass either q or tag")
+    try:
+        if tag is not None:
+            return tagged_page(db, tag, columns, limit, cursor, department)
+        return search_column(db, models.Faculty.research_interests, q, mode, op, columns, limit, cursor, department)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    
+# one ranked search over names and research interests, with highlighted matches
+@router.get("/search", response_model=SearchOut)
+def search_faculty_unified(
     q: str = Query(..., min_length=1),
-    db: Session = Depends(get_db)
+    department: Optional[str] = Query(None, pattern=r"^\w+$", description=DEPARTMENT_HELP),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    db: Session = Depends(get_read_db)
 ):
+    after = decode_cursor(cursor, ranked=True)
     try:
-        # Case-insensitive substring match in research interests
-        faculty_list = db.query(models.Faculty).filter(models.Faculty.research_interests.ilike(f"%{q}%")).all()
+        engine = get_search_engine() or SearchEngine.from_db(db)
+        hits = engine.unified_search(q, limit + 1, after, department=department)
+        page = hits[:limit]
 
-        # Convert to response format
-        results = [FacultyNameOut(id=f.id, name=f.name) for f in faculty_list]
+        # research text for the snippets, for the page's ids in one query
+        research = {}
+        if page:
+            rows = db.query(
+                models.Faculty.id, models.Faculty.research_interests, models.Faculty.webpage_keywords
+            ).filter(models.Faculty.id.in_([faculty_id for faculty_id, *_ in page])).all()
+            research = {faculty_id: interests or keywords for faculty_id, interests, keywords in rows}
 
-        return results
+        items = [
+            {
+                "id": faculty_id,
+                "name": name,
+                "score": score,
+                "match": match,
+                "name_highlight": mark(name, [span] if span else []),
+                "snippet": research_snippet(research.get(faculty_id), q),
+            }
+            for faculty_id, name, score, match, span in page
+        ]
+        next_cursor = None
+        if len(hits) > limit:
+            last_id, _, last_score, _, _ = page[-1]
+            next_cursor = encode_cursor({"score": last_score, "id": last_id})
+        return {"items": items, "next_cursor": next_cursor}
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
-    
-# get all facult data and return a list
-@router.get("/search/all", response_model=List[FacultyNameOut])
-def get_all_faculty(
-    db: Session = Depends(get_db)
+
+# free-text research search ranked by TF-IDF cosine similarity
+@router.get("/search/semantic", response_model=FacultyPage)
+def search_faculty_semantic(
+    q: str = Query(..., min_length=1),
+    department: Optional[str] = Query(None, pattern=r"^\w+$", description=DEPARTMENT_HELP),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: Session = Depends(get_read_db)
+):
+    columns = parse_fields(fields)
+    after = decode_cursor(cursor, ranked=True)
+    try:
+        engine = get_search_engine() or SearchEngine.from_db(db)
+        return ranked_page(db, engine.semantic_search(q, limit + 1, after, department=department), columns, limit)
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+# typeahead completions for the search box, from the in-memory prefix arrays
+@router.get("/autocomplete", response_model=AutocompleteOut)
+def autocomplete(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(AUTOCOMPLETE_LIMIT, ge=1, le=AUTOCOMPLETE_MAX_LIMIT, description="Number of completions"),
+    db: Session = Depends(get_read_db)
 ):
     try:
-        faculty_list = db.query(models.Faculty).all()
+        engine = get_search_engine() or SearchEngine.from_db(db)
+        return {"items": engine.autocomplete(q, limit)}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-        # Convert to response format
-        results = [FacultyNameOut(id=f.id, name=f.name) for f in faculty_list]
+def search_column(db: Session, column, q: str, mode: str, op: str, fields: List[str], limit: int,
+                  cursor: Optional[str], department: Optional[str] = None) -> dict:
+    """
+    Searches one Faculty column and returns one page of results.
+    "memory" answers from the in-process inverted index (tf-idf ranked)
+    without touching the database unless extra fields are projected; before
+    that index is built it behaves like "fts", which queries the SQLite FTS5
+    index ordered by bm25. Ranked pages are keyed on (score, id).
+    "substring", or an FTS index that is unavailable, uses the original
+    case-insensitive substring match (where `op` does not apply), keyed on id.
+    Every mode can be restricted to faculty listed in one `department`.
+    """
+
+    if mode in ("memory", "fts"):
+        after = decode_cursor(cursor, ranked=True)
+        engine = get_search_engine() if mode == "memory" else None
+        if engine is not None:
+            hits = engine.search(column.key, q, op, limit=limit + 1, after=after, department=department)
+        else:
+            hits = search_faculty(db, q, column=column.key, limit=limit + 1, operator=op, after=after,
+                                  department=department)
+        if hits is not None:
+            return ranked_page(db, hits, fields, limit)
+
+    # Case-insensitive substring match
+    query = db.query(*projected_columns(fields)).filter(column.ilike(f"%{q}%"))
+    if department is not None:
+        query = query.filter(department_clause(department))
+    return keyset_page(query, fields, limit, decode_cursor(cursor))
+
+def tagged_page(db: Session, tag: str, fields: List[str], limit: int, cursor: Optional[str],
+                department: Optional[str] = None) -> dict:
+    """
+    One id-ordered page of the faculty carrying a topic tag, read through the
+    (tag_id, faculty_id) index of the association table. Unknown tags give an empty page.
+    """
+
+    tag_id = db.query(models.Tag.id).filter(models.Tag.name == normalize_tag(tag)).scalar()
+    if tag_id is None:
+        return {"items": [], "next_cursor": None}
+    # an IN subquery rather than a join, so SQLite walks the ids in order without a sort
+    tagged_ids = db.query(models.faculty_tags.c.faculty_id).filter(models.faculty_tags.c.tag_id == tag_id)
+    query = db.query(*projected_columns(fields)).filter(models.Faculty.id.in_(tagged_ids.scalar_subquery()))
+    if department is not None:
+        query = query.filter(department_clause(department))
+    return keyset_page(query, fields, limit, decode_cursor(cursor))
+
+# research-topic tags with how many faculty carry each, for browsing by area
+@router.get("/tags", response_model=TagsOut)
+def list_tags(
+    source: Optional[str] = Query(None, pattern="^(vocabulary|ngram)$", description="Only curated (vocabulary) or frequent-phrase (ngram) tags"),
+    min_count: int = Query(1, ge=1, description="Only tags carried by at least this many faculty"),
+    limit: int = Query(100, ge=1, le=MAX_TAGS, description="Number of tags, most common first"),
+    db: Session = Depends(get_read_db)
+):
+    try:
+        # counts are precomputed at ingestion, so this never touches the faculty table
+        query = db.query(models.Tag.name, models.Tag.source, models.Tag.faculty_count).filter(
+            models.Tag.faculty_count >= min_count
+        )
+        if source is not None:
+            query = query.filter(models.Tag.source == source)
+        rows = query.order_by(models.Tag.faculty_count.desc(), models.Tag.name).limit(limit).all()
+        return {"items": [{"name": row.name, "source": row.source, "count": row.faculty_count} for row in rows]}
 
-        return results
-    
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
 
-    
-# update faculty data (admin only)
-@router.post("/update")
-def update_faculty(db: Session = Depends(get_db), _: bool = Depends(verify_admin)):
+# list all faculty, one page at a time in id order
+@router.get("/search/all", response_model=FacultyPage)
+def get_all_faculty(
+    department: Optional[str] = Query(None, pattern=r"^\w+$", description=DEPARTMENT_HELP),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_HELP),
+    db: Session = Depends(get_read_db)
+):
+    columns = parse_fields(fields)
+    after = decode_cursor(cursor)
     try:
-        raw_list = scrape_faculty_directory()
-        if not raw_list:
-            raise HTTPException(status_code=500, detail="Scrape failed")
-        enriched = enrich_faculty_data(raw_list)
-        ingest_faculty_data(db, enriched)
-        return {"status": "ok", "record_count": len(enriched)}
+        # only the requested columns are selected, not full Faculty entities
+        query = db.query(*projected_columns(columns))
+        if department is not None:
+            query = query.filter(department_clause(department))
+        return keyset_page(query, columns, limit, after)
+    
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+
+    
+# stream every faculty record as NDJSON or CSV, for bulk consumers
+@router.get("/export")
+def export_faculty(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson (one JSON object per line) or csv"),
+    since: Optional[datetime] = Query(None, description="Only records created at or after this ISO timestamp"),
+    gzip: bool = Query(False, description="gzip the stream (Content-Encoding: gzip)"),
+    db: Session = Depends(get_read_db)
+):
+    headers = {"Content-Disposition": f'attachment; filename="faculty.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    # the stream reads through its own session, since this request's is closed once we return
+    return StreamingResponse(
+        export_stream(db.get_bind(), format, since=since, gzip=gzip),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers=headers
+    )
+
+# response cache hit ratio, for monitoring
+@router.get("/cache/stats")
+def get_cache_stats():
+    return get_response_cache().stats()
+
+# update faculty data (admin only) - runs as a background job
+@router.post("/update", status_code=202)
+def update_faculty(
+    incremental: bool = Query(True, description="Only re-parse profiles whose page changed"),
+    webpages: bool = Query(False, description="Also extract keywords from personal webpages of profiles without research interests"),
+    db: Session = Depends(get_db),
+    _: bool = Depends(verify_admin)
+):
+    # the job opens its own session on the same database; this request returns immediately
+    job, created = get_job_manager().start(db.get_bind(), incremental=incremental, webpages=webpages)
+    return {"job_id": job.id, "status": job.status, "attached": not created}
+
+# progress of a refresh job (admin only)
+@router.get("/update/{job_id}")
+def get_update_status(
+    job_id: str,
+    _: bool = Depends(verify_admin)
+):
+    job = get_job_manager().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
@@ -1,11 +1,13 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 class FacultyOut(BaseModel):
     id: int
     name: str
     webpage_url: Optional[str]
     research_interests: Optional[str]
+    department: Optional[str] = None    # comma separated department codes
+    webpage_keywords: Optional[str] = None   # keywords from the personal webpage, comma separated
 
     # future fields for returning by research interest search
 
@@ -18,4 +20,45 @@ class FacultyNameOut(BaseModel):
     name: str
 
     class ConfigDict:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class FacultyPage(BaseModel):
+    # items hold only the fields requested with `fields=` (id and name by default)
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+class FacultyBatchRequest(BaseModel):
+    ids: List[int]
+
+class FacultyBatchOut(BaseModel):
+    # records in request order (repeated ids once); ids with no record are listed in `missing`
+    items: List[FacultyOut]
+    missing: List[int]
+
+class Completion(BaseModel):
+    text: str
+    type: str           # name | last_name | middle_name | keyword, best match type first
+    id: Optional[int]   # faculty id for name completions, None for research keywords
+
+class AutocompleteOut(BaseModel):
+    items: List[Completion]
+
+class TagCount(BaseModel):
+    name: str
+    source: str         # vocabulary (curated research area) | ngram (frequent phrase)
+    count: int          # faculty with the tag
+
+class TagsOut(BaseModel):
+    items: List[TagCount]
+
+class SearchHit(BaseModel):
+    id: int
+    name: str
+    score: float
+    match: str                      # name_exact | name_prefix | name_substring | research, best first
+    name_highlight: str             # HTML-escaped name, the matched part in <mark>
+    snippet: Optional[str] = None   # HTML-escaped research excerpt, matching words in <mark>
+
+class SearchOut(BaseModel):
+    items: List[SearchHit]
+    next_cursor: Optional[str] = None
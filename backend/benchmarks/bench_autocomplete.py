@@ -0,0 +1,47 @@
+"""
+Benchmark: autocomplete latency over synthetic faculty names.
+
+Builds a SearchEngine over N generated names and times autocomplete for
+every 1-4 character prefix of random names and last names, as a search
+box would fire them keystroke by keystroke. Reports p50 / p99 / max.
+
+Usage:
+    python -m backend.benchmarks.bench_autocomplete [--names N] [--queries Q]
+"""
+
+import argparse
+import random
+import time
+from backend.benchmarks.fixtures import percentile, synthetic_names
+from backend.search_engine import SearchEngine
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=2000)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.names)
+    start = time.perf_counter()
+    engine = SearchEngine([(i, name, None) for i, name in enumerate(names, 1)])
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.names} names")
+
+    rng = random.Random(2)
+    prefixes = []
+    while len(prefixes) < args.queries:
+        word = rng.choice(names)
+        if rng.random() < 0.5:
+            word = word.split()[-1]
+        prefixes += [word[:n] for n in range(1, 5)]
+
+    timings = []
+    for prefix in prefixes:
+        start = time.perf_counter()
+        engine.autocomplete(prefix)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"{len(timings)} prefixes: p50 {percentile(timings, 0.5):.3f} ms, "
+          f"p99 {percentile(timings, 0.99):.3f} ms, max {timings[-1]:.3f} ms")
+
+if __name__ == "__main__":
+    main()
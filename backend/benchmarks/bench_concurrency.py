@@ -0,0 +1,121 @@
+"""
+Benchmark: concurrent searches during ingestion, default vs. tuned SQLite engines.
+
+For each engine mode, loads N synthetic faculty into a scratch database,
+then for a fixed duration runs one writer thread that re-ingests every
+record with revised research interests (one long write transaction per
+pass) while reader threads run research searches against the FTS index.
+Reports reads/sec, read latency p50 / p99 / max, "database is locked"
+errors and completed write passes.
+
+  default: SQLite's defaults as before (rollback journal, one shared engine)
+  tuned:   WAL, pragmas on connect, bounded pool, separate read-only engine
+
+Usage:
+    python -m backend.benchmarks.bench_concurrency [--records N] [--readers R] [--seconds S]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import tempfile
+import threading
+import time
+from unittest.mock import patch
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from backend import data_ingestion
+from backend.benchmarks.fixtures import RESEARCH_TOPICS, percentile, synthetic_dataset
+from backend.data_ingestion import ingest_faculty_data
+from backend.db.database import create_db_engine
+from backend.db.fts import search_faculty
+from backend.db.init_db import upgrade_schema
+
+def revised(records, revision):
+    return [{**r, "research_interests": f"{r['research_interests'] or ''} (rev {revision})"} for r in records]
+
+def run_mode(mode, records, readers, seconds, tmp):
+    path = os.path.join(tmp, f"{mode}.db")
+    tuned = mode == "tuned"
+    write_engine = create_db_engine(path, tuned=tuned)
+    upgrade_schema(write_engine)
+    read_engine = create_db_engine(path, read_only=True) if tuned else write_engine
+    WriteSession = sessionmaker(bind=write_engine)
+    ReadSession = sessionmaker(bind=read_engine)
+
+    with WriteSession() as db:
+        ingest_faculty_data(db, records)
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    latencies, errors, writes = [], [], [0]
+    topics = [topic.split()[-1] for topic in RESEARCH_TOPICS]
+
+    def writer():
+        revision = 0
+        with WriteSession() as db:
+            while not stop.is_set():
+                revision += 1
+                try:
+                    ingest_faculty_data(db, revised(records, revision))
+                    writes[0] += 1
+                except OperationalError as e:
+                    with lock:
+                        errors.append(f"write: {e.orig}")
+
+    def reader(seed):
+        rng = random.Random(seed)
+        while not stop.is_set():
+            started = time.perf_counter()
+            try:
+                with ReadSession() as db:
+                    search_faculty(db, rng.choice(topics), column="research_interests", limit=50)
+                elapsed = (time.perf_counter() - started) * 1000
+                with lock:
+                    latencies.append(elapsed)
+            except OperationalError as e:
+                with lock:
+                    errors.append(f"read: {e.orig}")
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    write_engine.dispose()
+    if read_engine is not write_engine:
+        read_engine.dispose()
+
+    latencies.sort()
+    locked = sum(1 for e in errors if "locked" in e)
+    line = f"{mode:8} reads {len(latencies) / seconds:9.1f}/s"
+    if latencies:
+        line += (f" | p50 {percentile(latencies, 0.5):8.2f} ms p99 {percentile(latencies, 0.99):8.2f} ms"
+                 f" max {latencies[-1]:8.2f} ms")
+    line += f" | locked errors {locked:4d} | other errors {len(errors) - locked:3d} | write passes {writes[0]}"
+    return line
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    args = parser.parse_args()
+
+    records = synthetic_dataset(args.records)
+    print(f"{args.records} records, {args.readers} readers, {args.seconds:.0f}s per mode")
+    with tempfile.TemporaryDirectory() as tmp, \
+            patch.object(data_ingestion, "LOG_FILE", os.path.join(tmp, "ingest.log")):
+        for mode in ("default", "tuned"):
+            # ingest_faculty_data prints a summary per pass
+            with contextlib.redirect_stdout(io.StringIO()):
+                line = run_mode(mode, records, args.readers, args.seconds, tmp)
+            print(line)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark: fuzzy (trigram) name search over synthetic faculty names.
+
+Builds a SearchEngine over N generated names and times fuzzy_search for
+queries made by dropping one letter from each word of a random name.
+
+Usage:
+    python -m backend.benchmarks.bench_fuzzy [--names N] [--queries Q]
+"""
+
+import argparse
+import random
+import time
+from backend.benchmarks.fixtures import synthetic_names, misspell
+from backend.search_engine import SearchEngine
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--names", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=1000)
+    args = parser.parse_args()
+
+    names = synthetic_names(args.names)
+    start = time.perf_counter()
+    engine = SearchEngine([(i, name, None) for i, name in enumerate(names, 1)])
+    print(f"index build: {time.perf_counter() - start:.2f}s for {args.names} names "
+          f"({len(engine.name_trigrams.words)} distinct words)")
+
+    rng = random.Random(1)
+    targets = [rng.randrange(len(names)) for _ in range(args.queries)]
+    queries = [misspell(names[i], rng) for i in targets]
+
+    for label, batch in (("full name", queries), ("last name", [q.split()[-1] for q in queries])):
+        start = time.perf_counter()
+        results = [engine.fuzzy_search(q) for q in batch]
+        elapsed = time.perf_counter() - start
+        found = sum(1 for i, hits in zip(targets, results) if any(doc_id == i + 1 for doc_id, _, _ in hits))
+        print(f"{label:10} {elapsed / len(batch) * 1000:.3f} ms/query, "
+              f"intended name in results for {found}/{len(batch)}")
+
+if __name__ == "__main__":
+    main()
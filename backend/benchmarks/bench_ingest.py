@@ -0,0 +1,59 @@
+"""
+Benchmark: bulk ingestion of synthetic faculty records into a scratch SQLite file.
+
+Runs ingest_faculty_data twice over the same records (a cold insert, then a
+re-ingest with a fraction of the rows changed) and prints the timing report.
+
+Usage:
+    python -m backend.benchmarks.bench_ingest [--records N] [--changed FRACTION]
+"""
+
+import argparse
+import os
+import tempfile
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.db.init_db import upgrade_schema
+from backend.data_ingestion import ingest_faculty_data
+
+def synthetic_records(count, revision=0, changed=0.0):
+    """`count` faculty records; the first `changed` fraction get revised research interests."""
+
+    cutoff = int(count * changed)
+    return [
+        {
+            "name": f"Faculty {i:06d}",
+            "profile_url": f"https://engineering.purdue.edu/ECE/People/ptProfile?resource_id={i}",
+            "personal_webpage": f"https://engineering.purdue.edu/~f{i}",
+            "research_interests": f"Topic {i % 97} and topic {i % 89}" + (f" (rev {revision})" if i < cutoff else ""),
+            "content_hash": f"{i:064x}",
+        }
+        for i in range(count)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--records", type=int, default=100_000)
+    parser.add_argument("--changed", type=float, default=0.1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+        upgrade_schema(engine)
+        db = sessionmaker(bind=engine)()
+
+        for label, records in (
+            ("cold insert", synthetic_records(args.records)),
+            ("re-ingest", synthetic_records(args.records, revision=1, changed=args.changed)),
+        ):
+            report = ingest_faculty_data(db, records)
+            timings = report["timings"]
+            print(f"{label:12} {args.records} records: {report['added']} added, {report['updated']} updated, "
+                  f"{report['unchanged']} unchanged | load {timings['load']:.2f}s "
+                  f"write {timings['write']:.2f}s index {timings['index']:.2f}s total {timings['total']:.2f}s")
+
+        db.close()
+        engine.dispose()
+
+if __name__ == "__main__":
+    main()
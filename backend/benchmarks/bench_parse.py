@@ -0,0 +1,100 @@
+"""
+Micro-benchmark: legacy BeautifulSoup profile parsing vs. parse_faculty_profile.
+
+Pages are taken, in order of preference, from:
+  - a directory of saved .html files (--pages DIR)
+  - profile bodies recorded in the HTTP cache (backend/http_cache.sqlite3)
+  - a synthetic profile page with deeply nested markup
+
+Usage:
+    python -m backend.benchmarks.bench_parse [--pages DIR] [--repeat N]
+"""
+
+import argparse
+import glob
+import os
+import sqlite3
+import time
+from bs4 import BeautifulSoup
+from backend.http_cache import CACHE_PATH
+from backend.scraper import parse_faculty_profile
+
+def legacy_parse_faculty_profile(content):
+    """The original html.parser + find_all('div') implementation, kept for comparison."""
+
+    soup = BeautifulSoup(content, 'html.parser')
+
+    personal_webpage = None
+    for div in soup.find_all('div'):
+        strong_tag = div.find('strong')
+        if strong_tag and 'Webpage:' in strong_tag.text:
+            link_tag = div.find('a', href=True)
+            if link_tag:
+                personal_webpage = link_tag['href']
+                break
+
+    research_interests = None
+    research_p = soup.find('p', class_='profile-research')
+    if research_p:
+        research_interests = research_p.text.strip()
+
+    return personal_webpage, research_interests
+
+def synthetic_profile(depth=40, siblings=30):
+    """A profile page with `depth` levels of nested divs, each with `siblings` filler divs."""
+
+    filler = "".join(f"<div class='item'><span>Item {i}</span><em>detail</em></div>" for i in range(siblings))
+    inner = (
+        "<div><strong>Webpage:</strong> <a href='https://engineering.purdue.edu/qnp'>site</a></div>"
+        "<div><h2>Research</h2><p class='profile-research'>Quantum photonics and integrated optics.</p></div>"
+    )
+    for _ in range(depth):
+        inner = f"<div class='level'>{filler}{inner}</div>"
+    return f"<html><body>{inner}</body></html>".encode("utf-8")
+
+def load_pages(pages_dir=None):
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+            with open(path, "rb") as f:
+                pages.append((os.path.basename(path), f.read()))
+        return pages
+
+    if os.path.exists(CACHE_PATH):
+        conn = sqlite3.connect(CACHE_PATH)
+        rows = conn.execute("SELECT url, body FROM responses WHERE url LIKE '%Profile%'").fetchall()
+        conn.close()
+        if rows:
+            return rows
+
+    return [("synthetic", synthetic_profile())]
+
+def time_parser(parse, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for _, body in pages:
+            parse(body)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", help="directory of recorded profile .html files")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    pages = load_pages(args.pages)
+    mismatches = [name for name, body in pages if legacy_parse_faculty_profile(body) != parse_faculty_profile(body)]
+
+    legacy = time_parser(legacy_parse_faculty_profile, pages, args.repeat)
+    current = time_parser(parse_faculty_profile, pages, args.repeat)
+    runs = len(pages) * args.repeat
+
+    print(f"pages: {len(pages)}  repeat: {args.repeat}")
+    print(f"legacy (html.parser + find_all): {legacy / runs * 1000:.3f} ms/page")
+    print(f"current (lxml single pass):      {current / runs * 1000:.3f} ms/page")
+    print(f"speedup: {legacy / current:.1f}x")
+    if mismatches:
+        print(f"WARNING: results differ on {len(mismatches)} page(s): {', '.join(mismatches[:5])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Synthetic fixtures for the benchmarks: faculty names, research interests,
+directory and profile HTML shaped like the Purdue ECE pages, and faculty
+datasets of any size. Everything is generated from a seed, so runs compare
+like with like.
+"""
+
+import random
+from html import escape
+
+CONSONANTS = "bcdfghjklmnprstvwyz"
+VOWELS = "aeiou"
+
+RESEARCH_TOPICS = (
+    "quantum optics", "integrated photonics", "power electronics", "electric machines", "smart grids",
+    "signal processing", "wireless communications", "information theory", "machine learning",
+    "computer vision", "natural language processing", "robotics", "control systems", "VLSI design",
+    "analog circuits", "RF circuits", "MEMS", "nanoelectronics", "semiconductor devices", "spintronics",
+    "neuromorphic computing", "computer architecture", "compilers", "distributed systems",
+    "cybersecurity", "hardware security", "biomedical imaging", "medical devices", "acoustics",
+    "electromagnetics", "antennas", "plasma physics", "optimization", "game theory", "networking",
+    "embedded systems", "autonomous vehicles", "energy storage", "photovoltaics", "remote sensing",
+)
+
+def synthetic_word(rng):
+    syllables = rng.randint(2, 4)
+    return "".join(
+        rng.choice(CONSONANTS) + rng.choice(VOWELS) + (rng.choice("nrsl") if rng.random() < 0.3 else "")
+        for _ in range(syllables)
+    ).capitalize()
+
+def synthetic_names(count, seed=0):
+    rng = random.Random(seed)
+    first = [synthetic_word(rng) for _ in range(max(1, count // 12))]
+    last = [synthetic_word(rng) for _ in range(max(1, count * 2 // 5))]
+    return [f"{rng.choice(first)} {rng.choice(last)}" for _ in range(count)]
+
+def misspell(name, rng):
+    """Drops one letter from each word longer than three letters."""
+
+    words = []
+    for word in name.split():
+        if len(word) > 3:
+            i = rng.randrange(len(word))
+            word = word[:i] + word[i + 1:]
+        words.append(word)
+    return " ".join(words)
+
+def synthetic_research(rng):
+    """A research interests blurb built from two to four topics."""
+
+    topics = rng.sample(RESEARCH_TOPICS, rng.randint(2, 4))
+    return "; ".join(topic[0].upper() + topic[1:] for topic in topics)
+
+def synthetic_dataset(count, seed=0):
+    """`count` faculty records as the scraper emits them, with unique names."""
+
+    rng = random.Random(seed)
+    seen = set()
+    records = []
+    for i, name in enumerate(synthetic_names(count, seed)):
+        if name in seen:
+            # synthetic names repeat at scale; the suffix keeps the ingestion key unique
+            name = f"{name} {i:06d}"
+        seen.add(name)
+        records.append({
+            "name": name,
+            "profile_url": f"https://engineering.purdue.edu/ECE/People/ptProfile?resource_id={i}",
+            "personal_webpage": f"https://engineering.purdue.edu/~f{i}" if rng.random() < 0.7 else None,
+            "research_interests": synthetic_research(rng) if rng.random() < 0.9 else None,
+        })
+    return records
+
+def directory_html(records):
+    """A directory page listing `records` the way the ECE people page does."""
+
+    entries = []
+    for record in records:
+        first, _, last = record["name"].rpartition(" ")
+        href = record["profile_url"].replace("https://engineering.purdue.edu", "")
+        entries.append(
+            f"<div class='row'><div class='col-12 list-name'>"
+            f"<a href='{escape(href)}'>{escape(first)} <strong>{escape(last)}</strong></a>"
+            f"</div><div class='col-12 list-title'>Professor of ECE</div></div>"
+        )
+    return f"<html><body><div class='people'>{''.join(entries)}</div></body></html>".encode("utf-8")
+
+def profile_html(record, filler=40):
+    """A profile page for `record`, with `filler` unrelated blocks around the parts the scraper reads."""
+
+    blocks = "".join(
+        f"<div class='item'><span>News {i}</span><em>Lorem ipsum dolor sit amet</em></div>" for i in range(filler)
+    )
+    webpage = ""
+    if record.get("personal_webpage"):
+        webpage = f"<div><strong>Webpage:</strong> <a href='{escape(record['personal_webpage'])}'>site</a></div>"
+    research = ""
+    if record.get("research_interests"):
+        research = f"<div><h2>Research</h2><p class='lead profile-research'>{escape(record['research_interests'])}</p></div>"
+    return (
+        f"<html><head><title>{escape(record['name'])}</title></head><body>"
+        f"<nav>{blocks}</nav><div class='profile'><h1>{escape(record['name'])}</h1>{webpage}{research}</div>"
+        f"<footer>{blocks}</footer></body></html>"
+    ).encode("utf-8")
+
+def percentile(sorted_values, fraction):
+    """The value at `fraction` (0-1) of an ascending list, e.g. 0.99 for p99."""
+
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
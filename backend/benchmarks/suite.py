@@ -0,0 +1,273 @@
+"""
+Benchmark suite: parsing, ingestion and API latency on synthetic datasets.
+
+For each dataset size it measures
+  - parse throughput of scrape_faculty_profile (served synthetic profile
+    pages by an in-memory session) and parse_faculty_directory
+  - ingest_faculty_data rows/sec, cold insert and unchanged re-ingest,
+    into a scratch SQLite file
+  - p50 / p95 / p99 latency of every read endpoint through the TestClient,
+    with the response cache cleared before each request (plus one
+    cached-hit measurement). The admin /update endpoints are left out
+    since they scrape the live site.
+
+Results are written as JSON. With --baseline, every metric is compared to
+a previous results file and the run exits with status 1 if any of them is
+more than --tolerance worse.
+
+Usage:
+    python -m backend.benchmarks.suite [--sizes 1000,10000,100000] [--requests N]
+                                       [--output FILE] [--baseline FILE] [--tolerance 0.25]
+                                       [--min-delta-ms 1.0]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from unittest.mock import MagicMock, patch
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend import data_ingestion, scraper
+from backend.app.main import app
+from backend.app.pagination import encode_cursor
+from backend.app.response_cache import get_response_cache
+from backend.benchmarks.fixtures import (
+    RESEARCH_TOPICS, synthetic_dataset, directory_html, profile_html, misspell, percentile
+)
+from backend.data_ingestion import ingest_faculty_data
+from backend.db.database import get_db, get_read_db
+from backend.db.init_db import upgrade_schema
+from backend.db.models import Faculty
+from backend.search_engine import build_search_engine
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_SIZES = "1000,10000,100000"
+PARSE_PAGES = 200               # distinct synthetic profile pages
+EXPORT_REQUESTS = 5             # full exports are much slower than the other endpoints
+
+# --- measurements ---
+
+class Results:
+    """Flat name -> {value, unit, better} metrics, where better is "higher" or "lower"."""
+
+    def __init__(self):
+        self.metrics = {}
+
+    def add(self, name, value, unit, better):
+        self.metrics[name] = {"value": round(value, 4), "unit": unit, "better": better}
+        print(f"  {name:55} {value:12.3f} {unit}")
+
+    def add_latencies(self, name, timings_ms):
+        timings_ms = sorted(timings_ms)
+        for label, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            self.add(f"{name}.{label}", percentile(timings_ms, fraction), "ms", "lower")
+
+def fake_session(pages):
+    """A stand-in requests.Session that serves `pages` ({url: body}) with 200s."""
+
+    def get(url, **kwargs):
+        response = MagicMock()
+        response.status_code = 200
+        response.content = pages[url]
+        response.headers = {}
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session
+
+def bench_parsing(results, size):
+    records = synthetic_dataset(PARSE_PAGES)
+    pages = {r["profile_url"]: profile_html(r) for r in records}
+    session = fake_session(pages)
+    repeat = max(1, size // PARSE_PAGES)
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for record in records:
+            scraper.scrape_faculty_profile(record["profile_url"], record["name"], session=session)
+    results.add(f"parse.{size}.profile", repeat * len(records) / (time.perf_counter() - start), "pages/s", "higher")
+
+    directory = directory_html(synthetic_dataset(size))
+    start = time.perf_counter()
+    entries = scraper.parse_faculty_directory(directory)
+    results.add(f"parse.{size}.directory", len(entries) / (time.perf_counter() - start), "entries/s", "higher")
+
+def bench_ingestion(results, size, db, records):
+    report = ingest_faculty_data(db, records)
+    results.add(f"ingest.{size}.cold", size / report["timings"]["total"], "rows/s", "higher")
+    report = ingest_faculty_data(db, records)
+    results.add(f"ingest.{size}.unchanged", size / report["timings"]["total"], "rows/s", "higher")
+
+def endpoint_requests(records, ids, rng):
+    """(name, factory) pairs; each factory returns the (method, url, kwargs) of one request."""
+
+    names = [r["name"] for r in records]
+    topics = [topic.split()[-1] for topic in RESEARCH_TOPICS]
+
+    def get(url, **params):
+        return "GET", url, {"params": params}
+
+    return [
+        ("faculty_by_id", lambda: get(f"/api/v1/faculty/{rng.choice(ids)}")),
+        ("faculty_similar", lambda: get(f"/api/v1/faculty/{rng.choice(ids)}/similar")),
+        ("faculty_batch", lambda: ("POST", "/api/v1/faculty/batch", {"json": {"ids": rng.sample(ids, 50)}})),
+        ("search_name_memory", lambda: get("/api/v1/search/name", q=rng.choice(names).split()[-1])),
+        ("search_name_fts", lambda: get("/api/v1/search/name", q=rng.choice(names).split()[-1], mode="fts")),
+        ("search_name_substring", lambda: get("/api/v1/search/name", q=rng.choice(names)[1:4], mode="substring")),
+        ("search_name_fuzzy", lambda: get("/api/v1/search/name", q=misspell(rng.choice(names), rng), fuzzy=True)),
+        ("search_research_memory", lambda: get("/api/v1/search/research", q=rng.choice(topics))),
+        ("search_research_fts", lambda: get("/api/v1/search/research", q=rng.choice(topics), mode="fts")),
+        ("search_research_substring", lambda: get("/api/v1/search/research", q=rng.choice(topics), mode="substring")),
+        ("search_unified", lambda: get("/api/v1/search", q=rng.choice((rng.choice(names).split()[-1], rng.choice(topics))))),
+        ("search_semantic", lambda: get("/api/v1/search/semantic", q=" ".join(rng.sample(topics, 2)))),
+        ("autocomplete", lambda: get("/api/v1/autocomplete", q=rng.choice(names)[:rng.randint(1, 4)])),
+        ("search_all", lambda: get("/api/v1/search/all", cursor=encode_cursor({"id": rng.choice(ids)}))),
+        ("tags", lambda: get("/api/v1/tags")),
+        ("cache_stats", lambda: get("/api/v1/cache/stats")),
+    ]
+
+def time_request(client, method, url, kwargs):
+    start = time.perf_counter()
+    response = client.request(method, url, **kwargs)
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code != 200:
+        raise RuntimeError(f"{method} {url} returned {response.status_code}: {response.text[:200]}")
+    return elapsed
+
+def bench_endpoints(results, size, client, records, ids, count):
+    rng = random.Random(size)
+    cache = get_response_cache()
+
+    for name, make_request in endpoint_requests(records, ids, rng):
+        time_request(client, *make_request())   # warm-up, not timed
+        timings = []
+        for _ in range(count):
+            cache.clear()
+            timings.append(time_request(client, *make_request()))
+        results.add_latencies(f"api.{size}.{name}", timings)
+
+    timings = []
+    for _ in range(EXPORT_REQUESTS):
+        cache.clear()
+        timings.append(time_request(client, "GET", "/api/v1/export", {}))
+    results.add_latencies(f"api.{size}.export", timings)
+
+    # the same request repeated: served by the response cache after the first
+    cache.clear()
+    request = ("GET", "/api/v1/search/research", {"params": {"q": "quantum"}})
+    timings = [time_request(client, *request) for _ in range(count)]
+    results.add_latencies(f"api.{size}.cached_hit", timings[1:])
+
+def run_size(results, size, count, tmp):
+    print(f"\n== {size} faculty ==")
+    records = synthetic_dataset(size)
+    bench_parsing(results, size)
+
+    engine = create_engine(f"sqlite:///{os.path.join(tmp, f'bench_{size}.db')}", connect_args={"check_same_thread": False})
+    upgrade_schema(engine)
+    SessionLocal = sessionmaker(bind=engine)
+    db = SessionLocal()
+    try:
+        bench_ingestion(results, size, db, records)
+
+        start = time.perf_counter()
+        build_search_engine(db)
+        results.add(f"index.{size}.build", time.perf_counter() - start, "s", "lower")
+
+        def override_get_db():
+            session = SessionLocal()
+            try:
+                yield session
+            finally:
+                session.close()
+
+        ids = [faculty_id for faculty_id, in db.query(Faculty.id)]
+        app.dependency_overrides[get_db] = app.dependency_overrides[get_read_db] = override_get_db
+        try:
+            bench_endpoints(results, size, TestClient(app), records, ids, count)
+        finally:
+            app.dependency_overrides.pop(get_db, None)
+            app.dependency_overrides.pop(get_read_db, None)
+    finally:
+        db.close()
+        engine.dispose()
+
+# --- comparison ---
+
+def compare(metrics, baseline, tolerance, min_delta_ms):
+    """
+    Returns the metrics that are more than `tolerance` worse than in
+    `baseline`, printing every change. Latencies must also be at least
+    `min_delta_ms` slower, so jitter on sub-millisecond timings is not flagged.
+    """
+
+    regressions = []
+    print(f"\nComparison with baseline (tolerance {tolerance:.0%}, min latency delta {min_delta_ms} ms):")
+    for name, metric in metrics.items():
+        old = baseline.get(name)
+        if old is None or not old["value"]:
+            continue
+        change = metric["value"] / old["value"] - 1
+        if metric["better"] == "lower":
+            worse = change > tolerance and (metric["unit"] != "ms" or metric["value"] - old["value"] >= min_delta_ms)
+        else:
+            worse = change < -tolerance
+        flag = "REGRESSION" if worse else ""
+        print(f"  {name:55} {old['value']:12.3f} -> {metric['value']:12.3f} {metric['unit']:9} {change:+7.1%} {flag}")
+        if worse:
+            regressions.append(name)
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma separated dataset sizes")
+    parser.add_argument("--requests", type=int, default=200, help="requests timed per endpoint")
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--baseline", help="previous results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative slowdown before a metric counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0,
+                        help="smallest latency increase that can count as a regression")
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    results = Results()
+    with tempfile.TemporaryDirectory() as tmp:
+        # keep scraper / ingestion log lines out of the real log file
+        with patch.object(scraper, "LOG_FILE", os.path.join(tmp, "scraper.log")), \
+                patch.object(data_ingestion, "LOG_FILE", os.path.join(tmp, "ingest.log")):
+            for size in sizes:
+                run_size(results, size, args.requests, tmp)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump({
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "sizes": sizes,
+            "requests": args.requests,
+            "metrics": results.metrics,
+        }, f, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["metrics"]
+        regressions = compare(results.metrics, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print(f"\n{len(regressions)} metric(s) regressed: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\nNo regressions.")
+
+if __name__ == "__main__":
+    main()
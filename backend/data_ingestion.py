@@ -1,77 +1,623 @@
+import hashlib
 import json
 import os
+import re
+import time
+from contextlib import nullcontext
 from datetime import datetime
+from sqlalchemy import func, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 from backend.db.database import SessionLocal, engine
-from backend.db.models import Faculty, Base
-from backend.scraper import log_message, LOG_FILE
+from backend.db.models import Faculty, AppMetadata, Base, Tag, faculty_tags
+from backend.db.fts import deferred_fts_index
+from backend.db.generation import bump_generation
+from backend.log_sink import log_record
+from backend.topics import TopicTagger
+from backend.db.departments import department_codes, normalize_departments, update_faculty_departments
+from backend.metrics import (
+    INGEST_TIME, INGEST_ROWS, REFRESH_PHASE_TIME, REFRESH_BYTES, REFRESH_COMPLETED, SCRAPER_BYTES
+)
 
 # --- Configuration ---
 BASE_DIR = os.path.dirname(__file__)
 DATA_FILE_PATH = os.path.join(BASE_DIR, "faculty_data_complete.json")
+INGEST_BATCH_SIZE = 1000        # rows per INSERT ... ON CONFLICT statement
+UPSERT_COLUMNS = ("webpage_url", "research_interests", "profile_url", "content_hash", "department", "webpage_keywords")
+RECORD_KEYS = {"webpage_url": "personal_webpage"}   # record key of columns not named the same in scraped records
+SEED_HASH_KEY = "seed_data_sha256"
+JSON_READ_CHUNK = 1 << 16       # characters read at a time when streaming a JSON array file
+# Same JSON-lines log as the scraper. The scraper itself (requests, BeautifulSoup,
+# lxml) is only imported when a refresh runs, so the API starts without it.
+LOG_FILE = os.path.join(BASE_DIR, "faculty_scraper.log")
 # --- End Configuration ---
 
-def load_data_from_json(file_path: str) -> list:
-    """Reads and parses the faculty data from the JSON file."""
+def log_message(message, log_mode="a"):
+    log_record(LOG_FILE, message, truncate=(log_mode == "w"))
+
+ARRAY_SEPARATOR = re.compile(r"[\s,]*")
+ARRAY_SPACE = re.compile(r"\s*")
+
+def iter_json_array(f, chunk_size: int = JSON_READ_CHUNK):
+    """
+    Yields the elements of a JSON array one at a time from text file `f`,
+    positioned just past the opening bracket. Each is decoded from a buffer
+    refilled `chunk_size` characters at a time, so memory follows the
+    largest record rather than the whole file.
+    """
+
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = "", 0, False
+    while True:
+        pos = ARRAY_SEPARATOR.match(buffer, pos).end()
+        if pos < len(buffer) and buffer[pos] == "]":
+            return
+        try:
+            record, end = decoder.raw_decode(buffer, pos)
+            delimiter = ARRAY_SPACE.match(buffer, end).end()
+            complete = delimiter < len(buffer) and buffer[delimiter] in ",]"
+        except json.JSONDecodeError:
+            complete = False
+        # a value is only taken once the delimiter after it is buffered, since
+        # it may continue in the next chunk (a number cut short still decodes)
+        if not complete:
+            if eof:
+                raise json.JSONDecodeError("Unterminated array element", buffer, pos)
+            more = f.read(chunk_size)
+            eof = not more
+            buffer, pos = buffer[pos:] + more, 0
+            continue
+        yield record
+        pos = end
+
+def iter_faculty_records(file_path: str):
+    """
+    Yields faculty records from either a JSON array file or a JSON-lines
+    file (one record per line), detected from the first non-blank character.
+    Both are streamed: arrays a record at a time through iter_json_array,
+    JSON-lines files a line at a time, where a malformed line, such as one
+    cut short by a crash, is skipped with a warning.
+    """
+
+    with open(file_path, 'r', encoding='utf-8') as f:
+        first = f.read(1)
+        while first and first.isspace():
+            first = f.read(1)
+        if first == "[":
+            yield from iter_json_array(f)
+            return
+
+        f.seek(0)
+
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as e:
+                log_message(f"WARNING: Skipping malformed line {line_no} in {file_path}: {e}", "a")
+
+def load_data_from_json(file_path: str):
+    """Streams the faculty records of a JSON array or JSON-lines file (nothing if it is missing)."""
 
     if not os.path.exists(file_path):
         print(f"Error: Data file not found at {file_path}")
-        return []
+        return iter(())
     
-    with open(file_path, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    return iter_faculty_records(file_path)
+
+def get_metadata(db: Session, key: str):
+    row = db.get(AppMetadata, key)
+    return row.value if row else None
+
+def set_metadata(db: Session, key: str, value: str):
+    db.merge(AppMetadata(key=key, value=value, updated_at=datetime.now()))
+    db.commit()
+
+def ingest_seed_file(db: Session, file_path: str, force: bool = False) -> dict:
+    """
+    Ingests the scraped JSON file unless its content hash matches the one
+    recorded by the last ingestion (and the faculty table is not empty).
+    Returns {"skipped": bool, "sha256": ..., "records": n} plus the ingestion
+    report when the file was ingested.
+    """
+
+    if not os.path.exists(file_path):
+        print(f"Error: Data file not found at {file_path}")
+        return {"skipped": True, "sha256": None, "records": 0}
+
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    digest = digest.hexdigest()
+
+    if not force and get_metadata(db, SEED_HASH_KEY) == digest and db.query(Faculty.id).first() is not None:
+        log_message(f"Seed data unchanged ({digest[:12]}), skipping ingestion", "a")
+        if db.query(Tag.id).first() is None:
+            # database filled before topic tags existed
+            rebuild_faculty_tags(db)
+            db.commit()
+        return {"skipped": True, "sha256": digest, "records": 0}
+
+    report = ingest_faculty_data(db, iter_faculty_records(file_path))
+    set_metadata(db, SEED_HASH_KEY, digest)
+    return {"skipped": False, "sha256": digest, **report}
+
+def ingest_faculty_data(db: Session, faculty_data, batch_size: int = INGEST_BATCH_SIZE) -> dict:
+    """
+    Bulk-upserts faculty records keyed on name.
+    `faculty_data` may be any iterable (e.g. iter_faculty_records), consumed
+    `batch_size` records at a time so memory stays flat. For each batch the
+    stored rows are loaded in one query so unchanged records are not written
+    at all; new and changed rows go out in one INSERT ... ON CONFLICT(name)
+    DO UPDATE statement per set of columns present. Columns a record does not
+    carry (e.g. webpage_keywords when that stage did not run) keep their
+    stored value rather than being nulled. Written rows are re-tagged batch
+    by batch (retag_faculty); only a first ingestion fits the tagger on the
+    whole corpus. Into an empty table (a cold load) the full-text index is
+    not maintained row by row: its triggers are dropped for the load and the
+    index rebuilt once (deferred_fts_index). Everything is committed in one
+    transaction.
+    Returns a report with record/added/updated/unchanged counts and phase
+    timings in seconds (load, write, index: the deferred index and tag work, total).
+    """
 
-def ingest_faculty_data(db: Session, faculty_data: list):
-    """Inserts faculty data into the database, checking for duplicates."""
-    
     log_message(f"--- Starting data ingestion into database ---", "a")
+    started = time.perf_counter()
+
+    statements = {}
+
+    def upsert(columns):
+        # one statement per set of columns present, built once per ingestion
+        if columns not in statements:
+            stmt = sqlite_insert(Faculty)
+            if columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[Faculty.name], set_={column: stmt.excluded[column] for column in columns}
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=[Faculty.name])
+            statements[columns] = stmt
+        return statements[columns]
+
+    now = datetime.now()
+    report = {"records": 0, "added": 0, "updated": 0, "unchanged": 0}
+    load_time = write_time = 0.0
+
+    def flush(incoming):
+        nonlocal load_time, write_time
+        t0 = time.perf_counter()
+        existing = {
+            row.name: dict(zip(UPSERT_COLUMNS, row[1:]))
+            for row in db.query(
+                Faculty.name, *(getattr(Faculty, column) for column in UPSERT_COLUMNS)
+            ).filter(Faculty.name.in_(list(incoming)))
+        }
+        t1 = time.perf_counter()
+
+        groups = {}
+        for name, values in incoming.items():
+            stored = existing.get(name)
+            if stored is None:
+                report["added"] += 1
+            elif all(stored[column] == values[column] for column in values if column != "name"):
+                report["unchanged"] += 1
+                continue
+            else:
+                report["updated"] += 1
+            columns = tuple(column for column in UPSERT_COLUMNS if column in values)
+            groups.setdefault(columns, []).append({**values, "created_at": now})
+        for columns, rows in groups.items():
+            db.execute(upsert(columns), rows)
+        if groups:
+            # keep the rows derived from the written records in step with them
+            names = [row["name"] for rows in groups.values() for row in rows]
+            written_ids = [faculty_id for faculty_id, in db.query(Faculty.id).filter(Faculty.name.in_(names))]
+            update_faculty_departments(db, written_ids)
+            if not refit_tags:
+                retag_faculty(db, written_ids)
+
+        load_time += t1 - t0
+        write_time += time.perf_counter() - t1
+        return sum(len(rows) for rows in groups.values())
+
+    # without any tags yet (first ingestion) the n-gram tags need the whole corpus
+    refit_tags = db.query(Tag.id).first() is None
+    # into an empty table, index the full-text search once at the end rather than row by row
+    bulk_load = db.query(Faculty.id).first() is None
+    written = 0
+    try:
+        with deferred_fts_index(db) if bulk_load else nullcontext():
+            # Last record wins when the same name appears twice in one batch
+            incoming = {}
+            for item in faculty_data:
+                report["records"] += 1
+                incoming[item["name"]] = {
+                    "name": item["name"],
+                    **{
+                        column: item[RECORD_KEYS.get(column, column)]
+                        for column in UPSERT_COLUMNS if RECORD_KEYS.get(column, column) in item
+                    },
+                }
+                if "department" in item:
+                    incoming[item["name"]]["department"] = normalize_departments(item["department"])
+                if len(incoming) >= batch_size:
+                    written += flush(incoming)
+                    incoming = {}
+            if incoming:
+                written += flush(incoming)
+            t0 = time.perf_counter()
+        # the deferred full-text index rebuilds on leaving the block above
+        if written and refit_tags:
+            rebuild_faculty_tags(db)
+        index_time = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        db.commit()
+        write_time += time.perf_counter() - t0
+    except Exception:
+        db.rollback()
+        raise
+    if written:
+        bump_generation()
+
+    report["timings"] = {
+        "load": round(load_time, 4),
+        "write": round(write_time, 4),
+        "index": round(index_time, 4),
+        "total": round(time.perf_counter() - started, 4),
+    }
+    for step, seconds in report["timings"].items():
+        INGEST_TIME.set(seconds, step=step)
+    for outcome in ("added", "updated", "unchanged"):
+        INGEST_ROWS.set(report[outcome], outcome=outcome)
+    log_message(
+        f"--- Data ingestion complete: {report['added']} added, {report['updated']} updated, "
+        f"{report['unchanged']} unchanged in {report['timings']['total']:.2f}s "
+        f"(load {report['timings']['load']:.2f}s, write {report['timings']['write']:.2f}s) ---", "a"
+    )
+
+    print(f"\nSuccessfully added {report['added']} new and updated {report['updated']} faculty records.")
+    return report
+
+def _iter_documents(db: Session, faculty_ids=None, batch_size: int = INGEST_BATCH_SIZE):
+    """
+    Yields (faculty_id, text) with the research interests and webpage
+    keywords of every faculty member (or of `faculty_ids`), `batch_size`
+    rows per query so the corpus is never held in memory at once.
+    """
+
+    columns = (Faculty.id, Faculty.research_interests, Faculty.webpage_keywords)
+    if faculty_ids is None:
+        last_id = 0
+        while True:
+            rows = db.query(*columns).filter(Faculty.id > last_id).order_by(Faculty.id).limit(batch_size).all()
+            for row in rows:
+                yield row.id, " ".join(filter(None, (row.research_interests, row.webpage_keywords)))
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1].id
+
+    faculty_ids = list(faculty_ids)
+    for start in range(0, len(faculty_ids), batch_size):
+        for row in db.query(*columns).filter(Faculty.id.in_(faculty_ids[start:start + batch_size])):
+            yield row.id, " ".join(filter(None, (row.research_interests, row.webpage_keywords)))
+
+def _link_tags(db: Session, tagger: TopicTagger, documents, tag_ids: dict) -> set:
+    """
+    Inserts the faculty_tags rows for `documents`, adding Tag rows for tags
+    not in `tag_ids` (name -> id, updated in place). Returns the tag ids used.
+    """
+
+    used = set()
+    links = []
+    for faculty_id, text in documents:
+        for tag in tagger.tags(text):
+            if tag not in tag_ids:
+                result = db.execute(Tag.__table__.insert().values(name=tag, source=tagger.source(tag), faculty_count=0))
+                tag_ids[tag] = result.inserted_primary_key[0]
+            links.append({"faculty_id": faculty_id, "tag_id": tag_ids[tag]})
+            used.add(tag_ids[tag])
+        if len(links) >= INGEST_BATCH_SIZE:
+            db.execute(faculty_tags.insert(), links)
+            links = []
+    if links:
+        db.execute(faculty_tags.insert(), links)
+    return used
+
+def _recount_tags(db: Session, tag_ids=None):
+    """Recomputes faculty_count of `tag_ids` (all tags by default) from the association table."""
+
+    tags = Tag.__table__
+    count = select(func.count()).where(faculty_tags.c.tag_id == tags.c.id).scalar_subquery()
+    stmt = tags.update().values(faculty_count=count)
+    if tag_ids is not None:
+        stmt = stmt.where(tags.c.id.in_(list(tag_ids)))
+    db.execute(stmt)
+
+def rebuild_faculty_tags(db: Session) -> int:
+    """
+    Refits the topic tagger on every faculty member's research interests and
+    webpage keywords (n-gram tags depend on the whole corpus) and replaces
+    the tags and faculty_tags tables along with each tag's faculty count.
+    Documents are streamed from the database twice, once to fit and once to
+    tag. Runs in the caller's transaction and does not commit.
+    Returns the number of tags.
+    """
+
+    started = time.perf_counter()
+    tagger = TopicTagger().fit(text for _, text in _iter_documents(db))
+
+    db.execute(faculty_tags.delete())
+    db.query(Tag).delete()
+    tag_ids = {}
+    _link_tags(db, tagger, _iter_documents(db), tag_ids)
+    _recount_tags(db)
+
+    INGEST_TIME.set(round(time.perf_counter() - started, 4), step="tags")
+    log_message(f"Tagged every faculty member with {len(tag_ids)} topic tags", "a")
+    return len(tag_ids)
+
+def retag_faculty(db: Session, faculty_ids) -> int:
+    """
+    Re-tags only `faculty_ids` (ids without a faculty row lose their tags):
+    vocabulary tags plus the n-gram tags learned by the last
+    rebuild_faculty_tags, without refitting on the corpus. The faculty
+    counts of every tag gained or lost are recomputed. Runs in the caller's
+    transaction and does not commit. Returns the number of faculty re-tagged.
+    """
+
+    faculty_ids = list(faculty_ids)
+    if not faculty_ids:
+        return 0
+
+    tags = db.query(Tag.name, Tag.id, Tag.source).all()
+    tag_ids = {tag.name: tag.id for tag in tags}
+    tagger = TopicTagger(ngram_tags=[tag.name for tag in tags if tag.source == "ngram"])
+
+    affected = set()
+    for start in range(0, len(faculty_ids), INGEST_BATCH_SIZE):
+        batch = faculty_ids[start:start + INGEST_BATCH_SIZE]
+        previous = db.query(faculty_tags.c.tag_id).filter(faculty_tags.c.faculty_id.in_(batch)).distinct()
+        affected.update(tag_id for tag_id, in previous)
+        db.execute(faculty_tags.delete().where(faculty_tags.c.faculty_id.in_(batch)))
+        affected |= _link_tags(db, tagger, _iter_documents(db, batch), tag_ids)
+    if affected:
+        _recount_tags(db, affected)
+    return len(faculty_ids)
+
+def load_known_profiles(db: Session) -> dict:
+    """Returns {profile_url: stored record} for faculty scraped with a content hash."""
+
+    rows = db.query(
+        Faculty.profile_url, Faculty.content_hash, Faculty.webpage_url, Faculty.research_interests
+    ).filter(Faculty.profile_url.isnot(None)).all()
+
+    return {
+        row.profile_url: {
+            "content_hash": row.content_hash,
+            "personal_webpage": row.webpage_url,
+            "research_interests": row.research_interests,
+        }
+        for row in rows
+    }
+
+def sync_faculty_data(db: Session, faculty_data: list, remove_missing: bool = True,
+                      keep_departments=(), refit_tags: bool = False) -> dict:
+    """
+    Makes the faculty table match a freshly scraped list.
+    Records are matched by profile URL (falling back to name for rows stored
+    before profile URLs were kept). New faculty are inserted, changed ones
+    updated, entries marked `changed: False` by enrichment are left alone, and
+    faculty no longer in the directory are deleted when `remove_missing` is set.
+    `keep_departments` names departments whose directory failed to load:
+    their faculty (and rows with no department on record) are not removed,
+    and stored listings in them are kept.
+    Only the faculty added, updated or removed are re-tagged, unless
+    `refit_tags` asks for the n-gram tags to be learned again from the whole corpus.
+    Returns a delta report with added/updated/removed names and an unchanged count.
+    """
+
+    log_message(f"--- Starting incremental sync into database ---", "a")
+    # stored codes are upper-cased (normalize_departments), directory keys are not ("ChE")
+    keep_departments = {code.strip().upper() for code in keep_departments}
+
+    existing = db.query(Faculty).all()
+    by_url = {f.profile_url: f for f in existing if f.profile_url}
+    by_name = {f.name: f for f in existing}
+
+    delta = {"added": [], "updated": [], "removed": [], "unchanged": 0}
+    seen_ids = set()
+    touched = []        # added, updated and removed faculty, whose derived rows are refreshed below
 
-    total_added = 0
-    
     for item in faculty_data:
-        log_message(f"Processing: {item['name']}", "a")
-        existing_faculty = db.query(Faculty).filter(Faculty.name == item["name"]).first()
+        faculty = by_url.get(item.get("profile_url")) or by_name.get(item["name"])
 
-        # EDIT LATER FOR UPDATING
-        if existing_faculty:
-            print(f"Skipping: {item['name']} already exists.")
+        if faculty is None:
+            faculty = Faculty(
+                name=item["name"],
+                webpage_url=item.get("personal_webpage"),
+                research_interests=item.get("research_interests"),
+                profile_url=item.get("profile_url"),
+                content_hash=item.get("content_hash"),
+                department=normalize_departments(item.get("department")),
+                webpage_keywords=item.get("webpage_keywords"),
+                created_at=datetime.now()
+            )
+            db.add(faculty)
+            by_name[faculty.name] = faculty
+            touched.append(faculty)
+            delta["added"].append(item["name"])
+            log_message(f"Added: {item['name']}", "a")
             continue
-            
-        # Create a new Faculty object
-        new_faculty = Faculty(
-            name=item["name"],
-            webpage_url=item.get("personal_webpage"), 
-            research_interests=item.get("research_interests"),
-            created_at=datetime.now()
-        )
-        
-        # Add the new object to the session
-        db.add(new_faculty)
-        total_added += 1
 
-    # Commit all changes to the database
+        seen_ids.add(faculty.id)
+        # fields that can change while the profile page stays the same: the
+        # department listings, and webpage keywords (absent when that stage was skipped)
+        department = item.get("department") or faculty.department
+        kept = [code for code in department_codes(faculty.department)
+                if code in keep_departments and code not in department_codes(department)]
+        listing = {
+            "department": normalize_departments(",".join(department_codes(department) + kept)),
+            "webpage_keywords": item["webpage_keywords"] if "webpage_keywords" in item else faculty.webpage_keywords,
+        }
+        if item.get("changed") is False:
+            if any(getattr(faculty, key) != value for key, value in listing.items()):
+                for key, value in listing.items():
+                    setattr(faculty, key, value)
+                touched.append(faculty)
+                delta["updated"].append(item["name"])
+                log_message(f"Updated: {item['name']}", "a")
+            else:
+                delta["unchanged"] += 1
+            continue
+
+        values = {
+            "name": item["name"],
+            "webpage_url": item.get("personal_webpage"),
+            "research_interests": item.get("research_interests"),
+            "profile_url": item.get("profile_url") or faculty.profile_url,
+            "content_hash": item.get("content_hash") or faculty.content_hash,
+            **listing,
+        }
+        if all(getattr(faculty, key) == value for key, value in values.items()):
+            delta["unchanged"] += 1
+            continue
+
+        for key, value in values.items():
+            setattr(faculty, key, value)
+        touched.append(faculty)
+        delta["updated"].append(item["name"])
+        log_message(f"Updated: {item['name']}", "a")
+
+    if remove_missing:
+        for faculty in existing:
+            if faculty.id in seen_ids:
+                continue
+            codes = department_codes(faculty.department)
+            if keep_departments and (not codes or keep_departments.intersection(codes)):
+                # not listed because their directory failed; checked again on the next refresh
+                continue
+            db.delete(faculty)
+            touched.append(faculty)
+            delta["removed"].append(faculty.name)
+            log_message(f"Removed: {faculty.name}", "a")
+
+    changed = bool(delta["added"] or delta["updated"] or delta["removed"])
+    if changed:
+        db.flush()
+        touched_ids = [faculty.id for faculty in touched]
+        update_faculty_departments(db, touched_ids)
+        if refit_tags or db.query(Tag.id).first() is None:
+            rebuild_faculty_tags(db)
+        else:
+            retag_faculty(db, touched_ids)
+    elif refit_tags:
+        rebuild_faculty_tags(db)
     db.commit()
-    log_message(f"--- Data ingestion complete: {total_added} new records added ---", "a")
+    if changed or refit_tags:
+        bump_generation()
+    log_message(
+        f"--- Sync complete: {len(delta['added'])} added, {len(delta['updated'])} updated, "
+        f"{len(delta['removed'])} removed, {delta['unchanged']} unchanged ---", "a"
+    )
+    return delta
+
+def refresh_faculty_data(db: Session, incremental: bool = True, progress=None, webpages: bool = False) -> dict:
+    """
+    Re-scrapes the directory and syncs the database with it.
+    In incremental mode, profiles whose page hash matches the stored one are
+    neither parsed nor written. With `webpages`, keywords are also extracted
+    from the personal webpages of faculty whose profile has no research
+    interests (see enrich_personal_webpages). Returns the delta report from
+    sync_faculty_data, or None if no directory could be scraped. Faculty of
+    departments whose directory failed are kept (see `failed_departments` in the report).
 
-    print(f"\nSuccessfully added {total_added} new faculty records.")
+    `progress`, if given, is told about each phase via progress.set_phase(name)
+    and about each finished profile via progress.profile_done(done, total, error).
+    """
+
+    # imported here so serving the API never loads the scraping stack
+    from backend.scraper import (
+        scrape_faculty_directory, enrich_faculty_data, enrich_personal_webpages, HostRateLimiter, create_parse_pool,
+        failed_departments, save_complete_data
+    )
+    from backend.http_cache import ResponseCache
+
+    cache = ResponseCache()
+    # directory and profile fetches share one politeness budget per host and one parse pool
+    limiter = HostRateLimiter()
+    parse_pool = create_parse_pool()
+    bytes_before = SCRAPER_BYTES.get()
+    current = {"phase": None, "started": time.perf_counter()}
+
+    def enter_phase(phase):
+        # record how long the previous phase took (exported on /metrics)
+        now = time.perf_counter()
+        if current["phase"]:
+            REFRESH_PHASE_TIME.set(round(now - current["started"], 4), phase=current["phase"])
+        current.update(phase=phase, started=now)
+        if progress and phase:
+            progress.set_phase(phase)
+
+    try:
+        enter_phase("directory")
+        raw_list = scrape_faculty_directory(cache=cache, limiter=limiter, parse_pool=parse_pool)
+        if not raw_list:
+            return None
+        # one failed directory must not delete that department's faculty
+        failed = failed_departments(raw_list)
+        if failed:
+            log_message(f"WARNING: Keeping unlisted faculty of {', '.join(failed)}: directory failed to load", "a")
+
+        enter_phase("profiles")
+        known_profiles = load_known_profiles(db) if incremental else None
+        enriched = enrich_faculty_data(
+            raw_list, cache=cache, known_profiles=known_profiles,
+            on_profile=progress.profile_done if progress else None,
+            limiter=limiter, parse_pool=parse_pool
+        )
+        if webpages:
+            enter_phase("webpages")
+            enrich_personal_webpages(enriched, limiter=limiter, parse_pool=parse_pool)
+            # the seed file was written before this stage; without the keywords, the next
+            # startup ingestion would not know about them
+            save_complete_data(enriched)
+
+        enter_phase("sync")
+        # a full refresh also learns the n-gram tags again from the whole corpus
+        delta = sync_faculty_data(db, enriched, keep_departments=failed, refit_tags=not incremental)
+        delta["failed_departments"] = failed
+        delta["record_count"] = len(enriched)
+        delta["cache"] = cache.stats()
+        REFRESH_COMPLETED.set(round(time.time(), 3))
+        return delta
+    finally:
+        enter_phase(None)
+        REFRESH_BYTES.set(SCRAPER_BYTES.get() - bytes_before)
+        if parse_pool is not None:
+            parse_pool.shutdown()
+        cache.close()
 
 if __name__ == "__main__":
     # Ensure tables exist before trying to insert data (safe to call again)
     print("Ensuring tables are initialized...")
     Base.metadata.create_all(bind=engine) 
     
-    # 1. Load the data from the JSON file
+    # 1. Stream the data from the JSON file
     data_to_ingest = load_data_from_json(DATA_FILE_PATH)
     
-    if data_to_ingest:
-        # 2. Get a database session
-        db_session = SessionLocal()
-        
-        # 3. Ingest the data
-        print(f"Starting ingestion of {len(data_to_ingest)} records...")
-        ingest_faculty_data(db_session, data_to_ingest)
-        
-        # 4. Close the session
-        db_session.close()
+    # 2. Get a database session
+    db_session = SessionLocal()
+    
+    # 3. Ingest the data, batch by batch as it is read
+    print("Starting ingestion...")
+    report = ingest_faculty_data(db_session, data_to_ingest)
+    print(f"Ingested {report['records']} records ({report['added']} added, {report['updated']} updated).")
+    
+    # 4. Close the session
+    db_session.close()
     
     print("Data ingestion complete.")
\ No newline at end of file
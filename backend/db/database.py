@@ -1,19 +1,84 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 import os
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # backend/
 DB_PATH = os.path.join(BASE_DIR, "faculty.db")
 
-# DATABASE_URL expects forward slashes; normalize for sqlite URI
-DATABASE_URL = f"sqlite:///{DB_PATH.replace(os.sep, '/')}"
+# --- Configuration ---
+# SQLITE_TUNED=0 falls back to SQLite's defaults (rollback journal, one engine for reads and writes)
+SQLITE_TUNED = os.getenv("SQLITE_TUNED", "1") != "0"
+POOL_SIZE = 20                  # connections kept open per engine
+POOL_OVERFLOW = 20              # extra connections under load; 40 total matches the request threadpool
+BUSY_TIMEOUT_MS = 30_000        # how long a statement waits on a lock before "database is locked"
+CACHE_SIZE_KB = 64 * 1024       # page cache per connection
+MMAP_SIZE = 256 * 1024 * 1024   # bytes of the file read through memory mapping
+# --- End Configuration ---
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+def sqlite_url(path: str, read_only: bool = False) -> str:
+    # DATABASE_URL expects forward slashes; normalize for sqlite URI
+    path = path.replace(os.sep, '/')
+    if read_only:
+        return f"sqlite:///file:{path}?mode=ro&uri=true"
+    return f"sqlite:///{path}"
+
+def _apply_pragmas(read_only):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        if not read_only:
+            # WAL lets readers keep reading the last committed state while a write is in progress
+            cursor.execute("PRAGMA journal_mode=WAL")
+            # in WAL mode, NORMAL only syncs at checkpoints and is still safe against corruption
+            cursor.execute("PRAGMA synchronous=NORMAL")
+        else:
+            cursor.execute("PRAGMA query_only=1")
+        cursor.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        cursor.execute(f"PRAGMA cache_size=-{CACHE_SIZE_KB}")
+        cursor.execute(f"PRAGMA mmap_size={MMAP_SIZE}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    return on_connect
+
+def create_db_engine(path: str = DB_PATH, read_only: bool = False, tuned: bool = SQLITE_TUNED):
+    """
+    Creates an engine for the SQLite file at `path`.
+    Tuned engines run in WAL mode with larger page caches, memory-mapped
+    reads and a bounded connection pool; a `read_only` engine opens the file
+    with mode=ro, for the GET routes. Untuned engines use SQLite's defaults.
+    """
+
+    connect_args = {"check_same_thread": False}
+    if not tuned:
+        return create_engine(sqlite_url(path), connect_args=connect_args)
+
+    connect_args["timeout"] = BUSY_TIMEOUT_MS / 1000
+    engine = create_engine(
+        sqlite_url(path, read_only=read_only),
+        connect_args=connect_args,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_OVERFLOW,
+    )
+    event.listen(engine, "connect", _apply_pragmas(read_only))
+    return engine
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# GET routes read through their own read-only engine, so they never queue
+# behind the writer's pool or take write locks
+read_engine = create_db_engine(read_only=True) if SQLITE_TUNED else engine
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
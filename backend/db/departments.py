@@ -0,0 +1,58 @@
+from sqlalchemy import select
+from backend.db.models import Faculty, faculty_departments
+
+# --- Configuration ---
+LINK_BATCH_SIZE = 500           # faculty ids per DELETE / SELECT ... IN (...) when relinking
+# --- End Configuration ---
+
+def department_codes(value):
+    """Splits a stored comma separated department list into upper-cased codes."""
+
+    return [code.strip().upper() for code in (value or "").split(",") if code.strip()]
+
+def normalize_departments(value):
+    """The stored form of a department list: upper-cased codes, comma separated, without repeats (None if empty)."""
+
+    return ",".join(dict.fromkeys(department_codes(value))) or None
+
+def department_clause(department: str):
+    """
+    Clause matching faculty listed in `department`, answered from the
+    (code, faculty_id) index of faculty_departments rather than a scan of
+    the comma separated column.
+    """
+
+    listed = select(faculty_departments.c.faculty_id).where(faculty_departments.c.code == department.upper())
+    return Faculty.id.in_(listed.scalar_subquery())
+
+def update_faculty_departments(conn, faculty_ids):
+    """
+    Rewrites the faculty_departments rows of `faculty_ids` from their
+    department column; ids with no faculty row (deleted) just lose theirs.
+    `conn` is a Session or Connection; runs in its transaction.
+    """
+
+    faculty_ids = list(faculty_ids)
+    for start in range(0, len(faculty_ids), LINK_BATCH_SIZE):
+        batch = faculty_ids[start:start + LINK_BATCH_SIZE]
+        conn.execute(faculty_departments.delete().where(faculty_departments.c.faculty_id.in_(batch)))
+        rows = conn.execute(select(Faculty.id, Faculty.department).where(Faculty.id.in_(batch))).all()
+        links = [
+            {"faculty_id": faculty_id, "code": code}
+            for faculty_id, department in rows for code in dict.fromkeys(department_codes(department))
+        ]
+        if links:
+            conn.execute(faculty_departments.insert(), links)
+
+def backfill_faculty_departments(conn) -> bool:
+    """
+    Fills faculty_departments from the department column when it is empty
+    but faculty have departments (databases from before the table existed).
+    Returns whether anything was backfilled.
+    """
+
+    if conn.execute(select(faculty_departments.c.faculty_id).limit(1)).first() is not None:
+        return False
+    ids = conn.execute(select(Faculty.id).where(Faculty.department.isnot(None))).scalars().all()
+    update_faculty_departments(conn, ids)
+    return bool(ids)
@@ -0,0 +1,161 @@
+import re
+from contextlib import contextmanager
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+# --- Configuration ---
+FTS_TABLE = "faculty_fts"
+FTS_COLUMNS = ("name", "research_interests", "webpage_keywords")
+# a search on a faculty column also matches these index columns
+FTS_COLUMN_GROUPS = {"research_interests": ("research_interests", "webpage_keywords")}
+# bm25 weight per FTS column; keywords scraped from personal pages count for less than the profile text
+FTS_WEIGHTS = (1.0, 1.0, 0.5)
+# porter stemming over unicode61, which also folds case and strips diacritics
+FTS_TOKENIZE = "porter unicode61 remove_diacritics 2"
+# --- End Configuration ---
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_COLUMNS = ", ".join(FTS_COLUMNS)
+_OLD_VALUES = ", ".join(f"old.{c}" for c in FTS_COLUMNS)
+_NEW_VALUES = ", ".join(f"new.{c}" for c in FTS_COLUMNS)
+
+_TRIGGERS = {
+    "faculty_fts_ai": f"""
+    CREATE TRIGGER IF NOT EXISTS faculty_fts_ai AFTER INSERT ON faculty BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+    END
+    """,
+    "faculty_fts_ad": f"""
+    CREATE TRIGGER IF NOT EXISTS faculty_fts_ad AFTER DELETE ON faculty BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+    END
+    """,
+    "faculty_fts_au": f"""
+    CREATE TRIGGER IF NOT EXISTS faculty_fts_au AFTER UPDATE OF {_COLUMNS} ON faculty BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_COLUMNS}) VALUES ('delete', old.id, {_OLD_VALUES});
+        INSERT INTO {FTS_TABLE}(rowid, {_COLUMNS}) VALUES (new.id, {_NEW_VALUES});
+    END
+    """,
+}
+
+def fts_table_exists(conn) -> bool:
+    row = conn.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+    ).first()
+    return row is not None
+
+def _fts_columns(conn):
+    return tuple(row[1] for row in conn.execute(text(f"PRAGMA table_info({FTS_TABLE})")))
+
+def create_fts_index(conn) -> bool:
+    """
+    Creates the FTS5 table mirroring the faculty FTS_COLUMNS (an
+    external-content index over the faculty table) plus the triggers that
+    keep it in sync, and backfills it from existing rows the first time.
+    An index built with a different column list is dropped and rebuilt.
+    Safe to call repeatedly. Returns False if this SQLite build lacks FTS5.
+    """
+
+    if conn.dialect.name != "sqlite":
+        return False
+
+    if fts_table_exists(conn) and _fts_columns(conn) != FTS_COLUMNS:
+        # created by an older version; the triggers name the old columns too
+        for trigger in _TRIGGERS:
+            conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+        conn.execute(text(f"DROP TABLE {FTS_TABLE}"))
+
+    created = not fts_table_exists(conn)
+    try:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+            f"{_COLUMNS}, content='faculty', content_rowid='id', tokenize='{FTS_TOKENIZE}')"
+        ))
+    except OperationalError:
+        # no such module: fts5 - searches fall back to substring matching
+        return False
+
+    for trigger in _TRIGGERS.values():
+        conn.execute(text(trigger))
+    if created:
+        conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+@contextmanager
+def deferred_fts_index(conn):
+    """
+    For a bulk load into the faculty table: drops the sync triggers, so rows
+    are not indexed one by one, and rebuilds the index in one pass on exit.
+    Runs in the caller's transaction, so a rollback restores the triggers.
+    Does nothing when there is no FTS index.
+    """
+
+    if not fts_table_exists(conn):
+        yield
+        return
+    for trigger in _TRIGGERS:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {trigger}"))
+    yield
+    for trigger in _TRIGGERS.values():
+        conn.execute(text(trigger))
+    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+
+def build_match_query(q: str, column: str = None, operator: str = "and"):
+    """
+    Turns free text into an FTS5 MATCH expression: every word must match
+    (any word with operator "or") and the last word is treated as a prefix,
+    so partially typed queries still hit. A `column` with an entry in
+    FTS_COLUMN_GROUPS searches every index column of its group.
+    Returns None when `q` contains no searchable words.
+    """
+
+    tokens = _TOKEN_RE.findall(q)
+    if not tokens:
+        return None
+
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    expression = (" OR " if operator == "or" else " ").join(terms)
+    if not column:
+        return expression
+    columns = FTS_COLUMN_GROUPS.get(column, (column,))
+    return f"{{{' '.join(columns)}}} : ({expression})"
+
+def search_faculty(db, q: str, column: str = None, limit: int = None, operator: str = "and", after: dict = None,
+                   department: str = None):
+    """
+    Full-text search over faculty, optionally restricted to one column (plus
+    the columns grouped with it, see FTS_COLUMN_GROUPS) and to faculty
+    listed in one `department`.
+    Returns (id, name, score) rows, where score is the negated bm25 rank,
+    ordered by descending score then id and starting after the `after`
+    {"score", "id"} key if given. Returns None when the FTS index is
+    unavailable or `q` has no searchable words (callers fall back to
+    substring matching).
+    """
+
+    match = build_match_query(q, column, operator)
+    if match is None or not fts_table_exists(db):
+        return None
+
+    sql = (
+        f"SELECT id, name, score FROM ("
+        f"SELECT faculty.id AS id, faculty.name AS name, -bm25({FTS_TABLE}, {', '.join(map(str, FTS_WEIGHTS))}) AS score FROM {FTS_TABLE} "
+        f"JOIN faculty ON faculty.id = {FTS_TABLE}.rowid "
+        f"WHERE {FTS_TABLE} MATCH :match"
+    )
+    params = {"match": match}
+    if department is not None:
+        # through the (code, faculty_id) index rather than a scan of the comma separated column
+        sql += " AND faculty.id IN (SELECT faculty_id FROM faculty_departments WHERE code = :department)"
+        params["department"] = department.upper()
+    sql += ")"
+    if after is not None:
+        sql += " WHERE score < :after_score OR (score = :after_score AND id > :after_id)"
+        params.update(after_score=after["score"], after_id=after["id"])
+    sql += " ORDER BY score DESC, id"
+    if limit is not None:
+        sql += " LIMIT :limit"
+        params["limit"] = limit
+    return db.execute(text(sql), params).all()
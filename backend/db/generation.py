@@ -0,0 +1,19 @@
+import threading
+
+# Data generation counter. Anything that changes what the read endpoints
+# would return (ingestion, sync, search index swaps) bumps it, and derived
+# caches key their entries on the current value.
+
+_generation = 0
+_lock = threading.Lock()
+
+def current_generation() -> int:
+    return _generation
+
+def bump_generation() -> int:
+    """Marks all data derived from the faculty table as stale. Returns the new generation."""
+
+    global _generation
+    with _lock:
+        _generation += 1
+        return _generation
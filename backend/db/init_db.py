@@ -1,10 +1,52 @@
+from sqlalchemy import inspect, text
 from backend.db.database import engine
 from backend.db.models import Base
+from backend.db.fts import create_fts_index
+from backend.db.departments import backfill_faculty_departments
+
+# --- Configuration ---
+# indexes earlier versions created that no query uses; they only slow writes
+OBSOLETE_INDEXES = ("ix_faculty_department", "ix_faculty_webpage_keywords")
+# --- End Configuration ---
+
+def upgrade_schema(bind=engine):
+    """
+    Create missing tables, then add any model columns and indexes that an
+    existing database file predates (SQLite has no migrations here).
+    Before a unique index is added, duplicate rows are dropped (keeping the
+    oldest) so databases filled before the constraint existed still upgrade.
+    Indexes the model no longer declares (OBSOLETE_INDEXES) are dropped.
+    The FTS5 search index is created and backfilled if it is missing, as are
+    the faculty_departments rows behind the department filters.
+    """
+    Base.metadata.create_all(bind=bind)
+    inspector = inspect(bind)
+
+    with bind.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            existing = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name not in existing:
+                    column_type = column.type.compile(dialect=bind.dialect)
+                    conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"))
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.unique and index.name not in existing_indexes:
+                    columns = ", ".join(c.name for c in index.columns)
+                    conn.execute(text(
+                        f"DELETE FROM {table.name} WHERE rowid NOT IN "
+                        f"(SELECT MIN(rowid) FROM {table.name} GROUP BY {columns})"
+                    ))
+                index.create(bind=conn, checkfirst=True)
+        for name in OBSOLETE_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        create_fts_index(conn)
+        backfill_faculty_departments(conn)
 
 def create_database():
     """Create SQLite database file and all tables (if not present)."""
-    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine)
     print(f"Initialized database at: {engine.url}")
 
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    create_database()
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index, Table, event
 from sqlalchemy.orm import declarative_base
 from datetime import datetime
+from backend.db.fts import create_fts_index
 
 Base = declarative_base()
 
@@ -8,7 +9,53 @@ class Faculty(Base):
     __tablename__ = "faculty"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String, nullable=False)
+    name = Column(String, nullable=False, unique=True, index=True)   # identity key for ingestion upserts
     webpage_url = Column(String)
     research_interests = Column(String)
+    profile_url = Column(String, index=True)
+    content_hash = Column(String)   # sha256 of the last scraped profile page
+    department = Column(String)   # comma separated department codes, e.g. "ECE,BME"; filtered via faculty_departments
+    webpage_keywords = Column(String)   # keywords extracted from the personal webpage; searched via FTS5
     created_at = Column(DateTime, default=datetime.now())
+
+class Tag(Base):
+    """A research-topic tag with its precomputed facet count (see backend.topics)."""
+
+    __tablename__ = "tags"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, nullable=False, unique=True, index=True)   # normalized, e.g. "machine learning"
+    source = Column(String)                 # vocabulary | ngram
+    faculty_count = Column(Integer, nullable=False, default=0)
+
+# faculty <-> tag association; (tag_id, faculty_id) serves tag lookups in id order
+faculty_tags = Table(
+    "faculty_tags",
+    Base.metadata,
+    Column("faculty_id", Integer, ForeignKey("faculty.id", ondelete="CASCADE"), primary_key=True),
+    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_faculty_tags_tag_faculty", "tag_id", "faculty_id"),
+)
+
+# faculty <-> department code, one row per listing; (code, faculty_id) serves department filters in id order
+faculty_departments = Table(
+    "faculty_departments",
+    Base.metadata,
+    Column("faculty_id", Integer, ForeignKey("faculty.id", ondelete="CASCADE"), primary_key=True),
+    Column("code", String, primary_key=True),
+    Index("ix_faculty_departments_code_faculty", "code", "faculty_id"),
+)
+
+class AppMetadata(Base):
+    """Small key/value store for bookkeeping such as the hash of the last ingested seed file."""
+
+    __tablename__ = "app_metadata"
+
+    key = Column(String, primary_key=True)
+    value = Column(String)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+# full-text index over name / research_interests, created alongside the table
+@event.listens_for(Faculty.__table__, "after_create")
+def _create_faculty_fts(target, connection, **kw):
+    create_fts_index(connection)
@@ -0,0 +1,134 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+# --- Configuration ---
+BASE_DIR = os.path.dirname(__file__)
+CACHE_PATH = os.path.join(BASE_DIR, "http_cache.sqlite3")
+CACHE_MAX_BYTES = 50 * 1024 * 1024    # total size of cached bodies before LRU eviction
+CACHE_TTL = 7 * 24 * 60 * 60          # seconds before an entry is dropped instead of revalidated
+# --- End Configuration ---
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body: bytes
+    parsed: Any
+    stored_at: float
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache keyed by URL.
+    Stores the validators (ETag / Last-Modified), the raw body and the parsed
+    result of each page so a 304 Not Modified can skip both download and parse.
+    Entries older than `ttl` are discarded, and the least recently used entries
+    are evicted once the cached bodies exceed `max_bytes`.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self.path = str(path)
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body BLOB NOT NULL,
+                parsed TEXT,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url) -> Optional[CacheEntry]:
+        """Returns the stored entry for `url`, or None if missing or expired."""
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body, parsed, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            if time.time() - row[4] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+                return None
+        etag, last_modified, body, parsed, stored_at = row
+        return CacheEntry(url, etag, last_modified, body, json.loads(parsed) if parsed else None, stored_at)
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> dict:
+        """Builds If-None-Match / If-Modified-Since request headers from a cached entry."""
+
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def record_hit(self, url):
+        """Marks a revalidated (304) entry as fresh and recently used."""
+
+        now = time.time()
+        with self._lock:
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+
+    def put(self, url, etag, last_modified, body: bytes, parsed):
+        """Stores a freshly downloaded page and its parsed result, then enforces the size cap."""
+
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, json.dumps(parsed), len(body), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at ASC").fetchall()
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            total -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,182 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from datetime import datetime
+
+# --- Configuration ---
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+LOG_MAX_BYTES = 5 * 1024 * 1024     # rotate the log file once it grows past this size
+LOG_BACKUP_COUNT = 3                # rotated files kept as <log>.1 ... <log>.N
+LOG_QUEUE_SIZE = 100_000            # records buffered before callers block
+LOG_BATCH_SIZE = 1000               # records written per flush
+# --- End Configuration ---
+
+LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+_WRITE, _TRUNCATE, _FLUSH, _STOP = range(4)
+
+class BufferedLogSink:
+    """
+    Non-blocking JSON-lines log writer.
+    Callers only enqueue records; a background thread drains the queue in
+    batches, keeps one open handle per log file, writes each batch with a
+    single flush and rotates files that grow past `max_bytes`.
+    """
+
+    def __init__(self, max_bytes=LOG_MAX_BYTES, backup_count=LOG_BACKUP_COUNT,
+                 queue_size=LOG_QUEUE_SIZE, batch_size=LOG_BATCH_SIZE):
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._files = {}
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="log-sink", daemon=True)
+                self._thread.start()
+
+    def write(self, path, record: dict):
+        """Queues one record for `path`."""
+
+        self._ensure_started()
+        self._queue.put((_WRITE, str(path), record))
+
+    def truncate(self, path):
+        """Queues a truncation of `path`; records queued afterwards start a fresh file."""
+
+        self._ensure_started()
+        self._queue.put((_TRUNCATE, str(path), None))
+
+    def flush(self, timeout=None) -> bool:
+        """Blocks until every record queued so far is on disk. Returns False on timeout."""
+
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        done = threading.Event()
+        self._queue.put((_FLUSH, None, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5):
+        """Flushes outstanding records and stops the writer thread."""
+
+        if self._thread is None or not self._thread.is_alive():
+            return
+        self._queue.put((_STOP, None, None))
+        self._thread.join(timeout)
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = self._process(batch)
+            if stop:
+                return
+
+    def _process(self, batch) -> bool:
+        pending = {}
+        stop = False
+
+        for kind, path, payload in batch:
+            if kind == _WRITE:
+                pending.setdefault(path, []).append(json.dumps(payload, ensure_ascii=False) + "\n")
+            elif kind == _TRUNCATE:
+                self._write_pending(pending)
+                try:
+                    self._open(path, "w")
+                except OSError:
+                    self._files.pop(path, None)
+            elif kind == _FLUSH:
+                self._write_pending(pending)
+                payload.set()
+            elif kind == _STOP:
+                stop = True
+
+        self._write_pending(pending)
+        if stop:
+            for f in self._files.values():
+                f.close()
+            self._files.clear()
+        return stop
+
+    def _open(self, path, mode="a"):
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        f = self._files[path] = open(path, mode, encoding="utf-8")
+        return f
+
+    def _write_pending(self, pending):
+        for path, lines in pending.items():
+            try:
+                f = self._files.get(path) or self._open(path)
+                f.write("".join(lines))
+                f.flush()
+                if f.tell() >= self.max_bytes:
+                    self._rotate(path)
+            except OSError:
+                # Logging must never take the scraper down
+                self._files.pop(path, None)
+        pending.clear()
+
+    def _rotate(self, path):
+        self._files.pop(path).close()
+        for i in range(self.backup_count - 1, 0, -1):
+            src = f"{path}.{i}"
+            if os.path.exists(src):
+                os.replace(src, f"{path}.{i + 1}")
+        if self.backup_count > 0:
+            os.replace(path, f"{path}.1")
+        self._open(path, "w")
+
+_sink = BufferedLogSink()
+atexit.register(_sink.close)
+
+def get_sink() -> BufferedLogSink:
+    return _sink
+
+def infer_level(message: str) -> str:
+    """Maps the scraper's "ERROR: ..." / "WARNING: ..." message prefixes to a level."""
+
+    text = message.lstrip()
+    if text.startswith("ERROR"):
+        return "ERROR"
+    if text.startswith("WARNING"):
+        return "WARNING"
+    return "INFO"
+
+def log_record(path, message, level=None, truncate=False, **fields):
+    """Queues a structured record {ts, level, msg, ...} for `path` if it passes LOG_LEVEL."""
+
+    if truncate:
+        _sink.truncate(path)
+
+    level = level or infer_level(message)
+    if LEVELS.get(level, 20) < LEVELS.get(LOG_LEVEL, 20):
+        return
+
+    record = {
+        "ts": datetime.now().isoformat(timespec="milliseconds"),
+        "level": level,
+        "msg": message.strip(),
+        **fields
+    }
+    _sink.write(path, record)
+
+def flush_logs(timeout=None) -> bool:
+    return _sink.flush(timeout)
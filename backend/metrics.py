@@ -0,0 +1,230 @@
+import math
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# --- Configuration ---
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"   # Prometheus text exposition format
+# --- End Configuration ---
+
+# A small in-process metrics registry rendered in the Prometheus text format.
+# Metrics are module-level objects updated from the API, the scraper and
+# ingestion; every update takes the metric's lock, so threads can share them.
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in (*zip(names, values), *extra)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def get(self, **labels):
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self):
+        """(suffix, label values, extra label pairs, value) tuples to render."""
+
+        with self._lock:
+            return [("", key, (), value) for key, value in sorted(self._values.items())]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self.samples():
+            lines.append(f"{self.name}{suffix}{_format_labels(self.labelnames, key, extra)} {_format_value(value)}")
+        return "\n".join(lines)
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+class Histogram(Metric):
+    """Cumulative histogram; each label set keeps per-bucket counts, a sum and a count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][bisect_left(self.buckets, value)] += 1
+            state[1] += value
+            state[2] += 1
+
+    def get(self, **labels):
+        """(count, sum) observed for the label set."""
+
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return (state[2], state[1]) if state else (0, 0.0)
+
+    def samples(self):
+        out = []
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip((*self.buckets, math.inf), counts):
+                    cumulative += bucket_count
+                    out.append(("_bucket", key, (("le", _format_value(bound)),), cumulative))
+                out.append(("_sum", key, (), total))
+                out.append(("_count", key, (), count))
+        return out
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Duplicate metric {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, help_text, labelnames=()):
+        return self.register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name, help_text, labelnames=()):
+        return self.register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+    def clear(self):
+        for metric in self._metrics.values():
+            metric.clear()
+
+_registry = Registry()
+
+def get_registry() -> Registry:
+    return _registry
+
+# --- API ---
+HTTP_REQUESTS = _registry.counter(
+    "faculty_http_requests_total", "HTTP requests by route template, method and status code.",
+    ("route", "method", "status"))
+HTTP_LATENCY = _registry.histogram(
+    "faculty_http_request_duration_seconds", "Time to serve a request, until the last body byte is sent.",
+    ("route", "method"))
+DB_QUERIES = _registry.histogram(
+    "faculty_db_queries_per_request", "SQL statements executed while serving a request.",
+    ("route",), buckets=QUERY_COUNT_BUCKETS)
+DB_QUERY_TIME = _registry.histogram(
+    "faculty_db_query_seconds_per_request", "Time spent executing SQL while serving a request.",
+    ("route",))
+
+# --- Scraping and ingestion ---
+SCRAPER_FETCH_TIME = _registry.histogram(
+    "faculty_scraper_fetch_duration_seconds", "Duration of each HTTP request made by the scraper.")
+SCRAPER_BYTES = _registry.counter(
+    "faculty_scraper_downloaded_bytes_total", "Response body bytes downloaded by the scraper.")
+SCRAPER_PARSE_TIME = _registry.histogram(
+    "faculty_scraper_parse_duration_seconds", "Time to parse a fetched page, by parser.", ("parser",))
+REFRESH_PHASE_TIME = _registry.gauge(
+    "faculty_refresh_phase_duration_seconds", "Duration of each phase of the most recent refresh.", ("phase",))
+REFRESH_BYTES = _registry.gauge(
+    "faculty_refresh_downloaded_bytes", "Bytes downloaded by the most recent refresh.")
+REFRESH_COMPLETED = _registry.gauge(
+    "faculty_refresh_last_completed_timestamp_seconds", "Unix time the most recent refresh finished.")
+INGEST_TIME = _registry.gauge(
+    "faculty_ingest_duration_seconds", "Duration of the most recent ingestion, by step.", ("step",))
+INGEST_ROWS = _registry.gauge(
+    "faculty_ingest_rows", "Records in the most recent ingestion, by outcome.", ("outcome",))
+SEARCH_INDEX_BUILD_TIME = _registry.gauge(
+    "faculty_search_index_build_seconds", "Duration of the most recent in-memory search index build.")
+
+# --- Per-request SQL accounting ---
+
+class QueryStats:
+    __slots__ = ("count", "seconds")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+# Set by the request metrics middleware for the duration of a request. The
+# worker threads that run sync endpoints inherit a copy of the context, which
+# still points at the same QueryStats object.
+_current_queries = ContextVar("current_queries", default=None)
+
+def track_queries():
+    """Starts counting SQL for the current context. Returns (stats, token for stop_tracking_queries)."""
+
+    stats = QueryStats()
+    return stats, _current_queries.set(stats)
+
+def stop_tracking_queries(token):
+    _current_queries.reset(token)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = conn.info["query_started"].pop()
+    stats = _current_queries.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += time.perf_counter() - started
+
+def _handle_error(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+
+def instrument_sqlalchemy():
+    """Times every statement on every Engine. Safe to call repeatedly."""
+
+    for name, listener in (("before_cursor_execute", _before_cursor_execute),
+                           ("after_cursor_execute", _after_cursor_execute),
+                           ("handle_error", _handle_error)):
+        if not event.contains(Engine, name, listener):
+            event.listen(Engine, name, listener)
@@ -1,159 +1,733 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, SoupStrainer
+import lxml.etree
+import lxml.html
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
+from urllib.parse import urlparse
+from urllib.robotparser import RobotFileParser
+from backend.http_cache import ResponseCache
+from backend.log_sink import log_record, flush_logs
+from backend.metrics import SCRAPER_FETCH_TIME, SCRAPER_BYTES, SCRAPER_PARSE_TIME
+import argparse
+import hashlib
 import json
+import multiprocessing
+import random
+import re
+import threading
 import time
-from datetime import datetime
 import os
 
 # --- Configuration ---
 BASE_DIR = os.path.dirname(__file__)
 BASE_URL = "https://engineering.purdue.edu"
-FACULTY_LIST_URL = "https://engineering.purdue.edu/ECE/People/Faculty"
+# faculty directory of every engineering department, keyed by the department code stored
+# on each record; all share the ECE directory's page layout
+DEPARTMENT_DIRECTORIES = {
+    code: f"{BASE_URL}/{code}/People/Faculty"
+    for code in ("AAE", "ABE", "BME", "ChE", "CE", "ECE", "EEE", "ENE", "IE", "ME", "MSE", "NE")
+}
 LOG_FILE = os.path.join(BASE_DIR, "faculty_scraper.log")
+COMPLETE_DATA_NAME = "faculty_data_complete.json"            # enriched records, the seed ingested at startup
+CHECKPOINT_NAME = "faculty_data_complete.checkpoint.jsonl"   # finished profiles, one JSON line each
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+MAX_WORKERS = 8                 # concurrent directory / profile fetches
+PARSE_WORKERS = os.cpu_count() or 1   # processes parsing HTML off the fetching threads
+RATE_LIMIT_PER_HOST = 4.0       # requests per second allowed against a single host
+RATE_LIMIT_BURST = 4            # token bucket capacity
+REQUEST_TIMEOUT = 10            # seconds, for a single HTTP request
+PROFILE_TIMEOUT = 30            # seconds, total budget for one profile including retries
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5              # seconds, doubled on every retry
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+# Personal webpage crawl (optional stage after the profiles)
+WEBPAGE_MAX_BYTES = 1024 * 1024     # body bytes read from one personal page; the rest is never downloaded
+WEBPAGE_TIMEOUT = 15                # seconds, total budget for one personal page
+STREAM_CHUNK_SIZE = 16 * 1024       # bytes read from the socket at a time
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")   # anything else (PDFs, images) is skipped unread
+ROBOTS_MAX_BYTES = 512 * 1024       # robots.txt size limit, as in RFC 9309
+WEBPAGE_KEYWORDS = 25               # keywords kept per personal page
+KEYWORD_MIN_COUNT = 2               # weighted occurrences a term needs to be kept
+# words too common on academic homepages to say anything about research
+KEYWORD_STOPWORDS = frozenset("""
+    about above after again against all also among and any are around back based been before being below
+    between both but can click contact copyright could course courses current did does doing down during each
+    edu email fall few for from further group had has have having her here him his home how into its
+    just lab last latest links more most must news not now office only other our out over own page pages
+    people phone please professor publications purdue read recent same see she should since some spring
+    student students such than that the their them then there these they this those through too under
+    university until very via was web website welcome were what when where which while who whom why will
+    with within would year you your
+""".split())
 # --- End Configuration ---
 
-def log_message(message, log_mode):
-    """Write a message to both console and log file"""
+def log_message(message, log_mode="a", level=None):
+    """
+    Queue a JSON-lines record for the log file. Writes are batched by a
+    background thread (see backend.log_sink); log_mode "w" starts a fresh file.
+    The level is taken from an "ERROR:" / "WARNING:" prefix unless given.
+    """
+
+    log_record(LOG_FILE, message, level=level, truncate=(log_mode == "w"))
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    log_entry = f"[{timestamp}] {message}"
-    with open(LOG_FILE, log_mode, encoding='utf-8') as f:
-        f.write(log_entry + "\n")
+def write_json_atomic(path, data):
+    """Writes `data` as indented JSON to a temp file and renames it over `path`."""
 
-def scrape_faculty_directory():
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def save_complete_data(faculty_list):
     """
-    Scrapes the Purdue ECE faculty directory to extract basic profile info.
-    Returns a list of dictionaries containing faculty name and profile URL.
+    Writes the enriched records to COMPLETE_DATA_NAME, the seed file the API
+    ingests at startup. Returns whether the file was written.
     """
 
-    log_message(f"--- Starting scrape of: {FACULTY_LIST_URL} ---", "w")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+    output_file = os.path.join(BASE_DIR, COMPLETE_DATA_NAME)
+    try:
+        write_json_atomic(output_file, faculty_list)
+    except Exception as e:
+        log_message(f"ERROR: Failed to save complete JSON file: {e}", "a")
+        return False
+    log_message(f"Complete data saved to {output_file}", "a")
+    return True
+
+class ProfileCheckpoint:
+    """
+    Append-only JSON-lines log of finished profiles, so an interrupted
+    enrichment can resume where it stopped. Each record goes out in a single
+    write followed by flush + fsync; on resume, a final line left incomplete
+    by a crash is cut off before appending.
+    """
+
+    def __init__(self, path, resume=False):
+        self.path = path
+        self.done = self._load() if resume else {}
+        self._file = open(path, 'a' if resume else 'w', encoding='utf-8')
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+
+        with open(self.path, 'rb+') as f:
+            data = f.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                # torn final record from a crash mid-write
+                f.truncate(end)
+
+        done = {}
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('profile_url'):
+                done[record['profile_url']] = record
+        return done
+
+    def append(self, record):
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def discard(self):
+        """Removes the checkpoint once its results are safely in the complete output file."""
+
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Allows `rate` acquisitions per second on average
+    with bursts of up to `capacity`; acquire() blocks until a token is free.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+class HostRateLimiter:
+    """Keeps one TokenBucket per host so every host gets its own politeness budget."""
+
+    def __init__(self, rate=RATE_LIMIT_PER_HOST, capacity=RATE_LIMIT_BURST):
+        self.rate = rate
+        self.capacity = capacity
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(self.rate, self.capacity)
+        bucket.acquire()
+
+def create_session(pool_size=MAX_WORKERS):
+    """Returns a requests.Session with a keep-alive connection pool sized for `pool_size` workers."""
+
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def create_parse_pool(workers=PARSE_WORKERS):
+    """
+    Returns a process pool for parsing fetched pages, so parsing a large
+    crawl is not serialized behind the GIL; None (parse inline) when
+    `workers` is 0. Workers are spawned rather than forked, since refreshes
+    run inside the API process alongside other threads.
+    """
+
+    if workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+def _retry_delay(response, attempt):
+    """Backoff for the given attempt, honouring a numeric Retry-After header when present."""
+
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        try:
+            return max(0.0, float(retry_after))
+        except (TypeError, ValueError):
+            pass
+    return BACKOFF_BASE * (2 ** attempt) + random.uniform(0, BACKOFF_BASE)
+
+def fetch_url(url, session=None, limiter=None, timeout=PROFILE_TIMEOUT, headers=None):
+    """
+    GET a URL with rate limiting and retries. `headers` are sent on top of HEADERS.
+    Retries with exponential backoff on connection errors, timeouts and
+    429/5xx responses until MAX_RETRIES or the `timeout` budget is exhausted.
+    Raises requests.exceptions.RequestException on failure.
+    """
+
+    http = session or requests
+    request_headers = {**HEADERS, **(headers or {})}
+    deadline = time.monotonic() + timeout
+
+    for attempt in range(MAX_RETRIES + 1):
+        if limiter:
+            limiter.acquire(url)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise requests.exceptions.Timeout(f"Timed out after {timeout}s fetching {url}")
+
+        response = None
+        started = time.perf_counter()
+        try:
+            response = http.get(url, headers=request_headers, timeout=min(REQUEST_TIMEOUT, remaining))
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            SCRAPER_FETCH_TIME.observe(time.perf_counter() - started)
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            SCRAPER_FETCH_TIME.observe(time.perf_counter() - started)
+            SCRAPER_BYTES.inc(len(response.content or b""))
+            if response.status_code not in RETRY_STATUS_CODES or attempt == MAX_RETRIES:
+                response.raise_for_status()
+                return response
+
+        delay = _retry_delay(response, attempt)
+        if time.monotonic() + delay >= deadline:
+            if response is not None:
+                response.raise_for_status()
+            raise requests.exceptions.Timeout(f"Timed out after {timeout}s fetching {url}")
+        time.sleep(delay)
+
+def fetch_capped(url, session=None, limiter=None, max_bytes=WEBPAGE_MAX_BYTES, timeout=WEBPAGE_TIMEOUT,
+                 content_types=HTML_CONTENT_TYPES):
+    """
+    Streams a GET of `url`, reading at most `max_bytes` of the (decoded)
+    body in chunks, so memory stays bounded whatever the server sends.
+    Gives up once `timeout` seconds have passed in total. When
+    `content_types` is given, a response of any other Content-Type is
+    closed before its body is read. Unlike fetch_url there are no retries.
+    Returns (body, truncated), or None for a skipped content type.
+    Raises requests.exceptions.RequestException on failure, HTTP errors included.
+    """
+
+    http = session or requests
+    if limiter:
+        limiter.acquire(url)
+
+    deadline = time.monotonic() + timeout
+    started = time.perf_counter()
+    received = 0
+    try:
+        response = http.get(url, headers=HEADERS, timeout=min(REQUEST_TIMEOUT, timeout), stream=True)
+    except requests.exceptions.RequestException:
+        SCRAPER_FETCH_TIME.observe(time.perf_counter() - started)
+        raise
+
     try:
-        response = requests.get(FACULTY_LIST_URL, headers=headers)
         response.raise_for_status()
-        log_message(f"Successfully fetched faculty list (Status: {response.status_code})", "a")
+        content_type = response.headers.get("Content-Type", "").split(";")[0].strip().lower()
+        if content_types and content_type not in content_types:
+            return None
+
+        body = bytearray()
+        truncated = False
+        for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            received += len(chunk)
+            body += chunk[:max_bytes - len(body)]
+            if len(body) >= max_bytes:
+                truncated = True
+                break
+            if time.monotonic() > deadline:
+                raise requests.exceptions.Timeout(f"Timed out after {timeout}s reading {url}")
+        return bytes(body), truncated
+    finally:
+        # closing mid-body drops the connection instead of draining the rest
+        response.close()
+        SCRAPER_FETCH_TIME.observe(time.perf_counter() - started)
+        SCRAPER_BYTES.inc(received)
+
+class RobotsCache:
+    """
+    robots.txt rules per origin, fetched once (byte-capped like page bodies)
+    and shared by the crawling threads. A missing robots.txt (4xx) allows
+    everything; one that cannot be fetched (5xx, 429, network errors)
+    disallows the whole host, as RFC 9309 asks.
+    """
+
+    def __init__(self, session=None, limiter=None, user_agent=HEADERS['User-Agent']):
+        self.session = session
+        self.limiter = limiter
+        self.user_agent = user_agent
+        self._rules = {}
+        self._locks = {}
+        self._lock = threading.Lock()
+
+    def allowed(self, url):
+        parts = urlparse(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        with self._lock:
+            origin_lock = self._locks.setdefault(origin, threading.Lock())
+        # one fetch per origin, even when several threads ask at once
+        with origin_lock:
+            rules = self._rules.get(origin)
+            if rules is None:
+                rules = self._rules[origin] = self._fetch(origin)
+        return rules.can_fetch(self.user_agent, url)
+
+    def _fetch(self, origin):
+        rules = RobotFileParser()
+        try:
+            body, _ = fetch_capped(
+                f"{origin}/robots.txt", self.session, self.limiter,
+                max_bytes=ROBOTS_MAX_BYTES, timeout=REQUEST_TIMEOUT, content_types=None
+            )
+        except requests.exceptions.HTTPError as e:
+            status = e.response.status_code if e.response is not None else 500
+            if 400 <= status < 500 and status != 429:
+                rules.allow_all = True
+            else:
+                rules.disallow_all = True
+            return rules
+        except requests.exceptions.RequestException:
+            rules.disallow_all = True
+            return rules
+
+        rules.parse(body.decode("utf-8", errors="replace").splitlines())
+        rules.modified()
+        return rules
+
+def content_hash(content):
+    """Returns the sha256 hex digest of a page body."""
+
+    return hashlib.sha256(content).hexdigest()
+
+def run_parse(parse, content, parse_pool=None):
+    """Returns `parse(content)`, run in `parse_pool` if given, and records the parse time."""
+
+    started = time.perf_counter()
+    if parse_pool is not None:
+        parsed = parse_pool.submit(parse, content).result()
+    else:
+        parsed = parse(content)
+    SCRAPER_PARSE_TIME.observe(time.perf_counter() - started, parser=parse.__name__)
+    return parsed
+
+def fetch_and_parse(url, parse, cache=None, session=None, limiter=None, known_hash=None, parse_pool=None,
+                    known_parsed=None):
+    """
+    Fetches `url` and returns `parse(response.content)`.
+    With a ResponseCache, the request is made conditional on the stored
+    ETag / Last-Modified and a 304 reuses the previously parsed result.
+    When the body hashes to `known_hash` the page is not parsed at all; it
+    is still cached, with `known_parsed` (the stored result for that hash)
+    as its parsed value, so the next fetch can be conditional.
+    With a `parse_pool` (see create_parse_pool), `parse` runs in a worker
+    process and must be a module-level function.
+    Returns a tuple: (parsed_result, content_hash, changed)
+    where parsed_result is None if the page is unchanged.
+    """
+
+    entry = cache.get(url) if cache else None
+    response = fetch_url(
+        url, session=session, limiter=limiter,
+        headers=ResponseCache.conditional_headers(entry)
+    )
+
+    if entry is not None and response.status_code == 304:
+        cache.record_hit(url)
+        body_hash = content_hash(entry.body)
+        if body_hash == known_hash:
+            return None, body_hash, False
+        if entry.parsed is None:
+            # cached while unchanged, without a stored result to go with it
+            return run_parse(parse, entry.body, parse_pool), body_hash, True
+        return entry.parsed, body_hash, True
+
+    body_hash = content_hash(response.content)
+    if body_hash == known_hash:
+        if cache:
+            cache.put(
+                url,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+                response.content,
+                known_parsed
+            )
+        return None, body_hash, False
+
+    parsed = run_parse(parse, response.content, parse_pool)
+    if cache:
+        cache.put(
+            url,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+            response.content,
+            parsed
+        )
+    return parsed, body_hash, True
+
+def parse_faculty_directory(content):
+    """
+    Parses a faculty directory page.
+    Returns a list of dictionaries containing faculty name and profile URL.
+    Containers without a link or a name are skipped. Nothing is logged here,
+    since this may run in a parse worker process.
+    """
+
+    # Only build the faculty entries - they're in divs with class 'list-name'.
+    # The strainer sees the raw class string ("col-12 list-name"), so split it here.
+    list_name = SoupStrainer('div', class_=lambda c: c is not None and 'list-name' in c.split())
+    soup = BeautifulSoup(content, 'lxml', parse_only=list_name)
+    faculty_data = []
+
+    for name_div in soup.find_all('div', class_='list-name'):
+        # Find the anchor tag with the profile link
+        link_tag = name_div.find('a', href=True)
+        if not link_tag:
+            continue
+
+        # Extract the profile URL
+        profile_url = f"{BASE_URL}{link_tag['href']}" if link_tag['href'].startswith('/') else link_tag['href']
+
+        # Extract the name - it's inside the anchor tag
+        # HTML structure: "Name" then <strong>LastName</strong>
+        name_parts = []
+        for content in link_tag.contents:
+            if isinstance(content, str):
+                name_parts.append(content.strip())
+            elif content.name == 'strong':
+                name_parts.append(content.text.strip())
+
+        full_name = ' '.join(name_parts).strip()
+        if not full_name:
+            continue
+
+        faculty_data.append({
+            "name": full_name,
+            "profile_url": profile_url,
+            "personal_webpage": None,  # To be filled in next step
+            "research_interests": None  # To be filled in next step
+        })
+
+    return faculty_data
+
+def scrape_department_directory(department, session=None, limiter=None, cache=None, parse_pool=None):
+    """
+    Fetches and parses one department's faculty directory.
+    Returns its entries, each tagged with `department`, or [] on failure.
+    """
+
+    url = DEPARTMENT_DIRECTORIES[department]
+    try:
+        entries, _, _ = fetch_and_parse(
+            url, parse_faculty_directory, cache=cache, session=session, limiter=limiter, parse_pool=parse_pool
+        )
     except requests.exceptions.RequestException as e:
-        log_message(f"ERROR: Failed to fetch the faculty list page: {e}", "a")
+        log_message(f"ERROR: Failed to fetch the {department} faculty list page: {e}", "a")
         return []
 
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Find all faculty entries - they're in divs with class 'list-name'
-    faculty_name_divs = soup.find_all('div', class_='list-name')
-    
-    if not faculty_name_divs:
-        log_message("ERROR: Could not find faculty name containers. Check the HTML structure.", "a")
+    if not entries:
+        log_message(f"ERROR: No faculty found in the {department} directory. Check the HTML structure.", "a")
         return []
 
-    log_message(f"Found {len(faculty_name_divs)} faculty name containers", "a")
-    faculty_data = []
+    log_message(f"{department}: found {len(entries)} faculty", "a")
+    for idx, entry in enumerate(entries, 1):
+        log_message(f"[{department} {idx}/{len(entries)}] {entry['name']}", "a")
+        log_message(f"    Profile URL: {entry['profile_url']}", "a")
+    # copies, so entries held by the response cache are left untouched
+    return [{**entry, "department": department} for entry in entries]
 
-    for idx, name_div in enumerate(faculty_name_divs, 1):
-        try:
-            # Find the anchor tag with the profile link
-            link_tag = name_div.find('a', href=True)
-            
-            if not link_tag:
-                log_message(f"WARNING: No link found in container {idx}, skipping", "a")
-                continue
-            
-            # Extract the profile URL
-            profile_url = f"{BASE_URL}{link_tag['href']}" if link_tag['href'].startswith('/') else link_tag['href']
-            
-            # Extract the name - it's inside the anchor tag
-            # HTML structure: "Name" then <strong>LastName</strong>
-            name_parts = []
-            for content in link_tag.contents:
-                if isinstance(content, str):
-                    name_parts.append(content.strip())
-                elif content.name == 'strong':
-                    name_parts.append(content.text.strip())
-            
-            full_name = ' '.join(name_parts).strip()
-            
-            if not full_name:
-                log_message(f"WARNING: Empty name found in container {idx}, skipping", "a")
-                continue
-            
-            data = {
-                "name": full_name,
-                "profile_url": profile_url,
-                "personal_webpage": None,  # To be filled in next step
-                "research_interests": None  # To be filled in next step
-            }
-            
-            faculty_data.append(data)
-            log_message(f"[{idx}/{len(faculty_name_divs)}] {full_name}", "a")
-            log_message(f"    Profile URL: {profile_url}", "a")
-            
-        except Exception as e:
-            log_message(f"ERROR: Failed to parse container {idx}: {e}", "a")
-            continue
+def merge_department_listings(listings):
+    """
+    Merges per-department directory entries into one record per person,
+    matched on name (the database identity key). The first listing's
+    profile URL is kept and `department` becomes a comma separated list of
+    codes in listing order, e.g. "ECE,BME".
+    """
 
-    log_message(f"--- Scrape complete. Successfully extracted {len(faculty_data)} faculty entries ---", "a")
+    merged = {}
+    for entries in listings:
+        for entry in entries:
+            key = ' '.join(entry['name'].split()).casefold()
+            record = merged.get(key)
+            if record is None:
+                merged[key] = dict(entry)
+            elif entry['department'] not in record['department'].split(','):
+                record['department'] += f",{entry['department']}"
+    return list(merged.values())
+
+def failed_departments(faculty_list, departments=None):
+    """
+    Codes of the requested `departments` (all by default) with no faculty in
+    `faculty_list`: directories that could not be fetched or parsed empty,
+    both of which scrape_department_directory logs as errors.
+    """
+
+    listed = {code for entry in faculty_list for code in (entry.get('department') or '').split(',')}
+    return [code for code in (departments or DEPARTMENT_DIRECTORIES) if code not in listed]
+
+def scrape_faculty_directory(cache=None, departments=None, session=None, limiter=None, parse_pool=None,
+                             max_workers=MAX_WORKERS):
+    """
+    Scrapes the faculty directories of `departments` (codes from
+    DEPARTMENT_DIRECTORIES, all of them by default) to extract basic profile info.
+    Directories are fetched concurrently; pass the `limiter` used for the
+    profile pages so both phases share one politeness budget per host.
+    Faculty listed by several departments are merged into one record.
+    With a ResponseCache, an unchanged directory page is not re-downloaded or re-parsed.
+    Returns a list of dictionaries containing faculty name, profile URL and department.
+    """
+
+    departments = list(departments or DEPARTMENT_DIRECTORIES)
+    unknown = [code for code in departments if code not in DEPARTMENT_DIRECTORIES]
+    if unknown:
+        raise ValueError(f"Unknown department(s): {', '.join(unknown)}")
+
+    log_message(f"--- Starting scrape of {len(departments)} department directories: {', '.join(departments)} ---", "w")
+
+    own_session = session is None
+    session = session or create_session(max_workers)
+    limiter = limiter or HostRateLimiter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(departments)))) as executor:
+            listings = list(executor.map(
+                lambda code: scrape_department_directory(code, session, limiter, cache, parse_pool), departments
+            ))
+    finally:
+        if own_session:
+            session.close()
+
+    faculty_data = merge_department_listings(listings)
+    if not faculty_data:
+        return []
+
+    listed = sum(len(entries) for entries in listings)
+    log_message(f"--- Scrape complete. Extracted {len(faculty_data)} faculty "
+                f"({listed - len(faculty_data)} cross-listed entries merged) ---", "a")
     
     # Save to JSON file as well
     output_file = os.path.join(BASE_DIR, "faculty_data.json")
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(faculty_data, f, indent=2, ensure_ascii=False)
+        write_json_atomic(output_file, faculty_data)
         log_message(f"Data saved to {output_file}", "a")
     except Exception as e:
         log_message(f"ERROR: Failed to save JSON file: {e}", "a")
     
     return faculty_data
 
-def scrape_faculty_profile(profile_url, name):
+def parse_faculty_profile(content):
+    """
+    Parses a faculty profile page in a single pass over its <strong> and <p>
+    elements, using lxml instead of a full BeautifulSoup tree.
+    Returns a tuple: (personal_webpage, research_interests)
+    """
+
+    try:
+        tree = lxml.html.document_fromstring(content)
+    except (lxml.etree.ParserError, ValueError):
+        return None, None
+
+    personal_webpage = None
+    research_interests = None
+
+    for element in tree.iter('strong', 'p'):
+        if element.tag == 'strong':
+            # "Webpage:" label - the link lives in the enclosing div
+            if personal_webpage is None and 'Webpage:' in element.text_content():
+                div = next(element.iterancestors('div'), None)
+                link_tag = div.find('.//a[@href]') if div is not None else None
+                if link_tag is not None:
+                    personal_webpage = link_tag.get('href')
+        elif research_interests is None and 'profile-research' in (element.get('class') or '').split():
+            research_interests = element.text_content().strip()
+
+        if personal_webpage is not None and research_interests is not None:
+            break
+    
+    return personal_webpage, research_interests
+
+_KEYWORD_RE = re.compile(r"[a-z][a-z0-9-]*[a-z0-9]")
+
+def extract_page_keywords(content, limit=WEBPAGE_KEYWORDS):
+    """
+    Pulls research keywords out of a personal webpage: words and two-word
+    phrases from the visible text, with the title, headings and meta
+    keywords / description counting three times. Scripts, navigation and
+    forms are dropped, as are stopwords and terms seen fewer than
+    KEYWORD_MIN_COUNT times.
+    Returns up to `limit` terms, most frequent first, as a comma separated
+    string, or None. Module-level so it can run in a parse worker process.
+    """
+
+    try:
+        tree = lxml.html.document_fromstring(content)
+    except (lxml.etree.ParserError, ValueError):
+        return None
+
+    for element in tree.xpath('//script|//style|//noscript|//nav|//form|//svg'):
+        element.drop_tree()
+
+    counts = Counter()
+
+    def add(text, weight):
+        words = [w if len(w) > 2 and w not in KEYWORD_STOPWORDS else None for w in _KEYWORD_RE.findall(text.lower())]
+        for word, following in zip(words, words[1:] + [None]):
+            if word is None:
+                continue
+            counts[word] += weight
+            if following is not None and following != word:
+                counts[f"{word} {following}"] += weight
+
+    for element in tree.iter('title', 'h1', 'h2', 'h3'):
+        add(element.text_content(), 3)
+    for meta in tree.xpath('//meta[@name="keywords" or @name="description"][@content]'):
+        add(meta.get('content'), 3)
+    for body in tree.iter('body'):
+        add(body.text_content(), 1)
+
+    kept = sorted((term for term, count in counts.items() if count >= KEYWORD_MIN_COUNT),
+                  key=lambda term: (-counts[term], term))[:limit]
+    return ", ".join(kept) or None
+
+def scrape_faculty_profile(profile_url, name, session=None, limiter=None, cache=None):
     """
     Scrapes an individual faculty profile page to extract:
     - Personal webpage URL
     - Research interests
     
+    Pass a shared `session` and `limiter` to reuse pooled connections and
+    respect the per-host rate limit when called concurrently, and a `cache`
+    to skip pages that have not changed since the last run.
     Returns a tuple: (personal_webpage, research_interests)
     """
 
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-    }
-    
+    result = scrape_profile_if_changed(profile_url, name, session=session, limiter=limiter, cache=cache)
+    if result is None:
+        return None, None
+    personal_webpage, research_interests, _, _ = result
+    return personal_webpage, research_interests
+
+def scrape_profile_if_changed(profile_url, name, known_hash=None, session=None, limiter=None, cache=None,
+                              parse_pool=None, known_parsed=None):
+    """
+    Like scrape_faculty_profile, but skips parsing when the page body still
+    hashes to `known_hash`, whose (personal_webpage, research_interests)
+    are `known_parsed`.
+    Returns a tuple: (personal_webpage, research_interests, content_hash, changed),
+    or None if the page could not be fetched.
+    """
+
     try:
-        response = requests.get(profile_url, headers=headers)
-        response.raise_for_status()
+        parsed, body_hash, changed = fetch_and_parse(
+            profile_url, parse_faculty_profile,
+            cache=cache, session=session, limiter=limiter, known_hash=known_hash, parse_pool=parse_pool,
+            known_parsed=known_parsed
+        )
     except requests.exceptions.RequestException as e:
         log_message(f"    ERROR: Failed to fetch profile for {name}: {e}", "a")
-        return None, None
-    
-    soup = BeautifulSoup(response.content, 'html.parser')
-    
-    # Extract Personal Webpage
-    personal_webpage = None
-    # Look for the div containing "Webpage:" label
-    webpage_divs = soup.find_all('div')
-    for div in webpage_divs:
-        strong_tag = div.find('strong')
-        if strong_tag and 'Webpage:' in strong_tag.text:
-            # Find the anchor tag in the same div
-            link_tag = div.find('a', href=True)
-            if link_tag:
-                personal_webpage = link_tag['href']
-                break
-    
-    # Extract Research Interests
-    research_interests = None
-    research_p = soup.find('p', class_='profile-research')
-    if research_p:
-        research_interests = research_p.text.strip()
-    
-    return personal_webpage, research_interests
+        return None
+
+    if not changed:
+        return None, None, body_hash, False
+
+    personal_webpage, research_interests = parsed
+    return personal_webpage, research_interests, body_hash, True
 
-def enrich_faculty_data(faculty_list):
+def enrich_faculty_data(faculty_list, max_workers=MAX_WORKERS, rate_limit=RATE_LIMIT_PER_HOST, cache=None,
+                        known_profiles=None, on_profile=None, resume=False, checkpoint_path=None,
+                        limiter=None, parse_pool=None):
     """
     Takes the initial faculty list and enriches it by scraping each profile page
     for personal webpage and research interests.
+    Profiles are fetched concurrently over one pooled session, limited to
+    `rate_limit` requests per second per host (or by a shared `limiter`),
+    and parsed in `parse_pool` when one is given. The list is updated in
+    place and keeps its original order. Pass a ResponseCache as `cache` to
+    revalidate profiles instead of re-downloading them.
+
+    `known_profiles` maps profile URL to a previously stored record with
+    content_hash, personal_webpage and research_interests. Pages whose hash
+    is unchanged are not parsed and keep the stored values. Every entry gets
+    a `content_hash` and a `changed` flag.
+
+    `on_profile(done, total, error)` is called as each profile finishes, with
+    an error message (or None) for progress reporting.
+
+    Every successfully scraped profile is appended to a JSON-lines checkpoint
+    (`checkpoint_path`, by default next to the output file). With `resume`,
+    profiles already in the checkpoint are taken from it instead of being
+    fetched again. The checkpoint is removed once the complete output is written.
     """
     
     log_message("="*60, "a")
@@ -161,61 +735,235 @@ def enrich_faculty_data(faculty_list):
     log_message("="*60, "a")
     
     total = len(faculty_list)
-    
-    for idx, faculty in enumerate(faculty_list, 1):
-        name = faculty['name']
-        profile_url = faculty['profile_url']
-        
-        log_message(f"[{idx}/{total}] Scraping profile for: {name}", "a")
-        
-        # Scrape the individual profile page
-        webpage, interests = scrape_faculty_profile(profile_url, name)
-        
-        # Update the faculty data
-        faculty['personal_webpage'] = webpage
-        faculty['research_interests'] = interests
-        
-        if webpage:
-            log_message(f"    Webpage: {webpage}", "a")
-        else:
-            log_message(f"    Webpage: Not found", "a")
-            
-        if interests:
-            # Truncate for logging if too long
-            interests_preview = interests[:100] + "..." if len(interests) > 100 else interests
-            log_message(f"    Research: {interests_preview}", "a")
-        else:
-            log_message(f"    Research: Not found", "a")
-        
-        # Be polite to the server - add a small delay
-        time.sleep(0.5)
+    known_profiles = known_profiles or {}
+    checkpoint = ProfileCheckpoint(checkpoint_path or os.path.join(BASE_DIR, CHECKPOINT_NAME), resume=resume)
+    session = create_session(max_workers)
+    limiter = limiter or HostRateLimiter(rate_limit, RATE_LIMIT_BURST)
+    unchanged = 0
+    done = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for idx, faculty in enumerate(faculty_list, 1):
+                saved = checkpoint.done.get(faculty['profile_url'])
+                if saved is not None:
+                    # finished before the interruption - keep the checkpointed result
+                    for key in ('personal_webpage', 'research_interests', 'content_hash', 'changed'):
+                        faculty[key] = saved.get(key)
+                    done += 1
+                    continue
+
+                known = known_profiles.get(faculty['profile_url'], {})
+                future = executor.submit(
+                    scrape_profile_if_changed, faculty['profile_url'], faculty['name'],
+                    known.get('content_hash'), session, limiter, cache, parse_pool,
+                    (known.get('personal_webpage'), known.get('research_interests')) if known else None
+                )
+                futures[future] = idx
+
+            for future in as_completed(futures):
+                idx = futures[future]
+                faculty = faculty_list[idx - 1]
+                name = faculty['name']
+
+                log_message(f"[{idx}/{total}] Scraped profile for: {name}", "a")
+
+                error = None
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = f"Failed to parse profile for {name}: {e}"
+                    log_message(f"    ERROR: {error}", "a")
+                    result = None
+                else:
+                    if result is None:
+                        error = f"Failed to fetch profile for {name}"
+                done += 1
+                if on_profile:
+                    on_profile(done, total, error)
+
+                if result is None:
+                    # Fetch failed - keep whatever was stored rather than blanking it
+                    known = known_profiles.get(faculty['profile_url'])
+                    webpage, interests = None, None
+                    body_hash = known.get('content_hash') if known else None
+                    changed = known is None
+                else:
+                    webpage, interests, body_hash, changed = result
+
+                if not changed:
+                    # Same page as last time - keep the stored values
+                    known = known_profiles[faculty['profile_url']]
+                    webpage, interests = known.get('personal_webpage'), known.get('research_interests')
+                    unchanged += 1
+                    log_message(f"    Unchanged since last scrape", "a")
+
+                # Update the faculty data
+                faculty['personal_webpage'] = webpage
+                faculty['research_interests'] = interests
+                faculty['content_hash'] = body_hash
+                faculty['changed'] = changed
+                if error is None:
+                    checkpoint.append(faculty)
+
+                if not changed:
+                    continue
+
+                if webpage:
+                    log_message(f"    Webpage: {webpage}", "a")
+                else:
+                    log_message(f"    Webpage: Not found", "a")
+
+                if interests:
+                    # Truncate for logging if too long
+                    interests_preview = interests[:100] + "..." if len(interests) > 100 else interests
+                    log_message(f"    Research: {interests_preview}", "a")
+                else:
+                    log_message(f"    Research: Not found", "a")
+    finally:
+        session.close()
+        checkpoint.close()
+
+    if checkpoint.done:
+        log_message(f"Resumed {len(checkpoint.done)} profiles from {checkpoint.path}", "a")
+    if known_profiles:
+        log_message(f"{unchanged}/{total} profiles unchanged, {total - unchanged} re-parsed", "a")
     
     log_message(f"--- Profile enrichment complete ---", "a")
     
     # Save updated data to JSON
-    output_file = os.path.join(BASE_DIR, "faculty_data_complete.json")
-    try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(faculty_list, f, indent=2, ensure_ascii=False)
-        log_message(f"Complete data saved to {output_file}", "a")
-    except Exception as e:
-        log_message(f"ERROR: Failed to save complete JSON file: {e}", "a")
+    if save_complete_data(faculty_list):
+        checkpoint.discard()
     
     return faculty_list
 
+def scrape_personal_webpage(url, robots, session=None, limiter=None, parse_pool=None):
+    """
+    Fetches one personal webpage (if robots.txt allows it) and extracts its keywords.
+    Returns (keywords, skip_reason), where skip_reason is None for a fetched HTML page.
+    Raises requests.exceptions.RequestException on failure.
+    """
+
+    if not robots.allowed(url):
+        return None, "disallowed by robots.txt"
+    result = fetch_capped(url, session=session, limiter=limiter)
+    if result is None:
+        return None, "not an HTML page"
+
+    body, _ = result
+    started = time.perf_counter()
+    if parse_pool is not None:
+        keywords = parse_pool.submit(extract_page_keywords, body).result()
+    else:
+        keywords = extract_page_keywords(body)
+    SCRAPER_PARSE_TIME.observe(time.perf_counter() - started, parser="extract_page_keywords")
+    return keywords, None
+
+def enrich_personal_webpages(faculty_list, max_workers=MAX_WORKERS, only_missing=True, session=None,
+                             limiter=None, parse_pool=None):
+    """
+    Optional stage after enrich_faculty_data: fetches the personal webpages
+    found on the profiles concurrently and stores keywords extracted from
+    them as `webpage_keywords`. With `only_missing`, only faculty whose
+    profile has no research interests are visited. Profiles marked
+    `changed: False` are skipped, keeping their stored keywords.
+
+    Every page is streamed with a WEBPAGE_MAX_BYTES cap and a
+    WEBPAGE_TIMEOUT budget, and non-HTML responses are closed unread, so a
+    homepage pointing at a large PDF costs one response header. robots.txt
+    is fetched once per host. Pages that could not be fetched leave the
+    entry without `webpage_keywords`, so sync keeps the stored value.
+    The list is updated in place and returned; callers save it again with
+    save_complete_data, since enrich_faculty_data wrote it before this stage.
+    """
+
+    log_message("="*60, "a")
+    log_message("FACULTY SCRAPER - STEP 3: Keywords from Personal Webpages", "a")
+    log_message("="*60, "a")
+
+    pending = [
+        faculty for faculty in faculty_list
+        if (faculty.get('personal_webpage') or '').startswith(('http://', 'https://'))
+        and faculty.get('changed') is not False
+        and not (only_missing and faculty.get('research_interests'))
+    ]
+    own_session = session is None
+    session = session or create_session(max_workers)
+    limiter = limiter or HostRateLimiter()
+    robots = RobotsCache(session, limiter)
+    found = 0
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(scrape_personal_webpage, faculty['personal_webpage'], robots, session, limiter,
+                                parse_pool): faculty
+                for faculty in pending
+            }
+            for idx, future in enumerate(as_completed(futures), 1):
+                faculty = futures[future]
+                try:
+                    keywords, skipped = future.result()
+                except requests.exceptions.RequestException as e:
+                    log_message(f"[{idx}/{len(pending)}] ERROR: Failed to fetch webpage of {faculty['name']}: {e}", "a")
+                    continue
+
+                faculty['webpage_keywords'] = keywords
+                if skipped:
+                    log_message(f"[{idx}/{len(pending)}] {faculty['name']}: skipped, {skipped}", "a")
+                elif keywords:
+                    found += 1
+                    log_message(f"[{idx}/{len(pending)}] {faculty['name']}: {keywords[:100]}", "a")
+                else:
+                    log_message(f"[{idx}/{len(pending)}] {faculty['name']}: no keywords found", "a")
+    finally:
+        if own_session:
+            session.close()
+
+    log_message(f"--- Webpage enrichment complete: keywords for {found}/{len(pending)} pages ---", "a")
+    return faculty_list
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape the Purdue Engineering faculty directories and profiles.")
+    parser.add_argument("--resume", action="store_true",
+                        help=f"skip profiles already saved in {CHECKPOINT_NAME} by an interrupted run")
+    parser.add_argument("--departments", type=lambda value: [code.strip() for code in value.split(",") if code.strip()],
+                        help=f"comma separated department codes (default: all of {', '.join(DEPARTMENT_DIRECTORIES)})")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help="processes parsing HTML; 0 parses on the fetching threads")
+    parser.add_argument("--webpages", choices=("missing", "all"),
+                        help="also extract keywords from personal webpages: of faculty without research interests, or all")
+    args = parser.parse_args()
+    unknown = [code for code in args.departments or () if code not in DEPARTMENT_DIRECTORIES]
+    if unknown:
+        parser.error(f"unknown department(s): {', '.join(unknown)}")
+
     log_message("="*60, "w")
     log_message("FACULTY SCRAPER - STEP 1: Collecting Names and Profile URLs", "a")
     log_message("="*60, "a")
     
-    faculty_list = scrape_faculty_directory()
+    cache = ResponseCache()
+    # one politeness budget per host across the directory and profile phases
+    limiter = HostRateLimiter()
+    parse_pool = create_parse_pool(args.parse_workers)
+    faculty_list = scrape_faculty_directory(
+        cache=cache, departments=args.departments, limiter=limiter, parse_pool=parse_pool
+    )
     
     log_message("="*60, "a")
     log_message(f"SUMMARY: Collected {len(faculty_list)} faculty profiles", "a")
     log_message("="*60, "a")
     
     if faculty_list:
-        enriched_list = enrich_faculty_data(faculty_list)
+        enriched_list = enrich_faculty_data(
+            faculty_list, cache=cache, resume=args.resume, limiter=limiter, parse_pool=parse_pool
+        )
+        if args.webpages:
+            enrich_personal_webpages(
+                enriched_list, only_missing=args.webpages == "missing", limiter=limiter, parse_pool=parse_pool
+            )
+            save_complete_data(enriched_list)
         
         # Final summary
         log_message("="*60, "a")
@@ -228,6 +976,14 @@ if __name__ == "__main__":
         
         log_message(f"Faculty with personal webpage: {with_webpage}/{len(enriched_list)}", "a")
         log_message(f"Faculty with research interests: {with_research}/{len(enriched_list)}", "a")
-        log_message("="*60, "a")
     else:
-        log_message("No faculty data to enrich. Exiting.", "a")
\ No newline at end of file
+        log_message("No faculty data to enrich. Exiting.", "a")
+
+    cache_stats = cache.stats()
+    log_message(f"HTTP cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses "
+                f"({cache_stats['entries']} entries, {cache_stats['bytes']} bytes on disk)", "a")
+    log_message("="*60, "a")
+    if parse_pool is not None:
+        parse_pool.shutdown()
+    cache.close()
+    flush_logs()
\ No newline at end of file
@@ -0,0 +1,784 @@
+import heapq
+import html
+import math
+import re
+import threading
+import time
+import unicodedata
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import Counter
+import numpy as np
+from sqlalchemy.orm import Session
+from backend.db.models import Faculty
+from backend.db.departments import department_codes
+from backend.db.generation import bump_generation
+from backend.metrics import SEARCH_INDEX_BUILD_TIME
+
+# --- Configuration ---
+SEARCH_FIELDS = ("name", "research_interests")
+MAX_PREFIX_EXPANSIONS = 50      # vocabulary terms a trailing prefix may expand to
+FUZZY_THRESHOLD = 0.3           # minimum trigram similarity for a fuzzy name match
+FUZZY_LIMIT = 10                # fuzzy candidates returned per query
+SIMILAR_TOP_K = 10              # neighbours precomputed per faculty member
+SIMILARITY_MAX_FEATURES = 4096  # research terms kept as vector dimensions (most widespread first)
+SIMILARITY_BLOCK_CELLS = 1 << 22  # similarities held at once when precomputing neighbours (rows x n)
+AUTOCOMPLETE_LIMIT = 10         # completions returned per prefix
+AUTOCOMPLETE_MAX_LIMIT = 50     # most completions one request may ask for
+AUTOCOMPLETE_TOP_PREFIX = 3     # keyword prefixes up to this length have their top completions precomputed
+AUTOCOMPLETE_MIN_KEYWORD = 3    # shortest research word offered as a completion
+# common words in research text that make poor completions
+AUTOCOMPLETE_STOPWORDS = frozenset((
+    "and", "for", "the", "with", "from", "into", "its", "their", "based", "using", "via", "other",
+))
+# Unified search: a name match puts a result in a tier, research relevance (tf-idf
+# squashed into [0, 1)) orders results within it
+UNIFIED_NAME_SCORES = {"name_exact": 3.0, "name_prefix": 2.0, "name_substring": 1.0}
+SNIPPET_CHARS = 160             # length of the research excerpt returned with a unified search hit
+# --- End Configuration ---
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+def tokenize(text):
+    """Lowercases, strips diacritics and splits text into word tokens."""
+
+    if not text:
+        return []
+    if text.isascii():
+        # nothing to fold; skips the per-character pass below
+        return _TOKEN_RE.findall(text.lower())
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return _TOKEN_RE.findall(folded.lower())
+
+def fold(text):
+    """
+    Case and diacritic folding that keeps every character in place, so
+    offsets found in the folded text map straight back onto `text`.
+    Characters that would fold to several ("ß") are kept as they are.
+    """
+
+    out = []
+    for ch in text:
+        base = "".join(c for c in unicodedata.normalize("NFKD", ch) if not unicodedata.combining(c)).lower()
+        out.append(base if len(base) == 1 else ch)
+    return "".join(out)
+
+def _intersect(a, b):
+    """Intersects two sorted id sequences, galloping through the longer one."""
+
+    if len(a) > len(b):
+        a, b = b, a
+    out = array("I")
+    lo = 0
+    for doc_id in a:
+        lo = bisect_left(b, doc_id, lo)
+        if lo == len(b):
+            break
+        if b[lo] == doc_id:
+            out.append(doc_id)
+    return out
+
+class FieldIndex:
+    """
+    Inverted index over one text field.
+    Each term maps to a pair of parallel arrays: sorted faculty ids and the
+    term's frequency in each of those documents.
+    """
+
+    __slots__ = ("postings", "vocabulary", "doc_lengths", "doc_count")
+
+    def __init__(self, documents):
+        """`documents` is an iterable of (faculty_id, text) in ascending id order."""
+
+        postings = {}
+        doc_lengths = {}
+        for doc_id, text in documents:
+            tokens = tokenize(text)
+            if not tokens:
+                continue
+            doc_lengths[doc_id] = len(tokens)
+            for term, count in Counter(tokens).items():
+                entry = postings.get(term)
+                if entry is None:
+                    entry = postings[term] = (array("I"), array("H"))
+                entry[0].append(doc_id)
+                entry[1].append(min(count, 0xFFFF))
+
+        self.postings = postings
+        self.vocabulary = sorted(postings)
+        self.doc_lengths = doc_lengths
+        self.doc_count = len(doc_lengths)
+
+    def expand(self, token, prefix=False):
+        """Returns the indexed terms a query token stands for."""
+
+        if not prefix:
+            return [token] if token in self.postings else []
+        start = bisect_left(self.vocabulary, token)
+        terms = []
+        for term in self.vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            terms.append(term)
+        return terms
+
+    def idf(self, term):
+        return math.log(1 + self.doc_count / len(self.postings[term][0]))
+
+    def term_score(self, term, doc_id):
+        """tf-idf contribution of `term` to `doc_id` (0 if the term is absent)."""
+
+        ids, freqs = self.postings[term]
+        pos = bisect_left(ids, doc_id)
+        if pos == len(ids) or ids[pos] != doc_id:
+            return 0.0
+        return (1 + math.log(freqs[pos])) * self.idf(term) / math.sqrt(self.doc_lengths[doc_id])
+
+    def search(self, query, operator="and", prefix_last=True):
+        """
+        Matches `query` against the field. With "and" every query word must
+        appear, with "or" any of them; the last word also matches as a prefix.
+        Returns {faculty_id: tf-idf score}.
+        """
+
+        tokens = tokenize(query)
+        groups = []
+        for i, token in enumerate(tokens):
+            terms = self.expand(token, prefix=prefix_last and i == len(tokens) - 1)
+            if not terms and operator == "and":
+                return {}
+            if terms:
+                groups.append(terms)
+        if not groups:
+            return {}
+
+        def group_ids(terms):
+            if len(terms) == 1:
+                return self.postings[terms[0]][0]
+            return array("I", sorted(set().union(*(self.postings[t][0] for t in terms))))
+
+        if operator == "and":
+            candidates = None
+            for ids in sorted((group_ids(g) for g in groups), key=len):
+                candidates = ids if candidates is None else _intersect(candidates, ids)
+                if not candidates:
+                    return {}
+        else:
+            candidates = sorted(set().union(*(group_ids(g) for g in groups)))
+
+        return {
+            doc_id: sum(self.term_score(term, doc_id) for terms in groups for term in terms)
+            for doc_id in candidates
+        }
+
+def is_after(score, doc_id, after):
+    """True if (score, doc_id) sorts after the `after` key in score-descending, id-ascending order."""
+
+    return score < after["score"] or (score == after["score"] and doc_id > after["id"])
+
+def trigrams(word):
+    """Character trigrams of a word padded like pg_trgm ("  w", " wo", ..., "rd ")."""
+
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+class TrigramIndex:
+    """
+    Character-trigram index over the distinct words of faculty names.
+    Query words are matched against name words by trigram Jaccard
+    similarity; each distinct word keeps a sorted array of the faculty ids
+    whose name contains it, so the index grows with the vocabulary rather
+    than with the number of faculty. Trigram postings are numpy arrays of
+    word indexes, so shared trigrams are counted in one bincount and the
+    candidates pruned by vector masks rather than a loop over every word.
+    """
+
+    __slots__ = ("words", "word_lengths", "word_names", "postings")
+
+    def __init__(self, names):
+        """`names` maps faculty id to name."""
+
+        word_ids = {}
+        self.words = []
+        self.word_names = []
+        for doc_id in sorted(names):
+            for word in dict.fromkeys(tokenize(names[doc_id])):
+                idx = word_ids.get(word)
+                if idx is None:
+                    idx = word_ids[word] = len(self.words)
+                    self.words.append(word)
+                    self.word_names.append(array("I"))
+                self.word_names[idx].append(doc_id)
+
+        word_lengths = array("H")
+        postings = {}
+        for idx, word in enumerate(self.words):
+            grams = trigrams(word)
+            word_lengths.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, array("I")).append(idx)
+        self.word_lengths = np.array(word_lengths, dtype=np.int32)
+        self.postings = {gram: np.array(posting, dtype=np.int32) for gram, posting in postings.items()}
+
+    def match_word(self, token, threshold):
+        """Returns {word index: similarity} for name words at least `threshold` similar to `token`."""
+
+        query = trigrams(token)
+        size = len(query)
+        needed = max(1, math.ceil(threshold * size))
+        lists = [posting for posting in map(self.postings.get, query) if posting is not None]
+        if not lists:
+            return {}
+
+        # shared trigrams per word, then only words that can reach `threshold`:
+        # at least `needed` shared, and a length within [t * size, size / t]
+        shared = np.bincount(np.concatenate(lists))
+        candidates = np.flatnonzero(shared >= needed)
+        lengths = self.word_lengths[candidates]
+        candidates = candidates[(lengths >= threshold * size) & (lengths * threshold <= size)]
+        counts = shared[candidates]
+        similarity = counts / (size + self.word_lengths[candidates] - counts)
+        keep = similarity >= threshold
+        return dict(zip(candidates[keep].tolist(), similarity[keep].tolist()))
+
+    def search(self, query, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT, after=None, ids=None):
+        """
+        Scores each name by the mean, over query words, of the best similarity
+        between that word and any word of the name. Returns up to `limit`
+        (faculty_id, score) pairs with score >= `threshold`, best first
+        (ties by id), starting after the `after` {"score", "id"} key if given
+        and restricted to the set `ids` if given.
+        """
+
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        totals = None
+        for token in tokens:
+            # Expand matched words to faculty ids in ascending similarity, so
+            # each id ends up holding the best similarity of any of its words
+            best = {}
+            matches = self.match_word(token, threshold)
+            for idx in sorted(matches, key=matches.__getitem__):
+                best.update(dict.fromkeys(self.word_names[idx], matches[idx]))
+
+            if totals is None:
+                totals = best
+            else:
+                for doc_id, similarity in best.items():
+                    totals[doc_id] = totals.get(doc_id, 0.0) + similarity
+
+        ranked = (
+            (total / len(tokens), -doc_id) for doc_id, total in totals.items()
+            if total >= threshold * len(tokens) and (ids is None or doc_id in ids)
+        )
+        if after is not None:
+            ranked = (r for r in ranked if is_after(r[0], -r[1], after))
+        return [(-neg_id, score) for score, neg_id in heapq.nlargest(limit, ranked)]
+
+class NameMatcher:
+    """
+    Every folded name in one newline separated string, so finding the names
+    that contain a query is a run of str.find calls rather than a Python
+    loop over the names. Matches are classed as exact, prefix (the query
+    starts the name or one of its words) or substring.
+    """
+
+    __slots__ = ("text", "starts", "ids")
+
+    def __init__(self, names):
+        """`names` maps faculty id to name, in ascending id order."""
+
+        self.ids = list(names)
+        self.starts = array("I")
+        offset = 0
+        for name in names.values():
+            self.starts.append(offset)
+            offset += len(name) + 1
+        self.text = "\n".join(fold(name.replace("\n", " ")) for name in names.values())
+
+    def match(self, query):
+        """Returns {faculty_id: (kind, start, end)} with the best match kind per name and its span in the name."""
+
+        needle = fold(" ".join(query.split()))
+        found = {}
+        if not needle:
+            return found
+
+        rank = list(UNIFIED_NAME_SCORES)
+        pos = self.text.find(needle)
+        while pos != -1:
+            idx = bisect_right(self.starts, pos) - 1
+            start = self.starts[idx]
+            end = self.starts[idx + 1] - 1 if idx + 1 < len(self.starts) else len(self.text)
+            if pos == start and pos + len(needle) == end:
+                kind = "name_exact"
+            elif pos == start or not self.text[pos - 1].isalnum():
+                kind = "name_prefix"
+            else:
+                kind = "name_substring"
+
+            doc_id = self.ids[idx]
+            best = found.get(doc_id)
+            if best is None or rank.index(kind) < rank.index(best[0]):
+                found[doc_id] = (kind, pos - start, pos - start + len(needle))
+            pos = self.text.find(needle, pos + 1)
+        return found
+
+def mark(text, spans):
+    """HTML-escapes `text`, wrapping the (start, end) `spans` in <mark>."""
+
+    out = []
+    last = 0
+    for start, end in spans:
+        out.append(html.escape(text[last:start]))
+        out.append(f"<mark>{html.escape(text[start:end])}</mark>")
+        last = end
+    out.append(html.escape(text[last:]))
+    return "".join(out)
+
+def research_snippet(text, query, width=SNIPPET_CHARS):
+    """
+    Up to `width` characters of `text` around its first word matching
+    `query` (the last query word also as a prefix, as in FieldIndex.search),
+    HTML-escaped with matching words in <mark>. Starts at the beginning of
+    the text when no word matches. Returns None for empty text.
+    """
+
+    if not text:
+        return None
+    tokens = tokenize(query)
+    words = set(tokens[:-1])
+    last = tokens[-1] if tokens else None
+
+    def matches(word):
+        return any(t in words or (last and t.startswith(last)) for t in tokenize(word))
+
+    hits = [m.span() for m in _TOKEN_RE.finditer(text) if matches(m.group())]
+    start = max(0, hits[0][0] - width // 3) if hits else 0
+    end = min(len(text), start + width)
+    # don't cut words at either edge
+    if start > 0:
+        space = text.find(" ", start)
+        start = space + 1 if -1 < space < (hits[0][0] if hits else end) else start
+    if end < len(text):
+        space = text.rfind(" ", start, end)
+        end = space if space > start else end
+
+    spans = [(a - start, b - start) for a, b in hits if a >= start and b <= end]
+    return ("…" if start > 0 else "") + mark(text[start:end], spans) + ("…" if end < len(text) else "")
+
+class SimilarityIndex:
+    """
+    TF-IDF vectors over research interests, L2-normalized and stored sparse:
+    the non-zero weights of each faculty member with research text in
+    compressed rows (row_ptr / row_terms / row_weights, as in CSR), and the
+    same weights grouped by term (term_ptr / term_rows / term_weights) as an
+    inverted index, so memory follows the number of weights rather than
+    rows x vocabulary. Every row's top-k most similar rows are precomputed
+    block by block through the inverted index, so a "similar faculty" lookup
+    is a slice of a stored array.
+    """
+
+    __slots__ = (
+        "ids", "rows", "vocabulary", "idf", "row_ptr", "row_terms", "row_weights",
+        "term_ptr", "term_rows", "term_weights", "top_k", "neighbours", "neighbour_scores",
+    )
+
+    def __init__(self, documents, top_k=SIMILAR_TOP_K, max_features=SIMILARITY_MAX_FEATURES):
+        """`documents` is an iterable of (faculty_id, text) in ascending id order."""
+
+        docs = [(doc_id, Counter(tokens)) for doc_id, tokens in ((d, tokenize(t)) for d, t in documents) if tokens]
+        df = Counter()
+        for _, counts in docs:
+            df.update(counts.keys())
+        terms = sorted(df, key=lambda term: (-df[term], term))[:max_features]
+
+        self.ids = np.array([doc_id for doc_id, _ in docs], dtype=np.int64)
+        self.rows = {doc_id: row for row, (doc_id, _) in enumerate(docs)}
+        self.vocabulary = {term: col for col, term in enumerate(terms)}
+        # same weighting as FieldIndex: sublinear tf times log(1 + N / df)
+        self.idf = np.log1p(len(docs) / np.array([df[t] for t in terms], dtype=np.float32))
+
+        row_ptr, row_terms, row_weights = [0], [], []
+        for _, counts in docs:
+            entries = sorted(
+                (self.vocabulary[term], 1 + math.log(count)) for term, count in counts.items() if term in self.vocabulary
+            )
+            row_terms.extend(col for col, _ in entries)
+            row_weights.extend(weight for _, weight in entries)
+            row_ptr.append(len(row_terms))
+        self.row_ptr = np.array(row_ptr, dtype=np.int64)
+        self.row_terms = np.array(row_terms, dtype=np.int32)
+        self.row_weights = np.array(row_weights, dtype=np.float32) * self.idf[self.row_terms]
+        entry_rows = np.repeat(np.arange(len(docs), dtype=np.int32), np.diff(self.row_ptr))
+        norms = np.sqrt(np.bincount(entry_rows, weights=self.row_weights ** 2, minlength=len(docs)))
+        self.row_weights /= norms[entry_rows].astype(np.float32)
+
+        # the inverted index: entries regrouped by term, rows ascending within a term
+        order = np.argsort(self.row_terms, kind="stable")
+        self.term_ptr = np.zeros(len(terms) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.row_terms, minlength=len(terms)), out=self.term_ptr[1:])
+        self.term_rows = entry_rows[order]
+        self.term_weights = self.row_weights[order]
+
+        self.top_k = max(0, min(top_k, len(docs) - 1))
+        self.neighbours, self.neighbour_scores = self._top_k()
+
+    def _scores(self, start, stop):
+        """Dense (stop - start) x n cosine similarities of rows start..stop against every row."""
+
+        block = np.zeros((stop - start, len(self.ids)), dtype=np.float32)
+        # each term adds the outer product of its weights in the block and its whole posting list
+        for col in np.unique(self.row_terms[self.row_ptr[start]:self.row_ptr[stop]]):
+            lo, hi = self.term_ptr[col], self.term_ptr[col + 1]
+            rows, weights = self.term_rows[lo:hi], self.term_weights[lo:hi]
+            first, last = np.searchsorted(rows, (start, stop))
+            block[np.ix_(rows[first:last] - start, rows)] += np.outer(weights[first:last], weights)
+        return block
+
+    def _rank_rows(self, start, stop):
+        """Nearest other rows (and their similarities) for rows start..stop, best first (ties by id)."""
+
+        k = self.top_k
+        block = self._scores(start, stop)
+        own = np.arange(block.shape[0])
+        block[own, start + own] = -1.0     # never your own neighbour
+        top = np.argpartition(-block, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(block, top, axis=1)
+        order = np.lexsort((self.ids[top], -top_scores), axis=1)
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def _top_k(self):
+        """(rows, scores) arrays of shape (n, k) holding every row's neighbours."""
+
+        n = len(self.ids)
+        neighbours = np.zeros((n, self.top_k), dtype=np.int32)
+        scores = np.zeros((n, self.top_k), dtype=np.float32)
+        if self.top_k == 0:
+            return neighbours, scores
+
+        # similarities block by block, so memory stays at about SIMILARITY_BLOCK_CELLS
+        block_rows = max(1, SIMILARITY_BLOCK_CELLS // n)
+        for start in range(0, n, block_rows):
+            stop = min(n, start + block_rows)
+            neighbours[start:stop], scores[start:stop] = self._rank_rows(start, stop)
+        return neighbours, scores
+
+    def similar(self, doc_id, limit=SIMILAR_TOP_K):
+        """Returns up to `limit` (faculty_id, similarity) neighbours with similarity > 0."""
+
+        row = self.rows.get(doc_id)
+        if row is None or self.top_k == 0:
+            return []
+        rows, scores = self.neighbours[row, :limit], self.neighbour_scores[row, :limit]
+        return [(int(self.ids[r]), float(score)) for r, score in zip(rows, scores) if score > 0]
+
+    def vectorize(self, query):
+        """Normalized TF-IDF weights {column: weight} for free text, or None if it shares no terms with the index."""
+
+        vector = {}
+        for term, count in Counter(tokenize(query)).items():
+            col = self.vocabulary.get(term)
+            if col is not None:
+                vector[col] = (1 + math.log(count)) * float(self.idf[col])
+        norm = math.sqrt(sum(weight * weight for weight in vector.values()))
+        return {col: weight / norm for col, weight in vector.items()} if norm > 0 else None
+
+    def search(self, query, limit=None, after=None, rows=None):
+        """
+        Scores free text against every row through the postings of its terms.
+        Returns [(faculty_id, cosine similarity)] for similarity > 0, best
+        first (ties by id), starting after the `after` {"score", "id"} key if
+        given. `rows` is an optional boolean mask restricting the candidates.
+        """
+
+        vector = self.vectorize(query)
+        if vector is None:
+            return []
+        scores = np.zeros(len(self.ids), dtype=np.float32)
+        for col, weight in vector.items():
+            lo, hi = self.term_ptr[col], self.term_ptr[col + 1]
+            scores[self.term_rows[lo:hi]] += weight * self.term_weights[lo:hi]
+        mask = scores > 0
+        if rows is not None:
+            mask &= rows
+        if after is not None:
+            mask &= (scores < after["score"]) | ((scores == after["score"]) & (self.ids > after["id"]))
+        candidates = np.flatnonzero(mask)
+        ranked = candidates[np.lexsort((self.ids[candidates], -scores[candidates]))]
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(int(self.ids[r]), float(scores[r])) for r in ranked]
+
+class Autocompleter:
+    """
+    Prefix completion over sorted key arrays searched with bisect: full
+    names (which also covers first names), last names (the trailing <strong>
+    part of directory names), middle names and research keywords.
+    Completions rank by match type in that order; names of the same type
+    alphabetically, keywords by how many profiles use them. Short keyword
+    prefixes, which match the most terms, have their most used completions
+    precomputed; longer ones take a bounded heap over their bisect range.
+    """
+
+    __slots__ = ("names", "keywords", "top_keywords")
+
+    # match types, best first
+    TYPES = ("name", "last_name", "middle_name")
+
+    def __init__(self, names, keyword_counts):
+        """`names` maps faculty id to name; `keyword_counts` maps research terms to document counts."""
+
+        entries = {kind: [] for kind in self.TYPES}
+        for doc_id, name in names.items():
+            tokens = tokenize(name)
+            if not tokens:
+                continue
+            entries["name"].append((" ".join(tokens), name, doc_id))
+            entries["last_name"].append((tokens[-1], name, doc_id))
+            for token in tokens[1:-1]:
+                entries["middle_name"].append((token, name, doc_id))
+        self.names = {kind: sorted(rows) for kind, rows in entries.items()}
+
+        self.keywords = sorted(
+            (term, count) for term, count in keyword_counts.items()
+            if len(term) >= AUTOCOMPLETE_MIN_KEYWORD and term not in AUTOCOMPLETE_STOPWORDS and not term.isdigit()
+        )
+        by_prefix = {}
+        for term, count in self.keywords:
+            for size in range(1, min(AUTOCOMPLETE_TOP_PREFIX, len(term)) + 1):
+                by_prefix.setdefault(term[:size], []).append((-count, term))
+        # prefix -> up to AUTOCOMPLETE_MAX_LIMIT terms, most used first (ties alphabetically)
+        self.top_keywords = {
+            prefix: [term for _, term in heapq.nsmallest(AUTOCOMPLETE_MAX_LIMIT, candidates)]
+            for prefix, candidates in by_prefix.items()
+        }
+
+    def complete(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        """Returns up to `limit` completions as {"text", "type", "id"} dicts (id is None for keywords)."""
+
+        key = " ".join(tokenize(prefix))
+        if not key:
+            return []
+        if prefix[-1:].isspace():
+            key += " "
+
+        results = []
+        seen = set()
+        for kind in self.TYPES:
+            rows = self.names[kind]
+            i = bisect_left(rows, (key,))
+            while i < len(rows) and len(results) < limit and rows[i][0].startswith(key):
+                _, name, doc_id = rows[i]
+                if doc_id not in seen:
+                    seen.add(doc_id)
+                    results.append({"text": name, "type": kind, "id": doc_id})
+                i += 1
+            if len(results) >= limit:
+                return results
+
+        if " " not in key:
+            wanted = limit - len(results)
+            if len(key) <= AUTOCOMPLETE_TOP_PREFIX:
+                terms = self.top_keywords.get(key, [])[:wanted]
+            else:
+                # every term with the prefix sorts between key and key with its last character bumped
+                start = bisect_left(self.keywords, (key,))
+                end = bisect_left(self.keywords, (key[:-1] + chr(ord(key[-1]) + 1),), start)
+                candidates = ((-count, term) for term, count in self.keywords[start:end])
+                terms = [term for _, term in heapq.nsmallest(wanted, candidates)]
+            for term in terms:
+                results.append({"text": term, "type": "keyword", "id": None})
+        return results
+
+class SearchEngine:
+    """Immutable snapshot of the faculty table indexed for name and research search."""
+
+    def __init__(self, rows):
+        """
+        `rows` are (id, name, research_interests[, department[, webpage_keywords]])
+        tuples. Webpage keywords are indexed as part of the research text.
+        """
+
+        rows = sorted(rows, key=lambda row: row[0])
+        self.names = {row[0]: row[1] for row in rows}
+        # department code -> ids of its faculty, for the department filter
+        self.departments = {}
+        for row in rows:
+            for code in department_codes(row[3] if len(row) > 3 else None):
+                self.departments.setdefault(code, set()).add(row[0])
+        rows = [(row[0], row[1], " ".join(filter(None, (row[2], *row[4:5]))) or None) for row in rows]
+        self.fields = {
+            field: FieldIndex((row[0], row[i + 1]) for row in rows)
+            for i, field in enumerate(SEARCH_FIELDS)
+        }
+        self.name_trigrams = TrigramIndex(self.names)
+        self.name_matcher = NameMatcher(self.names)
+        self.similarity = SimilarityIndex((row[0], row[2]) for row in rows)
+        self.department_rows = {
+            code: np.isin(self.similarity.ids, np.fromiter(ids, dtype=np.int64, count=len(ids)))
+            for code, ids in self.departments.items()
+        }
+        research = self.fields["research_interests"]
+        self.autocompleter = Autocompleter(
+            self.names, {term: len(ids) for term, (ids, _) in research.postings.items()}
+        )
+
+    @classmethod
+    def from_db(cls, db: Session):
+        rows = db.query(
+            Faculty.id, Faculty.name, Faculty.research_interests, Faculty.department, Faculty.webpage_keywords
+        ).order_by(Faculty.id).all()
+        return cls([tuple(row) for row in rows])
+
+    def __len__(self):
+        return len(self.names)
+
+    def department_ids(self, department):
+        """Ids of the faculty in `department` (matched case-insensitively)."""
+
+        return self.departments.get(department.upper(), set())
+
+    def search(self, field, query, operator="and", limit=None, after=None, department=None):
+        """
+        Returns [(faculty_id, name, score)] ordered by descending tf-idf score,
+        then id, starting after the `after` {"score", "id"} key if given and
+        restricted to one `department` if given.
+        """
+
+        scores = self.fields[field].search(query, operator=operator)
+        if department is not None:
+            allowed = self.department_ids(department)
+            scores = {doc_id: score for doc_id, score in scores.items() if doc_id in allowed}
+        ranked = sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+        if after is not None:
+            ranked = [doc_id for doc_id in ranked if is_after(scores[doc_id], doc_id, after)]
+        if limit is not None:
+            ranked = ranked[:limit]
+        return [(doc_id, self.names[doc_id], scores[doc_id]) for doc_id in ranked]
+
+    def fuzzy_search(self, query, threshold=FUZZY_THRESHOLD, limit=FUZZY_LIMIT, after=None, department=None):
+        """Typo-tolerant name search. Returns [(faculty_id, name, similarity)], most similar first."""
+
+        ids = self.department_ids(department) if department is not None else None
+        return [
+            (doc_id, self.names[doc_id], score)
+            for doc_id, score in self.name_trigrams.search(query, threshold, limit, after, ids)
+        ]
+
+    def unified_search(self, query, limit, after=None, department=None):
+        """
+        Ranks names and research interests together in one pass: an exact
+        name match scores above a name prefix, a prefix above a name
+        substring, and any name match above research-only hits; research
+        tf-idf (any query word, the last also as a prefix) orders results
+        within a tier. The best `limit` are taken with a bounded heap,
+        without sorting every candidate.
+        Returns [(faculty_id, name, score, kind, name_span)], best first (ties
+        by id), where kind is a UNIFIED_NAME_SCORES key or "research" and
+        name_span the matched (start, end) in the name, or None.
+        """
+
+        names = self.name_matcher.match(query)
+        research = self.fields["research_interests"].search(query, operator="or")
+        allowed = self.department_ids(department) if department is not None else None
+
+        def candidates():
+            for doc_id in names.keys() | research.keys():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                kind, start, end = names.get(doc_id, ("research", None, None))
+                relevance = research.get(doc_id, 0.0)
+                score = UNIFIED_NAME_SCORES.get(kind, 0.0) + relevance / (1 + relevance)
+                if after is None or is_after(score, doc_id, after):
+                    yield score, -doc_id, kind, (start, end) if start is not None else None
+
+        return [
+            (-neg_id, self.names[-neg_id], score, kind, span)
+            for score, neg_id, kind, span in heapq.nlargest(limit, candidates(), key=lambda hit: hit[:2])
+        ]
+
+    def autocomplete(self, prefix, limit=AUTOCOMPLETE_LIMIT):
+        return self.autocompleter.complete(prefix, limit)
+
+    def similar(self, faculty_id, limit=SIMILAR_TOP_K):
+        """Faculty with the most similar research interests. Returns [(faculty_id, name, similarity)]."""
+
+        return [(doc_id, self.names[doc_id], score) for doc_id, score in self.similarity.similar(faculty_id, limit)]
+
+    def semantic_search(self, query, limit=None, after=None, department=None):
+        """Research search by TF-IDF cosine similarity. Returns [(faculty_id, name, similarity)], best first."""
+
+        rows = None
+        if department is not None:
+            rows = self.department_rows.get(department.upper())
+            if rows is None:
+                return []
+        return [
+            (doc_id, self.names[doc_id], score)
+            for doc_id, score in self.similarity.search(query, limit, after, rows)
+        ]
+
+# The live engine. Readers take a reference once per request; rebuilds
+# construct a complete new engine and replace the reference in one assignment.
+_engine = None
+_rebuild_lock = threading.Lock()
+_rebuild_pending = False
+_rebuild_thread = None
+
+def get_search_engine():
+    """Returns the current SearchEngine, or None before the first build."""
+
+    return _engine
+
+def build_search_engine(db: Session) -> SearchEngine:
+    """
+    Builds an engine from the database and makes it the live one, bumping
+    the data generation so cached search responses from the old index expire.
+    """
+
+    global _engine
+    started = time.perf_counter()
+    engine = SearchEngine.from_db(db)
+    SEARCH_INDEX_BUILD_TIME.set(round(time.perf_counter() - started, 4))
+    _engine = engine
+    bump_generation()
+    return engine
+
+def _rebuild_worker(bind):
+    global _rebuild_pending, _rebuild_thread
+    while True:
+        with _rebuild_lock:
+            if not _rebuild_pending:
+                _rebuild_thread = None
+                return
+            _rebuild_pending = False
+
+        db = Session(bind=bind)
+        try:
+            build_search_engine(db)
+        except Exception as e:
+            # Keep serving the previous index rather than failing searches
+            print(f"Search index rebuild failed: {e}")
+        finally:
+            db.close()
+
+def rebuild_search_engine_async(bind) -> threading.Thread:
+    """
+    Rebuilds the engine from `bind` on a background thread and swaps it in
+    when complete. Requests made while a rebuild is running are coalesced
+    into one more rebuild afterwards.
+    """
+
+    global _rebuild_pending, _rebuild_thread
+    with _rebuild_lock:
+        _rebuild_pending = True
+        if _rebuild_thread is None:
+            _rebuild_thread = threading.Thread(
+                target=_rebuild_worker, args=(bind,), name="search-index-rebuild", daemon=True
+            )
+            _rebuild_thread.start()
+        return _rebuild_thread
@@ -2,21 +2,25 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from backend.db.models import Base
-from backend.db.database import get_db
+from backend.db.database import get_db, get_read_db
 from backend.app.main import app
+from backend.app.response_cache import get_response_cache
 
 """
 Fixtures for testing the FastAPI application with a temporary in-memory database.
 Goals:
   - Provide a test database session
   - Provide a test client for API requests
+  - Start every test with an empty response cache
 """
 
 # fixture for creating an in-memory SQLite database
+# (StaticPool shares one connection, so TestClient's worker threads see the same database)
 @pytest.fixture(scope="session")
 def test_engine():
-    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False})
+    engine = create_engine("sqlite:///:memory:", connect_args={"check_same_thread": False}, poolclass=StaticPool)
     Base.metadata.create_all(engine)
     return engine
 
@@ -43,4 +47,10 @@ def client(db):
         finally:
             pass
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     return TestClient(app)
+
+# fixture for isolating tests from responses cached by earlier ones
+@pytest.fixture(autouse=True)
+def clear_response_cache():
+    get_response_cache().clear()
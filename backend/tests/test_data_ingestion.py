@@ -1,13 +1,32 @@
+import io
 import json
-from backend.data_ingestion import load_data_from_json, ingest_faculty_data
-from backend.db.models import Faculty
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+import pytest
+from backend.data_ingestion import (
+    iter_json_array, load_data_from_json, ingest_faculty_data, sync_faculty_data, ingest_seed_file, refresh_faculty_data
+)
+from backend.db.models import Faculty, Tag, faculty_departments
 
 """
 Unit tests for data ingestion functions.
 Goals:
-  - load_data_from_json correctly loads JSON data and returns list
+  - load_data_from_json streams the records of a JSON array file
+  - JSON arrays are decoded a chunk at a time, values split across chunks included
+  - load_data_from_json also reads JSON lines, skipping malformed lines
   - ingest_faculty_data adds new faculty to the database
   - ingest_faculty_data skips duplicates based on name
+  - ingest_faculty_data upserts changed records and reports counts and timings
+  - columns missing from a record keep their stored value
+  - sync_faculty_data adds, updates, removes and reports the delta
+  - faculty of a department whose directory failed to load are not removed
+  - department codes are stored upper-cased, and failed mixed-case codes ("ChE") still match them
+  - a refresh with webpages saves the keywords to the seed file
+  - changed rows are re-tagged with the learned n-gram tags, without refitting on the corpus
+  - ingest_seed_file skips a seed file whose hash was already ingested
+  - importing the API does not load the scraper stack
 """
 
 def test_load_data_from_json(tmp_path):
@@ -15,7 +34,22 @@ def test_load_data_from_json(tmp_path):
     data = [{"name": "A"}]
     fp.write_text(json.dumps(data))
     out = load_data_from_json(str(fp))
-    assert out == data
+    assert not isinstance(out, list)
+    assert list(out) == data
+
+def test_load_data_from_jsonl(tmp_path):
+    fp = tmp_path / "data.jsonl"
+    fp.write_text('{"name": "A"}\n\n{"name": "B"}\n{"name": "C", "res')
+    assert list(load_data_from_json(str(fp))) == [{"name": "A"}, {"name": "B"}]
+
+def test_iter_json_array_in_chunks():
+    data = [{"name": "Ava ]}, [\"Quell\"", "rank": 12.5}, {"name": "B", "tags": [1, [2]]}, 1234567]
+    for text in (json.dumps(data), json.dumps(data, indent=2)):
+        for chunk_size in (1, 3, 7, 4096):
+            assert list(iter_json_array(io.StringIO(text[1:]), chunk_size)) == data
+
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array(io.StringIO('{"name": "A"}, {"name"'), 4))
 
 def test_ingest_faculty_data_adds(db):
     data = [{"name": "John", "personal_webpage": "x", "research_interests": "y"}]
@@ -30,3 +64,196 @@ def test_ingest_faculty_data_skips_duplicates(db):
     ingest_faculty_data(db, data)
     q = db.query(Faculty).all()
     assert len(q) == 1
+
+def test_ingest_faculty_data_upserts_changes(db):
+    ingest_faculty_data(db, [
+        {"name": "Eve", "research_interests": "robotics"},
+        {"name": "Fay", "research_interests": "controls"},
+    ])
+
+    report = ingest_faculty_data(db, [
+        {"name": "Eve", "research_interests": "robotics"},
+        {"name": "Fay", "research_interests": "nonlinear controls"},
+        {"name": "Gus", "research_interests": "antennas"},
+        {"name": "Gus", "research_interests": "phased arrays"},
+    ], batch_size=2)
+
+    assert (report["added"], report["updated"], report["unchanged"]) == (1, 1, 1)
+    assert set(report["timings"]) == {"load", "write", "index", "total"}
+    rows = {f.name: f.research_interests for f in db.query(Faculty).filter(Faculty.name.in_(["Eve", "Fay", "Gus"]))}
+    assert rows == {"Eve": "robotics", "Fay": "nonlinear controls", "Gus": "phased arrays"}
+
+def test_ingest_keeps_columns_missing_from_record(db):
+    ingest_faculty_data(db, [{"name": "Hal", "research_interests": "radar", "webpage_keywords": "antenna arrays"}])
+
+    # a seed written before the webpage stage has no webpage_keywords key
+    report = ingest_faculty_data(db, [{"name": "Hal", "research_interests": "radar", "personal_webpage": "h.edu"}])
+    assert report["updated"] == 1
+    row = db.query(Faculty).filter(Faculty.name == "Hal").one()
+    assert (row.webpage_url, row.webpage_keywords) == ("h.edu", "antenna arrays")
+
+    ingest_faculty_data(db, [{"name": "Hal", "webpage_keywords": None}])
+    db.refresh(row)
+    assert (row.research_interests, row.webpage_keywords) == ("radar", None)
+
+def test_sync_faculty_data_reports_delta(db):
+    sync_faculty_data(db, [
+        {"name": "Ann", "profile_url": "u/ann", "research_interests": "optics", "content_hash": "a1"},
+        {"name": "Bob", "profile_url": "u/bob", "research_interests": "radar", "content_hash": "b1"},
+        {"name": "Cat", "profile_url": "u/cat", "research_interests": "vlsi", "content_hash": "c1"},
+    ])
+
+    delta = sync_faculty_data(db, [
+        {"name": "Ann", "profile_url": "u/ann", "research_interests": "quantum optics", "content_hash": "a2", "changed": True},
+        {"name": "Bob", "profile_url": "u/bob", "research_interests": "radar", "content_hash": "b1", "changed": False},
+        {"name": "Dan", "profile_url": "u/dan", "research_interests": "power", "content_hash": "d1", "changed": True},
+    ])
+
+    assert delta["added"] == ["Dan"]
+    assert delta["updated"] == ["Ann"]
+    assert delta["removed"] == ["Cat"]
+    assert delta["unchanged"] == 1
+    names = {f.name: f for f in db.query(Faculty).all()}
+    assert set(names) == {"Ann", "Bob", "Dan"}
+    assert names["Ann"].research_interests == "quantum optics"
+
+def test_sync_updates_department_of_unchanged_profile(db):
+    sync_faculty_data(db, [{"name": "Ivy", "profile_url": "u/ivy", "content_hash": "i1", "department": "ECE"}])
+
+    # the profile page is unchanged, but Ivy is now also listed by BME
+    delta = sync_faculty_data(db, [
+        {"name": "Ivy", "profile_url": "u/ivy", "content_hash": "i1", "department": "ECE,BME", "changed": False},
+    ])
+
+    assert delta["updated"] == ["Ivy"]
+    assert db.query(Faculty.department).filter(Faculty.name == "Ivy").scalar() == "ECE,BME"
+    ivy = db.query(Faculty.id).filter(Faculty.name == "Ivy").scalar()
+    codes = db.query(faculty_departments.c.code).filter(faculty_departments.c.faculty_id == ivy)
+    assert {code for code, in codes} == {"ECE", "BME"}
+
+def test_ingest_seed_file_skips_unchanged(db, tmp_path):
+    fp = tmp_path / "seed.json"
+    fp.write_text(json.dumps([{"name": "Rhea Quinto", "research_interests": "Photonics"}]))
+
+    first = ingest_seed_file(db, str(fp))
+    with patch("backend.data_ingestion.ingest_faculty_data") as ingest:
+        second = ingest_seed_file(db, str(fp))
+        forced = ingest_seed_file(db, str(fp), force=True)
+
+    assert first["skipped"] is False and first["records"] == 1
+    assert second["skipped"] is True and second["sha256"] == first["sha256"]
+    assert forced["skipped"] is False
+    assert ingest.call_count == 1
+
+    fp.write_text(json.dumps([{"name": "Rhea Quinto", "research_interests": "Integrated photonics"}]))
+    assert ingest_seed_file(db, str(fp))["updated"] == 1
+
+def test_api_import_does_not_load_scraper():
+    code = (
+        "import sys, backend.app.main\n"
+        "loaded = [m for m in ('backend.scraper', 'requests', 'bs4', 'lxml') if m in sys.modules]\n"
+        "assert not loaded, loaded"
+    )
+    repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    subprocess.run([sys.executable, "-c", code], check=True, cwd=repo_root)
+
+def test_sync_keeps_faculty_of_failed_departments(db):
+    sync_faculty_data(db, [
+        {"name": "Jon", "profile_url": "u/jon", "content_hash": "j1", "department": "ECE"},
+        {"name": "Kim", "profile_url": "u/kim", "content_hash": "k1", "department": "ME"},
+        {"name": "Lea", "profile_url": "u/lea", "content_hash": "l1", "department": "ECE,ME"},
+        {"name": "Max", "profile_url": "u/max", "content_hash": "m1", "department": "ECE"},
+    ])
+
+    # the ME directory failed to load and Max left ECE
+    delta = sync_faculty_data(db, [
+        {"name": "Jon", "profile_url": "u/jon", "content_hash": "j1", "department": "ECE", "changed": False},
+        {"name": "Lea", "profile_url": "u/lea", "content_hash": "l1", "department": "ECE", "changed": False},
+    ], keep_departments=["ME"])
+
+    assert delta["removed"] == ["Max"]
+    departments = dict(db.query(Faculty.name, Faculty.department))
+    assert departments == {"Jon": "ECE", "Kim": "ME", "Lea": "ECE,ME"}
+
+def test_failed_mixed_case_department_is_kept(db):
+    ingest_faculty_data(db, [
+        {"name": "Ana", "profile_url": "u/ana", "content_hash": "a1", "department": "ChE"},
+        {"name": "Bo", "profile_url": "u/bo", "content_hash": "b1", "department": "ECE,ChE"},
+        {"name": "Cy", "profile_url": "u/cy", "content_hash": "c1", "department": "ECE"},
+    ])
+    names = Faculty.name.in_(["Ana", "Bo", "Cy"])
+    assert dict(db.query(Faculty.name, Faculty.department).filter(names)) == {"Ana": "CHE", "Bo": "ECE,CHE", "Cy": "ECE"}
+
+    # the ChE directory failed to load, as scraper.failed_departments reports it
+    delta = sync_faculty_data(db, [
+        {"name": "Bo", "profile_url": "u/bo", "content_hash": "b1", "department": "ECE", "changed": False},
+        {"name": "Cy", "profile_url": "u/cy", "content_hash": "c1", "department": "ECE", "changed": False},
+    ], keep_departments={"ChE"})
+
+    assert not {"Ana", "Bo"} & set(delta["removed"]) and delta["updated"] == []
+    assert dict(db.query(Faculty.name, Faculty.department).filter(names)) == {"Ana": "CHE", "Bo": "ECE,CHE", "Cy": "ECE"}
+    che = {name for name, in db.query(Faculty.name).join(faculty_departments).filter(faculty_departments.c.code == "CHE")}
+    assert che == {"Ana", "Bo"}
+
+def test_refresh_skips_removal_for_failed_directories(db):
+    sync_faculty_data(db, [
+        {"name": "Nia", "profile_url": "u/nia", "content_hash": "n1", "department": "ECE"},
+        {"name": "Oz", "profile_url": "u/oz", "content_hash": "o1", "department": "ME"},
+    ])
+    listed = [{"name": "Nia", "profile_url": "u/nia", "department": "ECE"}]
+
+    with patch("backend.scraper.scrape_faculty_directory", return_value=listed), \
+         patch("backend.scraper.enrich_faculty_data",
+               side_effect=lambda raw, **kwargs: [{**r, "content_hash": "n1", "changed": False} for r in raw]), \
+         patch("backend.http_cache.ResponseCache"):
+        delta = refresh_faculty_data(db)
+
+    assert "ME" in delta["failed_departments"] and "ECE" not in delta["failed_departments"]
+    assert delta["removed"] == []
+    assert {name for name, in db.query(Faculty.name)} == {"Nia", "Oz"}
+
+def test_refresh_with_webpages_rewrites_seed_file(db, tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
+    listed = [{"name": "Pam", "profile_url": "u/pam", "department": "ECE"}]
+
+    def add_keywords(faculty_list, **kwargs):
+        for faculty in faculty_list:
+            faculty["webpage_keywords"] = "metasurface holography"
+        return faculty_list
+
+    with patch("backend.scraper.scrape_faculty_directory", return_value=listed), \
+         patch("backend.scraper.enrich_faculty_data", side_effect=lambda raw, **kwargs: raw), \
+         patch("backend.scraper.enrich_personal_webpages", side_effect=add_keywords), \
+         patch("backend.http_cache.ResponseCache"):
+        refresh_faculty_data(db, webpages=True)
+
+    seed = json.loads((tmp_path / "faculty_data_complete.json").read_text())
+    assert seed[0]["webpage_keywords"] == "metasurface holography"
+
+def test_changed_rows_are_retagged_without_refitting(db):
+    swarm = "Robotics and swarm coordination"
+    faculty = [
+        {"name": "Rae", "profile_url": "u/rae", "content_hash": "r1", "research_interests": swarm},
+        {"name": "Sol", "profile_url": "u/sol", "content_hash": "s1", "research_interests": swarm},
+        {"name": "Tam", "profile_url": "u/tam", "content_hash": "t1", "research_interests": swarm},
+        {"name": "Uli", "profile_url": "u/uli", "content_hash": "u1", "research_interests": "Antenna arrays"},
+    ]
+    sync_faculty_data(db, faculty, refit_tags=True)
+
+    def counts():
+        watched = ("robotics", "swarm coordination", "electromagnetics", "legged locomotion")
+        return {name: count for name, count in db.query(Tag.name, Tag.faculty_count) if count and name in watched}
+
+    assert counts() == {"robotics": 3, "swarm coordination": 3, "electromagnetics": 1}
+
+    with patch("backend.data_ingestion.rebuild_faculty_tags") as rebuild:
+        ingest_faculty_data(db, [
+            {"name": "Tam", "research_interests": "Antenna arrays and swarm coordination"},
+            {"name": "Vi", "research_interests": "Legged locomotion, swarm coordination"},
+        ])
+        assert counts() == {"robotics": 2, "swarm coordination": 4, "electromagnetics": 2}
+
+        # Rae left the directory
+        sync_faculty_data(db, [{**f, "changed": False} for f in faculty[1:]] + [{"name": "Vi", "changed": False}])
+        assert counts() == {"robotics": 1, "swarm coordination": 3, "electromagnetics": 2}
+    assert rebuild.call_count == 0
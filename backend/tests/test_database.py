@@ -0,0 +1,107 @@
+import pytest
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+from backend.db.database import create_db_engine
+from backend.db.departments import department_clause
+from backend.db.fts import FTS_COLUMNS, search_faculty
+from backend.db.init_db import upgrade_schema
+from backend.db.models import Faculty
+
+"""
+Tests for the SQLite engine configuration.
+Goals:
+  - tuned engines use WAL with the configured pragmas and a bounded pool
+  - the read-only engine cannot write
+  - readers see the last committed data while a write transaction is open
+  - upgrading a database rebuilds an FTS index created with older columns
+  - upgrading backfills faculty_departments, and department filters read its index
+  - upgrading drops the unused indexes on department and webpage_keywords
+"""
+
+def test_tuned_engine_pragmas(tmp_path):
+    engine = create_db_engine(str(tmp_path / "t.db"))
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1     # NORMAL
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() > 0
+    assert engine.pool.size() > 0
+    engine.dispose()
+
+def test_reads_continue_during_write_transaction(tmp_path):
+    path = str(tmp_path / "t.db")
+    writer = create_db_engine(path)
+    reader = create_db_engine(path, read_only=True)
+    with writer.begin() as conn:
+        conn.execute(text("CREATE TABLE t (x INTEGER)"))
+        conn.execute(text("INSERT INTO t VALUES (1)"))
+
+    with writer.connect() as conn:
+        tx = conn.begin()
+        conn.execute(text("INSERT INTO t VALUES (2)"))
+        # uncommitted write is invisible to, and does not block, the read-only engine
+        with reader.connect() as read_conn:
+            assert read_conn.execute(text("SELECT count(*) FROM t")).scalar() == 1
+        tx.commit()
+
+    with reader.connect() as read_conn:
+        assert read_conn.execute(text("SELECT count(*) FROM t")).scalar() == 2
+        with pytest.raises(OperationalError, match="readonly"):
+            read_conn.execute(text("INSERT INTO t VALUES (3)"))
+    writer.dispose()
+    reader.dispose()
+
+def test_upgrade_rebuilds_outdated_fts_index(tmp_path):
+    engine = create_db_engine(str(tmp_path / "t.db"))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE faculty (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, research_interests VARCHAR)"))
+        conn.execute(text("CREATE VIRTUAL TABLE faculty_fts USING fts5(name, research_interests, content='faculty', content_rowid='id')"))
+        conn.execute(text(
+            "CREATE TRIGGER faculty_fts_ai AFTER INSERT ON faculty BEGIN "
+            "INSERT INTO faculty_fts(rowid, name, research_interests) VALUES (new.id, new.name, new.research_interests); END"
+        ))
+        conn.execute(text("INSERT INTO faculty (name, research_interests) VALUES ('Old Row', 'Radar')"))
+
+    upgrade_schema(engine)
+
+    with engine.begin() as conn:
+        assert tuple(row[1] for row in conn.execute(text("PRAGMA table_info(faculty_fts)"))) == FTS_COLUMNS
+        conn.execute(text("UPDATE faculty SET webpage_keywords = 'antenna arrays' WHERE name = 'Old Row'"))
+        # rows from before the upgrade were backfilled, and the new triggers follow the new column
+        assert [row.name for row in search_faculty(conn, "radar", column="research_interests")] == ["Old Row"]
+        assert [row.name for row in search_faculty(conn, "antenna", column="research_interests")] == ["Old Row"]
+    engine.dispose()
+
+def test_upgrade_backfills_department_links(tmp_path):
+    engine = create_db_engine(str(tmp_path / "t.db"))
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE faculty (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, department VARCHAR)"))
+        conn.execute(text("INSERT INTO faculty (name, department) VALUES ('Ada', 'ECE,BME'), ('Bo', 'ME'), ('Cy', NULL)"))
+
+    upgrade_schema(engine)
+
+    with engine.begin() as conn:
+        links = conn.execute(text("SELECT faculty_id, code FROM faculty_departments ORDER BY faculty_id, code")).all()
+        assert links == [(1, "BME"), (1, "ECE"), (2, "ME")]
+        query = select(Faculty.name).where(department_clause("bme")).order_by(Faculty.id)
+        assert conn.execute(query).scalars().all() == ["Ada"]
+        plan = " ".join(row[-1] for row in conn.execute(text(f"EXPLAIN QUERY PLAN {query.compile(compile_kwargs={'literal_binds': True})}")))
+        assert "ix_faculty_departments_code_faculty" in plan
+        assert [row.name for row in search_faculty(conn, "ada", department="ECE")] == ["Ada"]
+    engine.dispose()
+
+def test_upgrade_drops_obsolete_indexes(tmp_path):
+    engine = create_db_engine(str(tmp_path / "t.db"))
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE faculty (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, department VARCHAR, webpage_keywords VARCHAR)"
+        ))
+        conn.execute(text("CREATE INDEX ix_faculty_department ON faculty (department)"))
+        conn.execute(text("CREATE INDEX ix_faculty_webpage_keywords ON faculty (webpage_keywords)"))
+
+    upgrade_schema(engine)
+
+    with engine.begin() as conn:
+        indexes = {row[1] for row in conn.execute(text("PRAGMA index_list(faculty)"))}
+        assert not indexes & {"ix_faculty_department", "ix_faculty_webpage_keywords"}
+        assert "ix_faculty_name" in indexes
+    engine.dispose()
@@ -0,0 +1,83 @@
+import time
+from unittest.mock import patch, MagicMock
+from backend.http_cache import ResponseCache
+from backend.scraper import scrape_faculty_profile, scrape_profile_if_changed, content_hash
+
+"""
+Unit tests for the on-disk HTTP response cache.
+Goals:
+  - a 304 response reuses the previously parsed result
+  - an unchanged page (hash matches the stored one) is cached too, so the next fetch is conditional
+  - entries past the TTL are dropped
+  - least recently used entries are evicted over the size cap
+"""
+
+PROFILE_HTML = """
+<div>
+    <strong>Webpage:</strong>
+    <a href="https://engineering.purdue.edu/qnp"></a>
+</div>
+<p class='profile-research'>Quantum optics</p>
+"""
+
+def fake_response(html, status_code=200, headers=None):
+    r = MagicMock()
+    r.content = html.encode("utf-8")
+    r.status_code = status_code
+    r.headers = headers or {}
+    r.raise_for_status = lambda: None
+    return r
+
+@patch("backend.scraper.requests.get")
+def test_profile_304_reuses_parsed_result(mock_get, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    url = "https://engineering.purdue.edu/ECE/People/ptProfile?resource_id=1"
+
+    mock_get.return_value = fake_response(PROFILE_HTML, headers={"ETag": '"v1"'})
+    first = scrape_faculty_profile(url, "Test Faculty", cache=cache)
+
+    mock_get.return_value = fake_response("", status_code=304)
+    second = scrape_faculty_profile(url, "Test Faculty", cache=cache)
+
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert tuple(second) == tuple(first) == ("https://engineering.purdue.edu/qnp", "Quantum optics")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+@patch("backend.scraper.requests.get")
+def test_unchanged_profile_is_cached_for_revalidation(mock_get, tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3")
+    url = "https://engineering.purdue.edu/ECE/People/ptProfile?resource_id=2"
+    known_hash = content_hash(PROFILE_HTML.encode("utf-8"))
+    known = ("https://engineering.purdue.edu/qnp", "Quantum optics")
+
+    mock_get.return_value = fake_response(PROFILE_HTML, headers={"ETag": '"v1"'})
+    first = scrape_profile_if_changed(url, "Test Faculty", known_hash, cache=cache, known_parsed=known)
+    assert "If-None-Match" not in mock_get.call_args.kwargs["headers"]
+
+    mock_get.return_value = fake_response("", status_code=304)
+    second = scrape_profile_if_changed(url, "Test Faculty", known_hash, cache=cache, known_parsed=known)
+    assert mock_get.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert first == second == (None, None, known_hash, False)
+
+    # with no stored hash to compare against, the 304 answers from the stored result
+    assert scrape_profile_if_changed(url, "Test Faculty", cache=cache) == (*known, known_hash, True)
+
+def test_expired_entry_is_dropped(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", ttl=60)
+    cache.put("https://example.com/a", '"e"', None, b"body", ["x", "y"])
+
+    with patch("backend.http_cache.time.time", return_value=time.time() + 120):
+        assert cache.get("https://example.com/a") is None
+    assert cache.stats()["entries"] == 0
+
+def test_lru_eviction_over_size_cap(tmp_path):
+    cache = ResponseCache(tmp_path / "cache.sqlite3", max_bytes=10)
+    cache.put("https://example.com/a", None, None, b"aaaa", None)
+    cache.put("https://example.com/b", None, None, b"bbbb", None)
+    cache.record_hit("https://example.com/a")
+    cache.put("https://example.com/c", None, None, b"cccc", None)
+
+    assert cache.get("https://example.com/b") is None
+    assert cache.get("https://example.com/a") is not None
+    assert cache.get("https://example.com/c") is not None
@@ -0,0 +1,87 @@
+import threading
+from unittest.mock import patch
+import pytest
+from backend.app.jobs import get_job_manager
+
+"""
+Tests for the background /update job.
+Goals:
+  - POST /update returns a job id immediately with 202
+  - concurrent requests attach to the running job
+  - the status endpoint reports phase, profile progress, errors and the result
+  - a job succeeds only once the search index has been rebuilt
+"""
+
+@pytest.fixture
+def admin(monkeypatch):
+    monkeypatch.setenv("ADMIN_USER", "u")
+    monkeypatch.setenv("ADMIN_PASS", "p")
+    return ("u", "p")
+
+def test_update_runs_in_background_and_reports_progress(client, admin):
+    release = threading.Event()
+    reported = threading.Event()
+
+    def fake_refresh(db, incremental=True, progress=None, webpages=False):
+        progress.set_phase("profiles")
+        progress.profile_done(1, 3)
+        progress.profile_done(2, 3, "Failed to fetch profile for B")
+        reported.set()
+        release.wait(5)
+        progress.profile_done(3, 3)
+        return {"added": ["A"], "updated": [], "removed": [], "unchanged": 2}
+
+    with patch("backend.app.jobs.refresh_faculty_data", side_effect=fake_refresh), \
+         patch("backend.app.jobs.rebuild_search_engine_async"):
+        first = client.post("/api/v1/update", auth=admin)
+        assert first.status_code == 202
+        job_id = first.json()["job_id"]
+        assert reported.wait(5)
+
+        second = client.post("/api/v1/update", auth=admin).json()
+        assert second == {"job_id": job_id, "status": "running", "attached": True}
+
+        status = client.get(f"/api/v1/update/{job_id}", auth=admin).json()
+        assert (status["status"], status["phase"]) == ("running", "profiles")
+        assert (status["profiles_fetched"], status["profiles_total"]) == (2, 3)
+        assert status["errors"] == ["Failed to fetch profile for B"]
+
+        release.set()
+        get_job_manager().get(job_id).thread.join(5)
+
+    status = client.get(f"/api/v1/update/{job_id}", auth=admin).json()
+    assert status["status"] == "succeeded"
+    assert status["phase"] == "index"
+    assert status["result"]["added"] == ["A"]
+
+def test_job_waits_for_search_index(client, admin):
+    indexing = threading.Event()
+    release = threading.Event()
+
+    def slow_rebuild(bind):
+        indexing.set()
+        thread = threading.Thread(target=release.wait, args=(5,))
+        thread.start()
+        return thread
+
+    with patch("backend.app.jobs.refresh_faculty_data", return_value={"added": [], "updated": []}), \
+         patch("backend.app.jobs.rebuild_search_engine_async", side_effect=slow_rebuild):
+        job_id = client.post("/api/v1/update", auth=admin).json()["job_id"]
+        assert indexing.wait(5)
+        status = client.get(f"/api/v1/update/{job_id}", auth=admin).json()
+        assert (status["status"], status["phase"]) == ("running", "index")
+
+        release.set()
+        get_job_manager().get(job_id).thread.join(5)
+
+    assert client.get(f"/api/v1/update/{job_id}", auth=admin).json()["status"] == "succeeded"
+
+def test_failed_job_and_unknown_id(client, admin):
+    with patch("backend.app.jobs.refresh_faculty_data", return_value=None):
+        job_id = client.post("/api/v1/update", auth=admin).json()["job_id"]
+        get_job_manager().get(job_id).thread.join(5)
+
+    status = client.get(f"/api/v1/update/{job_id}", auth=admin).json()
+    assert status["status"] == "failed"
+    assert status["error_count"] == 1
+    assert client.get("/api/v1/update/missing", auth=admin).status_code == 404
@@ -0,0 +1,46 @@
+import json
+from backend.log_sink import BufferedLogSink, infer_level, flush_logs
+from backend.scraper import log_message
+
+"""
+Unit tests for the buffered logging sink.
+Goals:
+  - log_message call sites keep working and produce JSON-lines records
+  - "w" mode starts a fresh file
+  - files are rotated once they pass the size limit
+"""
+
+def read_records(path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+def test_log_message_writes_json_lines(tmp_path, monkeypatch):
+    log_file = tmp_path / "log.txt"
+    monkeypatch.setattr("backend.scraper.LOG_FILE", log_file)
+
+    log_message("old run", "a")
+    log_message("--- Starting scrape ---", "w")
+    log_message("    ERROR: Failed to fetch profile for X: boom", "a")
+    assert flush_logs(timeout=5)
+
+    records = read_records(log_file)
+    assert [r["msg"] for r in records] == ["--- Starting scrape ---", "ERROR: Failed to fetch profile for X: boom"]
+    assert records[0]["level"] == "INFO"
+    assert records[1]["level"] == "ERROR"
+    assert "ts" in records[0]
+
+def test_sink_rotates_by_size(tmp_path):
+    sink = BufferedLogSink(max_bytes=200, backup_count=2)
+    path = tmp_path / "rotating.log"
+
+    for i in range(20):
+        sink.write(path, {"msg": f"record {i}", "pad": "x" * 40})
+    sink.close()
+
+    assert (tmp_path / "rotating.log.1").exists()
+    assert not (tmp_path / "rotating.log.3").exists()
+    assert path.stat().st_size < 200 + 100
+
+def test_infer_level():
+    assert infer_level("WARNING: No link found") == "WARNING"
+    assert infer_level("    ERROR: x") == "ERROR"
+    assert infer_level("Processing: John") == "INFO"
@@ -0,0 +1,126 @@
+from unittest.mock import patch, MagicMock
+from backend import metrics
+from backend.data_ingestion import ingest_faculty_data, refresh_faculty_data
+from backend.db.models import Faculty
+from backend.metrics import Registry
+from backend.scraper import fetch_and_parse, parse_faculty_profile
+
+"""
+Tests for the metrics registry and the /metrics endpoint.
+Goals:
+  - counters, gauges and histograms render in the Prometheus text format
+  - requests are counted per route template and status, with SQL statements per request
+  - replies served from the response cache are counted under their route template
+  - scraper fetches record latency, bytes and parse time
+  - a refresh records the duration of each phase
+"""
+
+def sample(text, line_start):
+    # value of the first exposition line starting with `line_start`
+    for line in text.splitlines():
+        if line.startswith(line_start):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{line_start} not in metrics output")
+
+def test_registry_renders_prometheus_text():
+    registry = Registry()
+    requests_total = registry.counter("demo_requests_total", "Requests.", ("route",))
+    latency = registry.histogram("demo_latency_seconds", "Latency.", buckets=(0.1, 1.0))
+    registry.gauge("demo_size", "Size.").set(3)
+
+    requests_total.inc(route='/a"b')
+    requests_total.inc(2, route='/a"b')
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    assert registry.render().splitlines() == [
+        "# HELP demo_requests_total Requests.",
+        "# TYPE demo_requests_total counter",
+        'demo_requests_total{route="/a\\"b"} 3',
+        "# HELP demo_latency_seconds Latency.",
+        "# TYPE demo_latency_seconds histogram",
+        'demo_latency_seconds_bucket{le="0.1"} 1',
+        'demo_latency_seconds_bucket{le="1"} 2',
+        'demo_latency_seconds_bucket{le="+Inf"} 3',
+        "demo_latency_seconds_sum 5.55",
+        "demo_latency_seconds_count 3",
+        "# HELP demo_size Size.",
+        "# TYPE demo_size gauge",
+        "demo_size 3",
+    ]
+
+def test_metrics_endpoint_counts_routes_and_queries(client, db):
+    ingest_faculty_data(db, [{"name": "Metric Mae", "research_interests": "Telemetry"}])
+    faculty_id = db.query(Faculty.id).filter(Faculty.name == "Metric Mae").scalar()
+    route = 'route="/api/v1/faculty/{faculty_id}"'
+    before = client.get("/metrics").text
+    try:
+        requests_before = sample(before, f'faculty_http_requests_total{{{route},method="GET",status="200"}}')
+    except AssertionError:
+        requests_before = 0
+
+    assert client.get(f"/api/v1/faculty/{faculty_id}").status_code == 200
+    assert client.get(f"/api/v1/faculty/{faculty_id}/similar").status_code == 200
+    assert client.get("/no/such/path").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    assert sample(text, f'faculty_http_requests_total{{{route},method="GET",status="200"}}') == requests_before + 1
+    assert sample(text, 'faculty_http_requests_total{route="/api/v1/faculty/{faculty_id}/similar",method="GET",status="200"}') >= 1
+    assert 'route="unmatched"' in text and "/no/such/path" not in text
+    assert sample(text, f'faculty_http_request_duration_seconds_count{{{route},method="GET"}}') >= 1
+    # the lookup itself ran at least one statement
+    assert sample(text, f"faculty_db_queries_per_request_sum{{{route}}}") >= 1
+
+def test_cached_replies_are_counted_under_their_route(client, db):
+    ingest_faculty_data(db, [{"name": "Cached Cal", "research_interests": "Caching"}])
+    label = 'faculty_http_requests_total{route="/api/v1/search/all",method="GET",status="200"}'
+    unmatched = 'faculty_http_requests_total{route="unmatched",method="GET",status="200"}'
+
+    def count(line_start):
+        try:
+            return sample(client.get("/metrics").text, line_start)
+        except AssertionError:
+            return 0
+
+    before, unmatched_before = count(label), count(unmatched)
+    responses = [client.get("/api/v1/search/all") for _ in range(3)]
+
+    assert [r.headers["x-cache"] for r in responses] == ["MISS", "HIT", "HIT"]
+    assert count(label) == before + 3
+    assert count(unmatched) == unmatched_before
+
+def test_scraper_records_fetch_bytes_and_parse_time():
+    body = b"<p class='profile-research'>Telemetry</p>"
+    response = MagicMock(status_code=200, content=body, headers={})
+    session = MagicMock()
+    session.get.return_value = response
+    fetches, _ = metrics.SCRAPER_FETCH_TIME.get()
+    downloaded = metrics.SCRAPER_BYTES.get()
+    parses, _ = metrics.SCRAPER_PARSE_TIME.get(parser="parse_faculty_profile")
+
+    parsed, _, _ = fetch_and_parse("https://example.com/p", parse_faculty_profile, session=session)
+
+    assert parsed == (None, "Telemetry")
+    assert metrics.SCRAPER_FETCH_TIME.get()[0] == fetches + 1
+    assert metrics.SCRAPER_BYTES.get() == downloaded + len(body)
+    assert metrics.SCRAPER_PARSE_TIME.get(parser="parse_faculty_profile")[0] == parses + 1
+
+def test_refresh_records_phase_durations(db):
+    faculty = [{"name": "Phase Pia", "profile_url": "https://example.com/pia"}]
+    metrics.REFRESH_PHASE_TIME.clear()
+
+    # sync is stubbed too, since a real one would delete every row not in `faculty`
+    with patch("backend.scraper.scrape_faculty_directory", return_value=faculty), \
+         patch("backend.scraper.enrich_faculty_data", side_effect=lambda raw, **kwargs: raw), \
+         patch("backend.http_cache.ResponseCache"), \
+         patch("backend.data_ingestion.sync_faculty_data", return_value={"added": ["Phase Pia"]}):
+        delta = refresh_faculty_data(db)
+
+    assert delta["added"] == ["Phase Pia"]
+    for phase in ("directory", "profiles", "sync"):
+        assert metrics.REFRESH_PHASE_TIME.get(phase=phase) >= 0
+    assert "faculty_refresh_phase_duration_seconds{phase=\"sync\"}" in metrics.get_registry().render()
+    assert metrics.REFRESH_COMPLETED.get() > 0
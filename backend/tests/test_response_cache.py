@@ -0,0 +1,65 @@
+from backend.data_ingestion import ingest_faculty_data
+
+"""
+Tests for the versioned response cache on the read endpoints.
+Goals:
+  - repeated GETs are served from the cache, with queries normalized
+  - responses carry a strong ETag and If-None-Match gets a 304
+  - ingestion bumps the data generation so stale entries are not served
+  - hit ratio is exposed through /api/v1/cache/stats
+  - the listed read routes, /search, /autocomplete and /tags included, are cached; stats and exports are not
+"""
+
+URL = "/api/v1/search/name"
+
+def test_repeat_requests_hit_cache(client, db):
+    ingest_faculty_data(db, [{"name": "Umar Quell", "research_interests": "Radar"}])
+
+    first = client.get(URL, params={"q": "umar", "mode": "substring"})
+    second = client.get(URL, params={"mode": "substring", "q": "  UMAR "})
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.json() == first.json()
+    assert second.headers["ETag"] == first.headers["ETag"]
+
+def test_if_none_match_returns_304(client, db):
+    ingest_faculty_data(db, [{"name": "Umar Quell", "research_interests": "Radar"}])
+    etag = client.get(URL, params={"q": "umar", "mode": "substring"}).headers["ETag"]
+
+    response = client.get(URL, params={"q": "umar", "mode": "substring"}, headers={"If-None-Match": f'W/"x", {etag}'})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+
+def test_ingestion_invalidates_entries(client, db):
+    ingest_faculty_data(db, [{"name": "Umar Quell", "research_interests": "Radar"}])
+    before = client.get(URL, params={"q": "umar", "mode": "substring", "fields": "research_interests"})
+
+    ingest_faculty_data(db, [{"name": "Umar Quell", "research_interests": "Synthetic aperture radar"}])
+    after = client.get(URL, params={"q": "umar", "mode": "substring", "fields": "research_interests"},
+                       headers={"If-None-Match": before.headers["ETag"]})
+
+    assert after.status_code == 200
+    assert after.headers["X-Cache"] == "MISS"
+    assert after.json()["items"][0]["research_interests"] == "Synthetic aperture radar"
+
+def test_cache_stats(client, db):
+    client.get("/api/v1/search/all")
+    client.get("/api/v1/search/all")
+    client.get("/api/v1/search/all")
+
+    stats = client.get("/api/v1/cache/stats").json()
+    assert (stats["hits"], stats["misses"]) == (2, 1)
+    assert stats["hit_ratio"] == round(2 / 3, 4)
+
+def test_cached_routes(client, db):
+    ingest_faculty_data(db, [{"name": "Umar Quell", "research_interests": "Radar"}])
+
+    for path, params in [("/api/v1/search", {"q": "umar"}), ("/api/v1/autocomplete", {"q": "um"}), ("/api/v1/tags", {})]:
+        first, second = client.get(path, params=params), client.get(path, params=params)
+        assert first.status_code == 200 and "ETag" in first.headers
+        assert (first.headers["X-Cache"], second.headers["X-Cache"]) == ("MISS", "HIT")
+
+    assert "X-Cache" not in client.get("/api/v1/cache/stats").headers
+    assert "X-Cache" not in client.get("/api/v1/export").headers
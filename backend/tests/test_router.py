@@ -0,0 +1,191 @@
+from backend import search_engine
+from backend.data_ingestion import ingest_faculty_data
+from backend.db.models import Faculty
+from backend.db.generation import bump_generation
+from backend.search_engine import SearchEngine
+
+"""
+API tests for the faculty search endpoints.
+Goals:
+  - research search uses the full-text index (stemming, prefixes, bm25 order)
+  - the index follows inserts, updates and deletes
+  - mode=substring keeps the original ILIKE behavior
+  - list endpoints page with keyset cursors and project only requested fields
+  - batch lookup returns records in request order and reports missing ids
+  - every search mode can be restricted to one department
+  - research searches also match keywords scraped from personal webpages
+  - /tags returns precomputed facet counts and tag= lists the tagged faculty
+"""
+
+def seed(db):
+    ingest_faculty_data(db, [
+        {"name": "Zoë Quill", "research_interests": "Quantum optics; optical quantum networks and quantum sensing"},
+        {"name": "Yusuf Quade", "research_interests": "Power electronics with some optical sensing"},
+        {"name": "Xavier Quon", "research_interests": "Compilers"},
+    ])
+
+SEEDED = {"Zoë Quill", "Yusuf Quade", "Xavier Quon"}
+
+def names(response):
+    # the in-memory database is shared across tests, so only look at the rows seeded here
+    assert response.status_code == 200
+    return [f["name"] for f in response.json()["items"] if f["name"] in SEEDED]
+
+def test_research_search_is_stemmed_and_ranked(client, db):
+    seed(db)
+
+    # "optic" matches "optics" and "optical"; the profile that is mostly about it ranks first
+    assert names(client.get("/api/v1/search/research", params={"q": "optic"})) == ["Zoë Quill", "Yusuf Quade"]
+    # the last word is a prefix, so a half-typed query already matches
+    assert names(client.get("/api/v1/search/research", params={"q": "quantum netw"})) == ["Zoë Quill"]
+    # diacritics and case are folded on the name column
+    assert "Zoë Quill" in names(client.get("/api/v1/search/name", params={"q": "ZOE"}))
+
+def test_fts_index_tracks_updates_and_deletes(client, db):
+    seed(db)
+    ingest_faculty_data(db, [{"name": "Xavier Quon", "research_interests": "Analog circuits"}])
+    assert names(client.get("/api/v1/search/research", params={"q": "compilers"})) == []
+    assert names(client.get("/api/v1/search/research", params={"q": "analog"})) == ["Xavier Quon"]
+
+    db.query(Faculty).filter(Faculty.name == "Xavier Quon").delete()
+    db.commit()
+    bump_generation()   # direct writes bypass ingestion, which normally expires cached responses
+    assert names(client.get("/api/v1/search/research", params={"q": "analog"})) == []
+
+def test_substring_mode_fallback(client, db):
+    seed(db)
+
+    # "uad" is inside "Quade" but is not a word prefix, so only substring mode finds it
+    assert names(client.get("/api/v1/search/name", params={"q": "uad"})) == []
+    assert names(client.get("/api/v1/search/name", params={"q": "uad", "mode": "substring"})) == ["Yusuf Quade"]
+    assert client.get("/api/v1/search/name", params={"q": "x", "mode": "regex"}).status_code == 422
+
+def walk(client, url, params):
+    # follows next_cursor until the last page, returning every item and the page count
+    items, pages, cursor = [], 0, None
+    while True:
+        response = client.get(url, params={**params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        body = response.json()
+        items += body["items"]
+        pages += 1
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return items, pages
+
+def test_list_all_keyset_pagination(client, db):
+    seed(db)
+    total = db.query(Faculty).count()
+
+    items, pages = walk(client, "/api/v1/search/all", {"limit": 2})
+    ids = [f["id"] for f in items]
+    assert ids == sorted(ids) and len(ids) == total
+    assert pages == (total + 1) // 2
+
+def test_ranked_pagination_matches_single_page(client, db, monkeypatch):
+    seed(db)
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine.from_db(db))
+
+    for mode in ("memory", "fts"):
+        params = {"q": "quantum sens", "op": "or", "mode": mode}
+        whole = client.get("/api/v1/search/research", params=params).json()["items"]
+        paged, pages = walk(client, "/api/v1/search/research", {**params, "limit": 1})
+        assert paged == whole and pages == len(whole)
+
+def test_field_projection(client, db):
+    seed(db)
+
+    page = client.get("/api/v1/search/all", params={"fields": "name,research_interests", "limit": 500}).json()
+    zoe = next(f for f in page["items"] if f["name"] == "Zoë Quill")
+    assert set(zoe) == {"id", "name", "research_interests"}
+    assert zoe["research_interests"].startswith("Quantum optics")
+
+    hit = client.get("/api/v1/search/research", params={"q": "compilers", "fields": "webpage_url"}).json()["items"]
+    assert [set(f) for f in hit] == [{"id", "webpage_url"}]
+
+def test_pagination_rejects_bad_input(client):
+    assert client.get("/api/v1/search/all", params={"cursor": "not-a-cursor"}).status_code == 400
+    assert client.get("/api/v1/search/all", params={"fields": "id,password"}).status_code == 400
+    assert client.get("/api/v1/search/all", params={"limit": 0}).status_code == 422
+
+def test_faculty_batch_lookup(client, db):
+    seed(db)
+    ids = {f.name: f.id for f in db.query(Faculty).filter(Faculty.name.in_(SEEDED))}
+    missing_id = max(ids.values()) + 1000
+
+    response = client.post("/api/v1/faculty/batch", json={"ids": [ids["Xavier Quon"], missing_id, ids["Zoë Quill"], ids["Xavier Quon"]]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [f["name"] for f in body["items"]] == ["Xavier Quon", "Zoë Quill"]
+    assert body["items"][0]["research_interests"] == "Compilers"
+    assert body["missing"] == [missing_id]
+
+    assert client.post("/api/v1/faculty/batch", json={"ids": []}).json() == {"items": [], "missing": []}
+    assert client.post("/api/v1/faculty/batch", json={"ids": list(range(1, 1000))}).status_code == 400
+
+def test_department_filter(client, db, monkeypatch):
+    ingest_faculty_data(db, [
+        {"name": "Zoë Quill", "research_interests": "Quantum optics", "department": "ECE,BME"},
+        {"name": "Yusuf Quade", "research_interests": "Optical sensing", "department": "ME"},
+        {"name": "Xavier Quon", "research_interests": "Compilers", "department": "ECE"},
+    ])
+    bme = {"department": "bme"}
+
+    for mode in ("fts", "substring"):
+        params = {"q": "optic", "mode": mode}
+        assert set(names(client.get("/api/v1/search/research", params=params))) == {"Zoë Quill", "Yusuf Quade"}
+        assert names(client.get("/api/v1/search/research", params={**params, **bme})) == ["Zoë Quill"]
+        assert names(client.get("/api/v1/search/name", params={"q": "q", "mode": mode, "department": "ME"})) == ["Yusuf Quade"]
+    # "ECE" matches one element of the list, not a substring of another code
+    assert names(client.get("/api/v1/search/research", params={"q": "optic", "mode": "fts", "department": "EC"})) == []
+    listed = names(client.get("/api/v1/search/all", params={"department": "ECE", "limit": 500}))
+    assert listed == ["Zoë Quill", "Xavier Quon"]
+
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine.from_db(db))
+    assert names(client.get("/api/v1/search/research", params={"q": "optic", **bme})) == ["Zoë Quill"]
+    assert names(client.get("/api/v1/search/name", params={"q": "Quade", "fuzzy": True, **bme})) == []
+    assert names(client.get("/api/v1/search/semantic", params={"q": "optical sensing", "department": "ME"})) == ["Yusuf Quade"]
+    assert client.get("/api/v1/search/semantic", params={"q": "optics", "department": "NONE"}).json()["items"] == []
+    assert client.get("/api/v1/search/all", params={"department": "E,CE"}).status_code == 422
+
+    zoe = client.get("/api/v1/search/all", params={"fields": "name,department", "limit": 500}).json()["items"]
+    assert {"name": "Zoë Quill", "department": "ECE,BME"} in [{k: f[k] for k in ("name", "department")} for f in zoe]
+
+def test_research_search_matches_webpage_keywords(client, db, monkeypatch):
+    ingest_faculty_data(db, [{"name": "Wren Quist", "research_interests": None, "webpage_keywords": "metamaterials, cloaking"}])
+    params = {"q": "metamaterial", "fields": "name,webpage_keywords"}
+
+    hit = client.get("/api/v1/search/research", params={**params, "mode": "fts"}).json()["items"]
+    assert hit == [{"id": hit[0]["id"], "name": "Wren Quist", "webpage_keywords": "metamaterials, cloaking"}]
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine.from_db(db))
+    assert client.get("/api/v1/search/research", params=params).json()["items"] == hit
+
+def test_tags_and_tag_search(client, db):
+    ingest_faculty_data(db, [
+        {"name": "Tess Quarry", "research_interests": "Autonomous robots and motion planning", "department": "ME"},
+        {"name": "Uma Quell", "research_interests": "Robotic manipulation", "department": "ECE"},
+        {"name": "Vic Quayle", "research_interests": "Radar signal processing"},
+    ])
+    tagged = {"Tess Quarry", "Uma Quell", "Vic Quayle"}
+
+    tags = {t["name"]: t for t in client.get("/api/v1/tags", params={"limit": 1000}).json()["items"]}
+    assert tags["robotics"]["count"] >= 2 and tags["robotics"]["source"] == "vocabulary"
+    counts = [t["count"] for t in tags.values()]
+    assert counts == sorted(counts, reverse=True)
+    assert all(t["source"] == "ngram" for t in client.get("/api/v1/tags", params={"source": "ngram"}).json()["items"])
+
+    def tagged_names(params):
+        response = client.get("/api/v1/search/research", params=params)
+        assert response.status_code == 200
+        return [f["name"] for f in response.json()["items"] if f["name"] in tagged]
+
+    assert tagged_names({"tag": "Robotics"}) == ["Tess Quarry", "Uma Quell"]
+    assert tagged_names({"tag": "robotics", "department": "ECE"}) == ["Uma Quell"]
+    assert tagged_names({"tag": "electromagnetics"}) == ["Vic Quayle"]
+    assert client.get("/api/v1/search/research", params={"tag": "no such tag"}).json()["items"] == []
+    assert client.get("/api/v1/search/research").status_code == 400
+    assert client.get("/api/v1/search/research", params={"q": "radar", "tag": "robotics"}).status_code == 400
+
+    # re-ingesting with new interests moves the tag
+    ingest_faculty_data(db, [{"name": "Uma Quell", "research_interests": "Compilers"}])
+    assert tagged_names({"tag": "robotics"}) == ["Tess Quarry"]
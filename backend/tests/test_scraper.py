@@ -1,6 +1,9 @@
+import json
 import pytest
+import requests
 from unittest.mock import patch, MagicMock
-from backend.scraper import scrape_faculty_directory, scrape_faculty_profile
+from backend.scraper import scrape_faculty_directory, scrape_faculty_profile, enrich_faculty_data, fetch_url, content_hash, parse_faculty_profile, create_parse_pool, CHECKPOINT_NAME
+from backend.scraper import fetch_capped, RobotsCache, extract_page_keywords, enrich_personal_webpages
 
 """ 
 Unit tests for backend.scraper module.
@@ -8,6 +11,11 @@ Goals:
   - correct parsing when HTML is well formed
   - handle missing data gracefully
   - no network calls during tests (used mock requests)
+  - concurrent enrichment keeps order and retries transient errors
+  - unchanged profiles (same content hash) are not re-parsed
+  - a resumed run skips profiles already in the checkpoint
+  - department directories are merged, one record per person, parsed in a process pool
+  - personal webpages are streamed under a byte cap, non-HTML is skipped unread, robots.txt is honoured
 """
 
 def fake_response(html):
@@ -17,8 +25,8 @@ def fake_response(html):
     r.raise_for_status = lambda: None
     return r
 
-@patch("backend.scraper.requests.get")
-def test_scrape_faculty_directory_basic(mock_get, tmp_path, monkeypatch):
+@patch("backend.scraper.create_session")
+def test_scrape_faculty_directory_basic(mock_session, tmp_path, monkeypatch):
     # Basic test with one faculty entry
 
     html = """
@@ -29,14 +37,48 @@ def test_scrape_faculty_directory_basic(mock_get, tmp_path, monkeypatch):
       </a>
     </div>
     """
-    mock_get.return_value = fake_response(html)
+    mock_session.return_value.get.return_value = fake_response(html)
 
     monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
 
-    out = scrape_faculty_directory()
+    out = scrape_faculty_directory(departments=["ECE"])
     assert len(out) == 1
     assert out[0]["name"] == "Hadiseh Alaeian"
     assert out[0]["profile_url"] == "https://engineering.purdue.edu/ECE/People/ptProfile?resource_id=242740"
+    assert out[0]["department"] == "ECE"
+
+def directory(*people):
+    return "".join(
+        f'<div class="list-name"><a href="/{dept}/People/ptProfile?id={i}">{first} <strong>{last}</strong></a></div>'
+        for i, (dept, first, last) in enumerate(people)
+    )
+
+@patch("backend.scraper.create_session")
+def test_scrape_departments_merges_cross_listed_faculty(mock_session, tmp_path, monkeypatch):
+    # Directories are parsed in worker processes; someone listed by two departments becomes one record
+
+    monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
+    pages = {
+        "https://engineering.purdue.edu/ECE/People/Faculty": directory(("ECE", "Ada", "Byron"), ("ECE", "Alan", "Turing")),
+        "https://engineering.purdue.edu/BME/People/Faculty": directory(("BME", "Ada", "Byron"), ("BME", "Grace", "Hopper")),
+    }
+    mock_session.return_value.get.side_effect = lambda url, **kwargs: fake_response(pages[url])
+
+    parse_pool = create_parse_pool(1)
+    try:
+        out = scrape_faculty_directory(departments=["ECE", "BME"], parse_pool=parse_pool)
+    finally:
+        parse_pool.shutdown()
+
+    assert [(f["name"], f["department"]) for f in out] == [
+        ("Ada Byron", "ECE,BME"), ("Alan Turing", "ECE"), ("Grace Hopper", "BME")
+    ]
+    # the first department's profile URL is kept
+    assert out[0]["profile_url"] == "https://engineering.purdue.edu/ECE/People/ptProfile?id=0"
+    with pytest.raises(ValueError):
+        scrape_faculty_directory(departments=["XYZ"])
 
 @patch("backend.scraper.requests.get")
 def test_scrape_faculty_profile(mock_get):
@@ -90,4 +132,191 @@ def test_scrape_faculty_profile_missing_data(mock_get):
     
     # Both should be None since the data is not present in expected format
     assert page is None
-    assert interest is None
\ No newline at end of file
+    assert interest is None
+
+def test_parse_faculty_profile_nested_markup():
+    # The webpage link is taken from the div that holds the "Webpage:" label, however deeply nested
+
+    html = """
+    <div class="page">
+      <div class="sidebar"><a href="https://example.com/unrelated">News</a></div>
+      <div class="profile">
+        <div><strong>Email:</strong> <a href="mailto:x@purdue.edu">x@purdue.edu</a></div>
+        <div><strong>Webpage:</strong> <a href="https://engineering.purdue.edu/qnp">Lab</a></div>
+        <p class="lead profile-research"> Quantum optics </p>
+      </div>
+    </div>
+    """
+    assert parse_faculty_profile(html.encode("utf-8")) == ("https://engineering.purdue.edu/qnp", "Quantum optics")
+    assert parse_faculty_profile(b"") == (None, None)
+
+@patch("backend.scraper.scrape_profile_if_changed")
+def test_enrich_faculty_data_keeps_order(mock_profile, tmp_path, monkeypatch):
+    # Results are written back in the original order regardless of completion order
+
+    monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
+    mock_profile.side_effect = lambda url, name, *args: (f"{url}/home", f"{name} research", "hash", True)
+
+    faculty = [
+        {"name": f"Faculty {i}", "profile_url": f"https://example.com/{i}", "personal_webpage": None, "research_interests": None}
+        for i in range(20)
+    ]
+    progress = []
+    out = enrich_faculty_data(faculty, max_workers=4, rate_limit=1000,
+                              on_profile=lambda done, total, error: progress.append((done, total, error)))
+
+    assert out is faculty
+    assert progress == [(i, 20, None) for i in range(1, 21)]
+    assert [f["name"] for f in out] == [f"Faculty {i}" for i in range(20)]
+    assert out[7]["personal_webpage"] == "https://example.com/7/home"
+    assert out[7]["research_interests"] == "Faculty 7 research"
+
+@patch("backend.scraper.time.sleep")
+@patch("backend.scraper.requests.get")
+def test_fetch_url_retries_on_503(mock_get, mock_sleep):
+    # A 503 followed by a 200 is retried once after a backoff
+
+    busy = fake_response("")
+    busy.status_code = 503
+    busy.headers = {}
+    mock_get.side_effect = [busy, fake_response("<p>ok</p>")]
+
+    response = fetch_url("https://example.com/profile")
+    assert response.status_code == 200
+    assert mock_get.call_count == 2
+    assert mock_sleep.call_count == 1
+
+@patch("backend.scraper.parse_faculty_profile")
+@patch("backend.scraper.create_session")
+def test_enrich_skips_unchanged_profiles(mock_session, mock_parse, tmp_path, monkeypatch):
+    # A profile whose body hash matches the stored one keeps its stored values without parsing
+
+    monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
+    html = "<p class='profile-research'>Photonics</p>"
+    mock_session.return_value.get.return_value = fake_response(html)
+
+    url = "https://example.com/1"
+    known = {url: {"content_hash": content_hash(html.encode("utf-8")),
+                   "personal_webpage": "https://example.com/home",
+                   "research_interests": "Photonics"}}
+    faculty = [{"name": "A", "profile_url": url, "personal_webpage": None, "research_interests": None}]
+
+    out = enrich_faculty_data(faculty, rate_limit=1000, known_profiles=known)
+
+    assert mock_session.return_value.get.call_count == 1
+    assert mock_parse.call_count == 0
+    assert out[0]["changed"] is False
+    assert out[0]["research_interests"] == "Photonics"
+    assert out[0]["personal_webpage"] == "https://example.com/home"
+
+@patch("backend.scraper.scrape_profile_if_changed")
+def test_enrich_resumes_from_checkpoint(mock_profile, tmp_path, monkeypatch):
+    # Profiles saved by an interrupted run are not fetched again; a torn last line is ignored
+
+    monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    monkeypatch.setattr("backend.scraper.BASE_DIR", str(tmp_path))
+    mock_profile.side_effect = lambda url, name, *args: (f"{url}/home", f"{name} research", "hash", True)
+
+    checkpoint = tmp_path / CHECKPOINT_NAME
+    saved = {"name": "Faculty 0", "profile_url": "https://example.com/0", "personal_webpage": "saved",
+             "research_interests": "Saved research", "content_hash": "h0", "changed": True}
+    checkpoint.write_text(json.dumps(saved) + "\n" + '{"name": "Faculty 1", "profile_u')
+
+    faculty = [
+        {"name": f"Faculty {i}", "profile_url": f"https://example.com/{i}", "personal_webpage": None, "research_interests": None}
+        for i in range(3)
+    ]
+    out = enrich_faculty_data(faculty, max_workers=2, rate_limit=1000, resume=True)
+
+    assert sorted(call.args[0] for call in mock_profile.call_args_list) == ["https://example.com/1", "https://example.com/2"]
+    assert out[0]["research_interests"] == "Saved research"
+    assert out[1]["research_interests"] == "Faculty 1 research"
+    # the complete output replaces the checkpoint
+    assert not checkpoint.exists()
+    assert len(json.loads((tmp_path / "faculty_data_complete.json").read_text())) == 3
+
+def streamed_response(content_type, chunks, status_code=200):
+    # a response whose body can only be read through iter_content; records how much was consumed
+    r = MagicMock(status_code=status_code, headers={"Content-Type": content_type})
+    r.consumed = 0
+
+    def iter_content(chunk_size):
+        for chunk in chunks:
+            r.consumed += len(chunk)
+            yield chunk
+    r.iter_content = iter_content
+    if status_code >= 400:
+        error = requests.exceptions.HTTPError(response=r)
+        r.raise_for_status.side_effect = error
+    return r
+
+def test_fetch_capped_stops_at_byte_cap_and_skips_non_html():
+    session = MagicMock()
+    endless = (b"x" * 1000 for _ in range(10**6))
+    session.get.return_value = big = streamed_response("text/html; charset=utf-8", endless)
+
+    body, truncated = fetch_capped("https://example.com/", session=session, max_bytes=2500)
+    assert (len(body), truncated) == (2500, True)
+    assert big.consumed == 3000 and big.close.called
+    assert session.get.call_args.kwargs["stream"] is True
+
+    session.get.return_value = pdf = streamed_response("application/pdf", [b"%PDF" * 1000])
+    assert fetch_capped("https://example.com/cv.pdf", session=session) is None
+    assert pdf.consumed == 0 and pdf.close.called
+
+def test_robots_cache_fetches_once_per_host():
+    robots = b"User-agent: *\nDisallow: /private/\n"
+    session = MagicMock()
+    session.get.side_effect = lambda url, **kwargs: (
+        streamed_response("text/plain", [robots]) if url.startswith("https://a.edu/")
+        else streamed_response("text/html", [], status_code=404) if url.startswith("https://b.edu/")
+        else streamed_response("text/html", [], status_code=503)
+    )
+    cache = RobotsCache(session)
+
+    assert cache.allowed("https://a.edu/~ada/") and not cache.allowed("https://a.edu/private/x")
+    assert cache.allowed("https://b.edu/anything")       # no robots.txt
+    assert not cache.allowed("https://c.edu/home")       # robots.txt unavailable
+    assert session.get.call_count == 3
+
+def test_extract_page_keywords():
+    html = b"""
+    <html><head><title>Ada Byron - Quantum Sensing Lab</title><script>var quantum = 1;</script></head>
+    <body><nav>Home Publications Contact</nav>
+    <h2>Research</h2><p>We build quantum sensing hardware and quantum sensing protocols.</p>
+    <p>Also some interest in radar.</p></body></html>
+    """
+    keywords = extract_page_keywords(html).split(", ")
+    assert keywords[:3] == ["quantum", "quantum sensing", "sensing"]
+    assert "radar" not in keywords                        # seen once
+    assert not {"home", "publications", "contact", "var"} & set(keywords)
+    assert extract_page_keywords(b"") is None
+
+@patch("backend.scraper.create_session")
+def test_enrich_personal_webpages(mock_session, tmp_path, monkeypatch):
+    monkeypatch.setattr("backend.scraper.LOG_FILE", tmp_path / "log.txt")
+    page = b"<html><body><h1>Robotics</h1><p>robotics and robotics</p></body></html>"
+    responses = {
+        "https://ada.example/robots.txt": lambda: streamed_response("text/plain", [b""]),
+        "https://ada.example/": lambda: streamed_response("text/html", [page]),
+        "https://bob.example/robots.txt": lambda: streamed_response("text/plain", [b""]),
+        "https://bob.example/cv.pdf": lambda: streamed_response("application/pdf", [b"%PDF"]),
+    }
+    mock_session.return_value.get.side_effect = lambda url, **kwargs: responses[url]()
+    faculty = [
+        {"name": "Ada", "personal_webpage": "https://ada.example/", "research_interests": None},
+        {"name": "Bob", "personal_webpage": "https://bob.example/cv.pdf", "research_interests": None},
+        {"name": "Cy", "personal_webpage": "https://cy.example/", "research_interests": "Controls"},
+        {"name": "Di", "personal_webpage": "https://di.example/", "research_interests": None, "changed": False},
+        {"name": "Ed", "personal_webpage": None, "research_interests": None},
+    ]
+
+    out = enrich_personal_webpages(faculty, max_workers=2)
+
+    assert out[0]["webpage_keywords"] == "robotics"
+    assert out[1]["webpage_keywords"] is None
+    # profiles with research interests, unchanged profiles and missing links are not visited
+    assert all("webpage_keywords" not in f for f in out[2:])
+    assert mock_session.return_value.get.call_count == 4
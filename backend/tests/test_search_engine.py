@@ -0,0 +1,200 @@
+import random
+from unittest.mock import patch
+import numpy as np
+from backend import search_engine
+from backend.search_engine import SearchEngine, tokenize, rebuild_search_engine_async
+from backend.data_ingestion import ingest_faculty_data
+
+"""
+Unit tests for the in-memory search engine.
+Goals:
+  - AND / OR queries over the inverted index, with prefix matching on the last word
+  - tf-idf ranking puts the most focused profile first
+  - the search endpoints answer from the engine once it is built
+  - background rebuilds swap in a complete index
+  - fuzzy name search tolerates typos and respects threshold and limit
+  - precomputed similar-faculty neighbours and semantic search rank by research overlap
+  - neighbours precomputed from the sparse vectors match a dense cosine product
+  - autocomplete ranks full names, then last names, middle names and research keywords
+  - the most used keyword completions are found however many terms share the prefix
+  - unified search ranks exact names over name prefixes, substrings and research hits, with highlights
+"""
+
+ROWS = [
+    (1, "Zoë Quill", "Quantum optics; optical quantum networks and quantum sensing"),
+    (2, "Yusuf Quade", "Power electronics with some optical sensing"),
+    (3, "Xavier Quon", "Compilers and quantum programming languages"),
+    (4, "Wen Li", None),
+]
+
+def test_tokenize_folds_case_and_diacritics():
+    assert tokenize("Zoë QUILL, Núñez-Ortiz") == ["zoe", "quill", "nunez", "ortiz"]
+
+def test_and_or_queries():
+    engine = SearchEngine(ROWS)
+
+    assert [i for i, _, _ in engine.search("research_interests", "quantum sensing")] == [1]
+    assert {i for i, _, _ in engine.search("research_interests", "compilers sensing", operator="or")} == {1, 2, 3}
+    assert engine.search("research_interests", "quantum missingword") == []
+    assert [hit[:2] for hit in engine.search("name", "wen")] == [(4, "Wen Li")]
+
+def test_prefix_and_ranking():
+    engine = SearchEngine(ROWS)
+
+    # "opt" expands to "optics" and "optical"; the quantum-optics profile ranks first
+    assert [i for i, _, _ in engine.search("research_interests", "opt")] == [1, 2]
+    assert [i for i, _, _ in engine.search("research_interests", "quantum")] == [1, 3]
+
+def test_endpoints_use_engine_without_db(client, db, monkeypatch):
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine(ROWS))
+
+    with patch("backend.app.router.search_faculty") as fts:
+        response = client.get("/api/v1/search/research", params={"q": "quantum sens"})
+    assert response.json()["items"] == [{"id": 1, "name": "Zoë Quill"}]
+    assert fts.call_count == 0
+
+def test_background_rebuild_swaps_index(db, monkeypatch):
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine([]))
+    ingest_faculty_data(db, [{"name": "Vera Quint", "research_interests": "Neuromorphic hardware"}])
+
+    rebuild_search_engine_async(db.get_bind()).join(timeout=5)
+
+    engine = search_engine.get_search_engine()
+    assert [name for _, name, _ in engine.search("research_interests", "neuromorphic")] == ["Vera Quint"]
+
+def test_fuzzy_name_search_tolerates_typos():
+    engine = SearchEngine([(1, "Hadiseh Alaeian", None), (2, "Muhammad Ashraful Alam", None), (3, "Hadi Smith", None)])
+
+    assert engine.fuzzy_search("Alaein")[0][:2] == (1, "Hadiseh Alaeian")
+    assert [i for i, _, _ in engine.fuzzy_search("Hadise Alaian")] == [1]
+    assert [i for i, _, _ in engine.fuzzy_search("hadi", limit=1)] == [3]
+    assert engine.fuzzy_search("Alaein", threshold=0.9) == []
+
+def test_fuzzy_endpoint(client, db, monkeypatch):
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine([(1, "Hadiseh Alaeian", None), (2, "Wen Li", None)]))
+
+    response = client.get("/api/v1/search/name", params={"q": "Alaein", "fuzzy": True})
+    assert response.json()["items"] == [{"id": 1, "name": "Hadiseh Alaeian"}]
+    assert client.get("/api/v1/search/name", params={"q": "Alaein"}).json()["items"] == []
+
+def test_similar_faculty_and_semantic_search():
+    engine = SearchEngine(ROWS)
+
+    # 1 shares "quantum" with 3 and "optical sensing" with 2; 4 has no research text
+    assert {i for i, _, _ in engine.similar(1)} == {2, 3}
+    assert [i for i, _, _ in engine.similar(3)] == [1]
+    assert engine.similar(4) == []
+    assert engine.similar(1, limit=1)[0][0] in (2, 3)
+
+    hits = engine.semantic_search("quantum networks")
+    assert [i for i, _, _ in hits] == [1, 3]
+    assert engine.semantic_search("quantum networks", after={"score": hits[0][2], "id": 1}) == hits[1:]
+    assert engine.semantic_search("basket weaving") == []
+
+def test_sparse_neighbours_match_dense_cosine(monkeypatch):
+    # blocks of two rows; the stored neighbours equal a brute-force dense product
+    monkeypatch.setattr(search_engine, "SIMILARITY_BLOCK_CELLS", 2 * 60)
+    rng = random.Random(7)
+    words = ["quantum", "optics", "power", "grids", "compilers", "robotics", "sensing", "networks"]
+    documents = [(i, " ".join(rng.choices(words, k=rng.randint(1, 6)))) for i in range(1, 61)]
+    index = search_engine.SimilarityIndex(documents, top_k=5)
+
+    dense = np.zeros((len(index.ids), len(index.vocabulary)), dtype=np.float32)
+    for row in range(len(index.ids)):
+        lo, hi = index.row_ptr[row], index.row_ptr[row + 1]
+        dense[row, index.row_terms[lo:hi]] = index.row_weights[lo:hi]
+    similarities = dense @ dense.T
+    np.fill_diagonal(similarities, -1.0)
+    expected = -np.sort(-similarities, axis=1)[:, :5]
+
+    assert index.neighbours.shape == (60, 5)
+    assert np.allclose(index.neighbour_scores, expected, atol=1e-6)
+    assert np.allclose(np.linalg.norm(dense, axis=1), 1.0)
+
+def test_similar_and_semantic_endpoints(client, db, monkeypatch):
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine(ROWS))
+
+    response = client.get("/api/v1/faculty/3/similar")
+    assert response.json() == {"items": [{"id": 1, "name": "Zoë Quill"}], "next_cursor": None}
+    assert client.get("/api/v1/faculty/999/similar").status_code == 404
+    assert client.get("/api/v1/faculty/1/similar", params={"limit": 1000}).status_code == 422
+
+    page = client.get("/api/v1/search/semantic", params={"q": "quantum networks", "limit": 1}).json()
+    assert page["items"] == [{"id": 1, "name": "Zoë Quill"}]
+    rest = client.get("/api/v1/search/semantic", params={"q": "quantum networks", "cursor": page["next_cursor"]}).json()
+    assert rest == {"items": [{"id": 3, "name": "Xavier Quon"}], "next_cursor": None}
+
+def test_autocomplete_ranks_by_match_type():
+    engine = SearchEngine(ROWS + [(5, "Muhammad Quasim Alam", "Quantization of neural networks"), (6, "Quinn Park", None)])
+
+    hits = engine.autocomplete("qu")
+    assert [(h["type"], h["id"]) for h in hits] == [
+        ("name", 6), ("last_name", 2), ("last_name", 1), ("last_name", 3), ("middle_name", 5),
+        ("keyword", None), ("keyword", None),
+    ]
+    # "quantum" appears in two profiles, "quantization" in one
+    assert [h["text"] for h in hits[-2:]] == ["quantum", "quantization"]
+    assert engine.autocomplete("ZOE Q") == [{"text": "Zoë Quill", "type": "name", "id": 1}]
+    assert len(engine.autocomplete("qu", limit=2)) == 2
+    assert engine.autocomplete("and") == []
+
+def test_autocomplete_ranks_keywords_across_whole_prefix_range():
+    # far more terms share these prefixes than one lookup used to consider;
+    # the most used ones sort alphabetically last
+    counts = {f"coda{i:03d}": 1 for i in range(200)}
+    counts.update({"codazz": 7, "cozzy": 9, "coyote": 8})
+    completer = search_engine.Autocompleter({}, counts)
+
+    assert [h["text"] for h in completer.complete("co", limit=3)] == ["cozzy", "coyote", "codazz"]
+    assert [h["text"] for h in completer.complete("cod", limit=2)] == ["codazz", "coda000"]
+    assert [h["text"] for h in completer.complete("coda", limit=2)] == ["codazz", "coda000"]
+    assert [h["text"] for h in completer.complete("codaz")] == ["codazz"]
+    assert completer.complete("cx") == []
+
+def test_autocomplete_endpoint(client, monkeypatch):
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine(ROWS))
+
+    response = client.get("/api/v1/autocomplete", params={"q": "wen"})
+    assert response.json() == {"items": [{"text": "Wen Li", "type": "name", "id": 4}]}
+    assert client.get("/api/v1/autocomplete", params={"q": "comp"}).json()["items"][0]["text"] == "compilers"
+
+def test_unified_search_ranks_name_tiers_above_research():
+    engine = SearchEngine(ROWS + [
+        (5, "Quin", None),
+        (6, "Aquinas Bell", "Quin lattices"),
+        (7, "Tom Quinn", None),
+        (8, "Ada Park", "Quin codes and quin lattices"),
+    ])
+
+    hits = engine.unified_search("quin", 10)
+    assert [(h[0], h[3]) for h in hits] == [
+        (5, "name_exact"), (7, "name_prefix"), (6, "name_substring"), (8, "research"),
+    ]
+    # a research hit adds to the name tier but never lifts a result into the next one
+    assert 1 <= hits[2][2] < 2 and 0 < hits[3][2] < 1
+    assert hits[1][4] == (4, 8) and hits[3][4] is None
+    # research words match any of the query's words, and diacritics fold in names
+    assert [h[0] for h in engine.unified_search("zoe", 10)] == [1]
+    assert engine.unified_search("quin", 2) == hits[:2]
+    assert engine.unified_search("quin", 10, after={"score": hits[1][2], "id": 7}) == hits[2:]
+    assert engine.unified_search("   ", 10) == []
+
+def test_unified_search_endpoint(client, db, monkeypatch):
+    ingest_faculty_data(db, [
+        {"name": "Ulla Zephyr", "research_interests": "Zephyrology of <wind> tunnels; more zephyrology"},
+        {"name": "Tariq Vale", "research_interests": "Zephyrology"},
+        {"name": "Sam Zephyrson", "research_interests": None},
+    ])
+    monkeypatch.setattr(search_engine, "_engine", SearchEngine.from_db(db))
+
+    page = client.get("/api/v1/search", params={"q": "zephyr", "limit": 2}).json()
+    assert [(h["name"], h["match"]) for h in page["items"]] == [("Ulla Zephyr", "name_prefix"), ("Sam Zephyrson", "name_prefix")]
+    first = page["items"][0]
+    assert first["name_highlight"] == "Ulla <mark>Zephyr</mark>"
+    # matching words are marked and the text is escaped
+    assert first["snippet"] == "<mark>Zephyrology</mark> of &lt;wind&gt; tunnels; more <mark>zephyrology</mark>"
+    assert page["items"][1]["snippet"] is None
+    rest = client.get("/api/v1/search", params={"q": "zephyr", "cursor": page["next_cursor"]}).json()
+    assert [(h["name"], h["match"]) for h in rest["items"]] == [("Tariq Vale", "research")]
+    assert rest["next_cursor"] is None
+    assert client.get("/api/v1/search", params={"q": ""}).status_code == 422
@@ -0,0 +1,41 @@
+from backend.topics import TopicTagger, normalize_tag
+
+"""
+Unit tests for backend.topics.
+Goals:
+  - curated vocabulary phrases match regardless of case and plural forms
+  - n-grams shared by enough profiles become tags; rare and near-universal ones do not
+  - n-grams the vocabulary already covers are not duplicated
+"""
+
+def test_vocabulary_tags():
+    tagger = TopicTagger()
+
+    assert tagger.tags("Deep Learning for Power Electronics and Smart Grids") == [
+        "machine learning", "power and energy"
+    ]
+    assert tagger.tags("Quantum optics and photonic integrated circuits") == [
+        "photonics and optics", "quantum", "vlsi and circuits"
+    ]
+    assert tagger.tags(None) == [] and tagger.tags("") == []
+    assert tagger.source("quantum") == "vocabulary"
+    assert normalize_tag("  Machine   LEARNING ") == "machine learning"
+
+def test_frequent_ngram_tags():
+    corpus = [f"Swarm coordination of drone fleets, topic {i}" for i in range(4)]
+    corpus += ["Legged locomotion", "Graph theory", "Number theory", "Compilers"] * 3
+    tagger = TopicTagger().fit(corpus)
+
+    tags = tagger.tags("Swarm coordination under uncertainty")
+    assert "swarm coordination" in tags and tagger.source("swarm coordination") == "ngram"
+    # "drone fleet" is in 4 of 16 profiles; "topic 0" only in one
+    assert "drone fleet" in tagger.tags("drone fleets")
+    assert tagger.tags("topic 0") == []
+    assert tagger.tags("legged locomotion") == ["legged locomotion"]
+
+def test_vocabulary_phrases_are_not_learned_as_ngrams():
+    tagger = TopicTagger().fit(["Machine learning systems"] * 3 + ["Other work"] * 9)
+
+    assert tagger.tags("machine learning") == ["machine learning"]
+    assert tagger.source("machine learning") == "vocabulary"
+    assert "learning system" in tagger.tags("machine learning systems")
@@ -0,0 +1,146 @@
+from collections import Counter
+from backend.search_engine import tokenize
+
+# --- Configuration ---
+# Curated research areas: tag -> phrases that mark a profile as working in it.
+# Phrases are matched on normalized words (case and diacritics folded, simple
+# plurals stripped), so "Neural Networks" matches "neural network".
+TOPIC_VOCABULARY = {
+    "machine learning": ("machine learning", "deep learning", "neural network", "reinforcement learning",
+                         "statistical learning", "representation learning"),
+    "artificial intelligence": ("artificial intelligence", "intelligent system", "autonomous agent"),
+    "computer vision": ("computer vision", "image processing", "image analysis", "visual recognition"),
+    "natural language processing": ("natural language processing", "natural language", "speech recognition"),
+    "signal processing": ("signal processing", "statistical signal", "array processing", "sparse signal"),
+    "communications": ("communication system", "wireless communication", "wireless network", "information theory",
+                       "coding theory", "5g", "6g"),
+    "networking": ("computer network", "network protocol", "internet of thing", "iot", "network system"),
+    "control systems": ("control system", "control theory", "optimal control", "robust control", "nonlinear control",
+                        "feedback control"),
+    "robotics": ("robotic", "robot", "autonomous vehicle", "motion planning"),
+    "power and energy": ("power system", "power electronic", "smart grid", "energy system", "renewable energy",
+                         "electric machine", "energy storage"),
+    "quantum": ("quantum", "qubit"),
+    "photonics and optics": ("photonic", "optic", "optical", "laser", "metamaterial", "plasmonic"),
+    "semiconductors": ("semiconductor", "transistor", "device physic", "nanoelectronic", "spintronic"),
+    "vlsi and circuits": ("vlsi", "integrated circuit", "analog circuit", "mixed signal", "circuit design",
+                          "rf circuit"),
+    "computer architecture": ("computer architecture", "processor design", "memory system", "hardware accelerator",
+                              "parallel architecture"),
+    "embedded systems": ("embedded system", "cyber physical", "real time system"),
+    "security and privacy": ("security", "privacy", "cryptography", "secure system", "hardware security"),
+    "software engineering": ("software engineering", "program analysis", "software testing", "compiler",
+                             "programming language"),
+    "distributed systems": ("distributed system", "cloud computing", "edge computing", "high performance computing",
+                            "parallel computing"),
+    "data science": ("data science", "data mining", "big data", "data analytic"),
+    "electromagnetics": ("electromagnetic", "antenna", "microwave", "millimeter wave", "radar"),
+    "nanotechnology": ("nanotechnology", "nanoscale", "nanomaterial", "mems", "nems"),
+    "biomedical engineering": ("biomedical", "medical imaging", "neural engineering", "bioelectronic",
+                               "neuroscience", "healthcare"),
+    "materials": ("material science", "materials engineering", "2d material", "thin film", "polymer"),
+    "fluids and thermal": ("fluid dynamic", "heat transfer", "thermal management", "combustion", "turbulence"),
+    "aerospace": ("aerospace", "propulsion", "spacecraft", "aerodynamic", "astrodynamic"),
+    "manufacturing": ("manufacturing", "additive manufacturing", "3d printing"),
+    "engineering education": ("engineering education", "stem education"),
+}
+# Besides the vocabulary, word pairs and triples shared by enough profiles become tags
+NGRAM_SIZES = (2, 3)
+NGRAM_MIN_FACULTY = 3           # profiles an n-gram must appear in to become a tag
+NGRAM_MAX_SHARE = 0.25          # ...and at most this share of profiles (too common says nothing)
+NGRAM_MAX_TAGS = 200            # n-gram tags kept, most widespread first
+# words that cannot start or end an n-gram tag
+TAG_STOPWORDS = frozenset("""
+    a about across also an and applications application are as at based be between both by for from has
+    have in including into is its new of on or other our research such that the their these this through
+    to towards use using various via well which with within work
+""".split())
+# --- End Configuration ---
+
+def normalize_word(word):
+    """Strips a simple plural ("networks" -> "network") so singular and plural forms match."""
+
+    if len(word) > 3 and word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        return word[:-1]
+    return word
+
+def normalize_words(text):
+    return [normalize_word(word) for word in tokenize(text)]
+
+def normalize_tag(tag):
+    """Canonical form of a tag name as passed by clients: lowercase, single spaces."""
+
+    return " ".join(tag.lower().split())
+
+def _ngrams(words, size):
+    return zip(*(words[i:] for i in range(size)))
+
+class TopicTagger:
+    """
+    Assigns topic tags to research texts: a tag from TOPIC_VOCABULARY when
+    any of its phrases occurs, plus frequent n-grams learned from the corpus
+    (see NGRAM_*) that the vocabulary does not already cover.
+    `ngram_tags` restores n-gram tags learned earlier, so single profiles
+    can be tagged without refitting on the whole corpus.
+    """
+
+    def __init__(self, vocabulary=TOPIC_VOCABULARY, ngram_tags=()):
+        # phrase (as a tuple of normalized words) -> vocabulary tag
+        self.phrases = {}
+        for tag, phrases in vocabulary.items():
+            for phrase in phrases:
+                self.phrases[tuple(normalize_words(phrase))] = tag
+        self.phrase_sizes = sorted({len(phrase) for phrase in self.phrases})
+        self.ngram_tags = {tuple(tag.split()) for tag in ngram_tags}
+
+    def _vocabulary_tags(self, words):
+        phrases = self.phrases
+        return {phrases[gram] for size in self.phrase_sizes for gram in _ngrams(words, size) if gram in phrases}
+
+    @staticmethod
+    def _candidate_ngrams(words):
+        grams = set()
+        for size in NGRAM_SIZES:
+            for gram in _ngrams(words, size):
+                if gram[0] not in TAG_STOPWORDS and gram[-1] not in TAG_STOPWORDS and len(set(gram)) == size:
+                    grams.add(gram)
+        return grams
+
+    def fit(self, texts):
+        """Learns the n-gram tags from a corpus of research texts."""
+
+        documents = 0
+        frequency = Counter()
+        for text in texts:
+            words = normalize_words(text)
+            if not words:
+                continue
+            documents += 1
+            frequency.update(gram for gram in self._candidate_ngrams(words) if gram not in self.phrases)
+
+        ceiling = max(NGRAM_MIN_FACULTY, NGRAM_MAX_SHARE * documents)
+        frequent = sorted(
+            (gram for gram, count in frequency.items() if NGRAM_MIN_FACULTY <= count <= ceiling),
+            key=lambda gram: (-frequency[gram], gram)
+        )
+        vocabulary_tags = set(self.phrases.values())
+        self.ngram_tags = set()
+        for gram in frequent:
+            tag = " ".join(gram)
+            if tag not in vocabulary_tags:
+                self.ngram_tags.add(gram)
+                if len(self.ngram_tags) == NGRAM_MAX_TAGS:
+                    break
+        return self
+
+    def tags(self, text):
+        """Tags for one research text, sorted."""
+
+        words = normalize_words(text)
+        tags = self._vocabulary_tags(words)
+        # learned n-gram tags already passed the candidate filters, so membership is enough
+        tags.update(" ".join(gram) for size in NGRAM_SIZES for gram in _ngrams(words, size) if gram in self.ngram_tags)
+        return sorted(tags)
+
+    def source(self, tag):
+        return "ngram" if tuple(tag.split()) in self.ngram_tags else "vocabulary"
@@ -9,6 +9,10 @@ import { Badge } from "@/components/ui/badge"
 // base url based on env
 const baseUrl = process.env.NEXT_PUBLIC_BASE_URL ?? "http://127.0.0.1:8000";
 // const baseUrl =  "http://127.0.0.1:8000";
+// largest page the list endpoints serve
+const PAGE_SIZE = 500;
+// how often the admin panel checks on a running update job
+const UPDATE_POLL_MS = 2000;
 
 // return type for following endpoints:
 // api/v1//search/name?q={name} 
@@ -19,6 +23,29 @@ type FacultyListItem = {
   name: string
 }
 
+// the list endpoints above return one page at a time
+type FacultyPage = {
+  items: FacultyListItem[]
+  next_cursor: string | null
+}
+
+// fetches every page of a list endpoint, following next_cursor until the last one
+const fetchAllPages = async (url: string): Promise<FacultyListItem[]> => {
+  const items: FacultyListItem[] = []
+  let cursor: string | null = null
+  do {
+    const pageUrl = new URL(url)
+    pageUrl.searchParams.set("limit", String(PAGE_SIZE))
+    if (cursor) pageUrl.searchParams.set("cursor", cursor)
+    const res = await fetch(pageUrl)
+    if (!res.ok) throw new Error(`Request failed: ${res.status}`)
+    const page: FacultyPage = await res.json()
+    items.push(...page.items)
+    cursor = page.next_cursor
+  } while (cursor)
+  return items
+}
+
 // return type for api/v1/faculty/{id} 
 type FacultyDetail = {
   id: number
@@ -27,6 +54,23 @@ type FacultyDetail = {
   research_interests: string
 }
 
+// return type for api/v1/update/{job_id}
+type UpdateJob = {
+  job_id: string
+  status: "queued" | "running" | "succeeded" | "failed"
+  phase: string | null
+  profiles_fetched: number
+  profiles_total: number | null
+  errors: string[]
+  result: {
+    added: string[]
+    updated: string[]
+    removed: string[]
+    unchanged: number
+    record_count: number
+  } | null
+}
+
 export default function FacultySearchPage() {
   // states for normal operation
   const [nameSearch, setNameSearch] = useState("")
@@ -57,11 +101,7 @@ export default function FacultySearchPage() {
   useEffect(() => {
     (async () => {
       try {
-        const res = await fetch(`${baseUrl}/api/v1/search/all`)
-        if (res.ok) {
-          const data: FacultyListItem[] = await res.json()
-          setAllFaculty(data)
-        }
+        setAllFaculty(await fetchAllPages(`${baseUrl}/api/v1/search/all`))
       } catch (_) {}
     })()
   }, [])
@@ -87,9 +127,7 @@ export default function FacultySearchPage() {
       else url = `${baseUrl}/api/v1/search/research?q=${encodeURIComponent(interestSearch)}`
 
       try {
-        const res = await fetch(url)
-        const data = await res.json()
-        setResults(data) // data = [{id, name}]
+        setResults(await fetchAllPages(url)) // [{id, name}] across every page
       } catch (_) {
         setResults([])
       }
@@ -139,23 +177,43 @@ export default function FacultySearchPage() {
     setUpdateLoading(true)
     setUpdateMessage("")
 
+    const headers = { "Authorization": "Basic " + btoa(`${adminUser}:${adminPass}`) }
     try {
-      const res = await fetch(`${baseUrl}/api/v1/update`, {
-        method: "POST",
-        headers: {
-          "Authorization": "Basic " + btoa(`${adminUser}:${adminPass}`)
-        }
-      })
+      // the update runs as a background job; start it, then poll its status
+      const res = await fetch(`${baseUrl}/api/v1/update`, { method: "POST", headers })
       const data = await res.json()
-      if (res.ok) {
+      if (!res.ok) {
+        setUpdateMessage(`Error: ${data.detail || "Unknown error"}`)
+        setUpdateLoading(false)
+        return
+      }
+
+      const fetchJob = async (): Promise<UpdateJob> => {
+        const r = await fetch(`${baseUrl}/api/v1/update/${data.job_id}`, { headers })
+        const body = await r.json()
+        if (!r.ok) throw new Error(body.detail || `status ${r.status}`)
+        return body
+      }
+
+      let job = await fetchJob()
+      while (job.status !== "succeeded" && job.status !== "failed") {
+        const progress = job.profiles_total ? ` (${job.profiles_fetched}/${job.profiles_total} profiles)` : ""
+        setUpdateMessage(`Updating: ${job.phase ?? job.status}${progress}`)
+        await new Promise((resolve) => setTimeout(resolve, UPDATE_POLL_MS))
+        job = await fetchJob()
+      }
+
+      if (job.status === "succeeded" && job.result) {
         // update faculty on update
         setAllFaculty(null)
-        const r = await fetch(`${baseUrl}/api/v1/faculty/all`)
-        if (r.ok) setAllFaculty(await r.json())
+        setAllFaculty(await fetchAllPages(`${baseUrl}/api/v1/search/all`))
 
-        setUpdateMessage(`Success: ${data.record_count} records updated`)
+        const { added, updated, removed, record_count } = job.result
+        setUpdateMessage(
+          `Success: ${record_count} records (${added.length} added, ${updated.length} updated, ${removed.length} removed)`
+        )
       } else {
-        setUpdateMessage(`Error: ${data.detail || "Unknown error"}`)
+        setUpdateMessage(`Error: ${job.errors[job.errors.length - 1] || "Update failed"}`)
       }
     } catch (e) {
       setUpdateMessage(`Error: ${e}`)